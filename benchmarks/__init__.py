@@ -0,0 +1,21 @@
+"""
+Benchmarks de carga para taskflow-api y taskflow_web
+
+Uso (desde la raíz del repositorio):
+
+    # API en proceso: crea una base SQLite propia, la puebla y mide
+    python -m benchmarks run --target api
+
+    # Comparar contra la línea base guardada (falla con código 1 si hay regresiones)
+    python -m benchmarks run --target api --compare benchmarks/baseline.json
+
+    # Poblar la base real de la API para medir por HTTP (API y web levantadas)
+    python -m benchmarks seed --database taskflow-api/db.sqlite3
+    python -m benchmarks run --target api-http --api-url http://127.0.0.1:8000 \\
+        --manifest taskflow-api/db.sqlite3.bench.json
+    python -m benchmarks run --target web --web-url http://127.0.0.1:8001 \\
+        --manifest taskflow-api/db.sqlite3.bench.json
+
+Cada escenario registra latencia p50/p95/p99, consultas SQL por petición
+(solo en proceso) y bytes por respuesta.
+"""
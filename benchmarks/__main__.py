@@ -0,0 +1,166 @@
+"""
+python -m benchmarks {seed,run} ...
+"""
+import argparse
+import platform
+import sys
+import time
+from pathlib import Path
+
+from . import runner
+from .environment import DATA_DIR, setup_api, migrate
+from .scenarios import api_concurrent_scenarios, api_login, api_scenarios, web_login, web_scenarios
+from .seed import SCALES
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def _seed_arguments(parser):
+    parser.add_argument('--scale', choices=SCALES, default='medium')
+    parser.add_argument('--seed', type=int, default=42)
+    for name in ('users', 'projects', 'tasks', 'comments'):
+        parser.add_argument(f'--{name}', type=int, help=f'Sobrescribe la cantidad de {name} de la escala')
+
+
+def _sizes(options):
+    sizes = dict(SCALES[options.scale])
+    for name in sizes:
+        if getattr(options, name) is not None:
+            sizes[name] = getattr(options, name)
+    return sizes
+
+
+def _seed_database(database, options):
+    from .seed import seed
+
+    setup_api(database, getattr(options, 'db_profile', 'tuned'))
+    migrate()
+    started = time.monotonic()
+    manifest = seed(random_seed=options.seed, **_sizes(options))
+    print(f'Datos generados en {time.monotonic() - started:.1f}s: {manifest["counts"]}')
+    return manifest
+
+
+def command_seed(options):
+    database = Path(options.database)
+    manifest = _seed_database(database, options)
+    manifest_path = Path(f'{database}.bench.json')
+    runner.write_json(manifest_path, manifest)
+    print(f'Manifiesto: {manifest_path}')
+
+
+def command_run(options):
+    targets = options.target or ['api']
+    results = {}
+
+    if 'api' in targets:
+        # Base propia y desechable: siempre se parte del mismo estado
+        DATA_DIR.mkdir(exist_ok=True)
+        database = DATA_DIR / f'api-{options.scale}-{options.seed}.sqlite3'
+        database.unlink(missing_ok=True)
+        manifest = _seed_database(database, options)
+
+        from .transports import InProcessTransport
+
+        transport = InProcessTransport()
+        token = api_login(transport, manifest)
+        results['api'] = runner.run_scenarios(transport, api_scenarios(manifest), options.iterations, options.warmup)
+
+        if options.workers > 1:
+            def make_transport():
+                worker = InProcessTransport()
+                worker.authenticate(token)
+                return worker
+
+            results['api'].update(runner.run_concurrent(
+                make_transport, api_concurrent_scenarios(manifest), options.workers, options.iterations
+            ))
+
+    if 'api-http' in targets or 'web' in targets:
+        if not options.manifest:
+            sys.exit('--manifest es obligatorio para medir por HTTP (lo genera `seed`)')
+        manifest = runner.load_json(options.manifest)
+
+        from .transports import HTTPTransport
+
+        if 'api-http' in targets:
+            transport = HTTPTransport(options.api_url)
+            api_login(transport, manifest)
+            results['api-http'] = runner.run_scenarios(
+                transport, api_scenarios(manifest), options.iterations, options.warmup
+            )
+        if 'web' in targets:
+            transport = HTTPTransport(options.web_url, form=True)
+            web_login(transport, manifest)
+            results['web'] = runner.run_scenarios(
+                transport, web_scenarios(manifest), options.iterations, options.warmup
+            )
+
+    print(runner.format_table(results))
+
+    if options.output:
+        runner.write_json(options.output, {
+            'meta': {
+                'scale': options.scale,
+                'seed': options.seed,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'iterations': options.iterations,
+                'db_profile': options.db_profile,
+            },
+            'results': results,
+        })
+
+    if options.update_baseline:
+        baseline = runner.load_json(options.update_baseline) if Path(options.update_baseline).exists() else {}
+        baseline.setdefault('results', {}).update(results)
+        baseline['meta'] = {'scale': options.scale, 'seed': options.seed, 'python': platform.python_version()}
+        runner.write_json(options.update_baseline, baseline)
+        print(f'\nLínea base actualizada: {options.update_baseline}')
+
+    if options.compare:
+        baseline = runner.load_json(options.compare)
+        regressions = runner.compare(results, baseline.get('results', {}), latency_tolerance=options.tolerance)
+        if regressions:
+            print('\nREGRESIONES respecto a la línea base:')
+            for regression in regressions:
+                print(f'  - {regression}')
+            sys.exit(1)
+        print('\nSin regresiones respecto a la línea base')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks de TaskFlow')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = commands.add_parser('seed', help='Puebla una base de la API con datos deterministas')
+    seed_parser.add_argument('--database', default='taskflow-api/db.sqlite3')
+    _seed_arguments(seed_parser)
+    seed_parser.set_defaults(handler=command_seed)
+
+    run_parser = commands.add_parser('run', help='Ejecuta los escenarios y compara con la línea base')
+    run_parser.add_argument('--target', action='append', choices=('api', 'api-http', 'web'))
+    run_parser.add_argument('--iterations', type=int, default=50)
+    run_parser.add_argument('--warmup', type=int, default=5)
+    run_parser.add_argument('--workers', type=int, default=8,
+                            help='Hilos de los escenarios concurrentes de la API (1 los omite)')
+    run_parser.add_argument('--db-profile', choices=('tuned', 'default'), default='tuned',
+                            help='Configuración de SQLite de la API: la de settings o la de Django por defecto')
+    run_parser.add_argument('--manifest', help='Manifiesto de `seed` para los objetivos HTTP')
+    run_parser.add_argument('--api-url', default='http://127.0.0.1:8000')
+    run_parser.add_argument('--web-url', default='http://127.0.0.1:8001')
+    run_parser.add_argument('--output', help='Guarda los resultados en JSON')
+    run_parser.add_argument('--compare', nargs='?', const=str(DEFAULT_BASELINE),
+                            help='Compara con la línea base (por defecto benchmarks/baseline.json)')
+    run_parser.add_argument('--update-baseline', nargs='?', const=str(DEFAULT_BASELINE))
+    run_parser.add_argument('--tolerance', type=float, default=runner.LATENCY_TOLERANCE,
+                            help='Aumento relativo de p50 permitido (0.25 = 25%%)')
+    _seed_arguments(run_parser)
+    run_parser.set_defaults(handler=command_run)
+
+    options = parser.parse_args(argv)
+    options.handler(options)
+
+
+if __name__ == '__main__':
+    main()
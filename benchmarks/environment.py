@@ -0,0 +1,42 @@
+"""
+Carga de Django para ejecutar la API dentro del proceso del benchmark
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+API_DIR = ROOT / 'taskflow-api'
+DATA_DIR = Path(__file__).resolve().parent / '.data'
+
+
+def setup_api(database, db_profile='tuned'):
+    """
+    Configura Django con los settings de taskflow-api apuntando a `database`.
+
+    Debe llamarse antes de importar modelos. Solo se sustituyen el nombre del
+    archivo SQLite y la caché compartida, que pasa a memoria para no mezclar
+    entradas con las de otra base: el resto de la configuración es la de la API.
+    Con `db_profile='default'` la base usa la configuración de SQLite por
+    defecto de Django (sin WAL ni PRAGMAs), para comparar antes y después.
+    """
+    if str(API_DIR) not in sys.path:
+        sys.path.insert(0, str(API_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskflow.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+    import django
+    from django.conf import settings
+
+    if db_profile == 'default':
+        settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(database)}
+    else:
+        settings.DATABASES['default']['NAME'] = str(database)
+    settings.CACHES['shared'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    django.setup()
+
+
+def migrate():
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0, interactive=False)
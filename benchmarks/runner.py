@@ -0,0 +1,148 @@
+"""
+Ejecución de escenarios y comparación contra la línea base
+"""
+import json
+import threading
+import time
+
+from .stats import summarize
+from .transports import Sample
+
+# Tolerancias por defecto: la latencia es ruidosa, consultas y bytes no
+LATENCY_TOLERANCE = 0.25
+LATENCY_FLOOR_MS = 5.0
+BYTES_TOLERANCE = 0.10
+
+
+def run_scenarios(transport, scenarios, iterations, warmup):
+    """Ejecuta cada escenario `warmup` veces sin medir y luego `iterations` veces."""
+    results = {}
+    for scenario in scenarios:
+        count = scenario.iterations or iterations
+        for _ in range(min(warmup, count)):
+            transport.request(scenario.method, scenario.path, scenario.data, scenario.expect)
+        samples = [
+            transport.request(scenario.method, scenario.path, scenario.data, scenario.expect)[0]
+            for _ in range(count)
+        ]
+        results[scenario.name] = summarize(samples)
+    return results
+
+
+def run_concurrent(make_transport, scenarios, workers, iterations):
+    """
+    Ejecuta cada escenario desde `workers` hilos a la vez, cada uno con su
+    transporte (y su conexión a la base), y agrega `throughput_rps` al resumen.
+
+    Una excepción en la petición (por ejemplo "database is locked") cuenta
+    como error en lugar de cortar la medición.
+    """
+    from django.db import connections
+
+    results = {}
+    for scenario in scenarios:
+        count = scenario.iterations or iterations
+        transports = [make_transport() for _ in range(workers)]
+        barrier = threading.Barrier(workers + 1)
+        samples = []
+        lock = threading.Lock()
+
+        def work(transport):
+            measured = []
+            barrier.wait()
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    try:
+                        sample = transport.request(scenario.method, scenario.path, scenario.data, scenario.expect)[0]
+                    except Exception:
+                        sample = Sample(time.perf_counter() - start, None, 0, False)
+                    measured.append(sample)
+            finally:
+                connections.close_all()
+                with lock:
+                    samples.extend(measured)
+
+        threads = [threading.Thread(target=work, args=(transport,)) for transport in transports]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        summary = summarize(samples)
+        summary['workers'] = workers
+        summary['throughput_rps'] = round(sum(1 for sample in samples if sample.ok) / elapsed, 1)
+        results[scenario.name] = summary
+    return results
+
+
+def compare(results, baseline, latency_tolerance=LATENCY_TOLERANCE, bytes_tolerance=BYTES_TOLERANCE):
+    """
+    Lista de regresiones de `results` respecto a `baseline` (mismo formato,
+    `{target: {escenario: resumen}}`).
+
+    Falla cualquier error HTTP, cualquier consulta SQL de más, un p50 más de
+    `latency_tolerance` por encima de la base (y al menos `LATENCY_FLOOR_MS`,
+    para no fallar por ruido en escenarios de pocos milisegundos) o una
+    respuesta más de `bytes_tolerance` más grande. p95 y p99 se informan pero
+    no se comparan: con decenas de muestras son demasiado ruidosos. En los
+    escenarios concurrentes se compara el throughput en lugar del p50.
+    """
+    regressions = []
+    for target, scenarios in results.items():
+        base_scenarios = baseline.get(target, {})
+        for name, current in scenarios.items():
+            label = f'{target}/{name}'
+            if current['errors']:
+                regressions.append(f"{label}: {current['errors']} peticiones con estado inesperado")
+            base = base_scenarios.get(name)
+            if base is None:
+                continue
+
+            if current['queries'] is not None and base.get('queries') is not None \
+                    and current['queries'] > base['queries']:
+                regressions.append(f"{label}: consultas {base['queries']} -> {current['queries']}")
+
+            if 'throughput_rps' in base:
+                if current['throughput_rps'] < base['throughput_rps'] * (1 - latency_tolerance):
+                    regressions.append(
+                        f"{label}: throughput {base['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} req/s"
+                    )
+            else:
+                limit = max(base['p50_ms'] * (1 + latency_tolerance), base['p50_ms'] + LATENCY_FLOOR_MS)
+                if current['p50_ms'] > limit:
+                    regressions.append(f"{label}: p50 {base['p50_ms']:.1f}ms -> {current['p50_ms']:.1f}ms")
+
+            if current['bytes'] > base['bytes'] * (1 + bytes_tolerance):
+                regressions.append(f"{label}: bytes {base['bytes']:.0f} -> {current['bytes']:.0f}")
+    return regressions
+
+
+def format_table(results):
+    header = f"{'escenario':<28}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'consultas':>11}{'bytes':>10}{'errores':>9}"
+    lines = []
+    for target, scenarios in results.items():
+        lines.extend(['', f'[{target}]', header])
+        for name, summary in scenarios.items():
+            queries = '-' if summary['queries'] is None else f"{summary['queries']:g}"
+            lines.append(
+                f"{name:<28}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+                f"{queries:>11}{summary['bytes']:>10.0f}{summary['errors']:>9}"
+            )
+            if 'throughput_rps' in summary:
+                lines.append(f"{'':<4}{summary['workers']} hilos: {summary['throughput_rps']:.1f} req/s")
+    return '\n'.join(lines)
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write('\n')
@@ -0,0 +1,87 @@
+"""
+Escenarios con guion: qué peticiones se miden en cada aplicación
+
+Todos usan al usuario caliente del manifiesto (el que más proyectos y
+tareas ve), así que los listados se miden sobre el conjunto de datos grande.
+"""
+from collections import namedtuple
+
+# `iterations` None usa el valor global del runner
+Scenario = namedtuple('Scenario', 'name method path data expect iterations')
+
+
+def _scenario(name, path, method='GET', data=None, expect=(200,), iterations=None):
+    return Scenario(name, method, path, data, expect, iterations)
+
+
+def _credentials(manifest):
+    return {'username': manifest['hot_user'], 'password': manifest['password']}
+
+
+# --- taskflow-api ---
+
+def api_login(transport, manifest):
+    """Obtiene un access token, lo deja configurado en el transporte y lo devuelve."""
+    import json
+
+    sample, body = transport.request('POST', '/api/auth/login/', _credentials(manifest))
+    if not sample.ok:
+        raise RuntimeError('No se pudo iniciar sesión en la API con el usuario del manifiesto')
+    token = json.loads(body)['access']
+    transport.authenticate(token)
+    return token
+
+
+def api_scenarios(manifest):
+    task, project = manifest['hot_task'], manifest['hot_project']
+    return [
+        # PBKDF2 domina el login: pocas iteraciones bastan
+        _scenario('login', '/api/auth/login/', 'POST', _credentials(manifest), iterations=10),
+        _scenario('dashboard', '/api/dashboard/summary/'),
+        _scenario('project_list', '/api/projects/'),
+        _scenario('task_list', '/api/tasks/'),
+        _scenario('task_list_compact', '/api/tasks/?view=compact'),
+        _scenario('task_list_project', f'/api/tasks/?project={project}&count=true'),
+        _scenario('task_detail', f'/api/tasks/{task}/'),
+        _scenario('comment_list', f'/api/tasks/{task}/comments/'),
+        _scenario('comment_post', f'/api/tasks/{task}/comments/', 'POST',
+                  {'content': 'Comentario de benchmark'}, expect=(201,)),
+        _scenario('search', '/api/search/?q=revisar%20dashboard'),
+    ]
+
+
+def api_concurrent_scenarios(manifest):
+    """Escenarios que se ejecutan desde varios hilos a la vez (`iterations` por hilo)."""
+    task = manifest['hot_task']
+    return [
+        # Escritores concurrentes sobre la misma tarea: mide los bloqueos de SQLite
+        _scenario('comment_post_concurrent', f'/api/tasks/{task}/comments/', 'POST',
+                  {'content': 'Comentario concurrente'}, expect=(201,), iterations=25),
+    ]
+
+
+# --- taskflow_web ---
+
+_LOGIN_PATH = '/auth/login/'
+
+
+def web_login(transport, manifest):
+    """Inicia sesión por el formulario (la primera visita obtiene la cookie CSRF)."""
+    transport.request('GET', _LOGIN_PATH)
+    sample, _body = transport.request('POST', _LOGIN_PATH, _credentials(manifest), expect=(302,))
+    location = transport.session.get(transport.base_url + '/', allow_redirects=False).headers.get('Location', '')
+    if not sample.ok or _LOGIN_PATH in location:
+        raise RuntimeError('No se pudo iniciar sesión en la web con el usuario del manifiesto')
+
+
+def web_scenarios(manifest):
+    task = manifest['hot_task']
+    return [
+        _scenario('login', _LOGIN_PATH, 'POST', _credentials(manifest), expect=(302,), iterations=10),
+        _scenario('dashboard', '/'),
+        _scenario('project_list', '/projects/'),
+        _scenario('task_list', '/tasks/'),
+        _scenario('task_detail', f'/tasks/{task}/'),
+        _scenario('comment_post', f'/tasks/{task}/', 'POST',
+                  {'content': 'Comentario de benchmark'}, expect=(302,)),
+    ]
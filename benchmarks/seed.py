@@ -0,0 +1,169 @@
+"""
+Datos de prueba deterministas con distribución sesgada
+
+Con la misma semilla y tamaños se generan siempre los mismos usuarios,
+proyectos, tareas y comentarios. La carga no es uniforme, como en un uso
+real: los propietarios, el tamaño de los proyectos y los comentarios por
+tarea siguen una distribución tipo Zipf. El usuario 0 ("usuario caliente")
+es dueño del proyecto más grande y miembro de la mitad de los demás, de modo
+que sus listados son los más costosos.
+"""
+import io
+import random
+from collections import Counter
+from datetime import timedelta
+
+SCALES = {
+    'small': {'users': 50, 'projects': 20, 'tasks': 2000, 'comments': 6000},
+    'medium': {'users': 200, 'projects': 100, 'tasks': 20000, 'comments': 60000},
+    'large': {'users': 1000, 'projects': 500, 'tasks': 200000, 'comments': 600000},
+}
+
+BENCH_PASSWORD = 'bench-password-123'
+USERNAME_PREFIX = 'bench_user_'
+
+_VERBS = ('Revisar', 'Implementar', 'Corregir', 'Documentar', 'Diseñar', 'Probar', 'Desplegar', 'Migrar')
+_NOUNS = ('login', 'reportes', 'facturación', 'dashboard', 'API', 'notificaciones', 'búsqueda', 'permisos')
+_WORDS = (
+    'el', 'cliente', 'pidió', 'ajustar', 'la', 'pantalla', 'de', 'resumen', 'antes', 'del', 'cierre',
+    'pendiente', 'validar', 'con', 'equipo', 'datos', 'producción', 'error', 'intermitente', 'móvil',
+)
+_STATUSES = (('por_hacer', 40), ('en_progreso', 25), ('revision', 10), ('completado', 25))
+_PRIORITIES = (('baja', 30), ('media', 40), ('alta', 20), ('urgente', 10))
+
+
+def zipf_weights(n, exponent=1.1):
+    return [1 / (rank + 1) ** exponent for rank in range(n)]
+
+
+def _sentence(rng, length):
+    return ' '.join(rng.choice(_WORDS) for _ in range(length)).capitalize()
+
+
+def _weighted(rng, choices, k):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=k)
+
+
+def seed(users, projects, tasks, comments, random_seed=42, chunk_size=2000):
+    """
+    Puebla la base configurada y devuelve el manifiesto con las credenciales
+    e IDs que usan los escenarios.
+
+    Se escribe con `bulk_create`, así que las filas derivadas que mantienen
+    las señales (perfiles, `ProjectAccess`, índice de búsqueda) se crean aquí
+    explícitamente.
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import transaction
+    from django.utils import timezone
+
+    from authentication.models import Profile
+    from projects.models import Project, ProjectAccess
+    from tasks.bulk import sync_completed_at
+    from tasks.models import Task, TaskComment
+
+    rng = random.Random(random_seed)
+    now = timezone.now()
+    # Un solo hash para todos: PBKDF2 por usuario haría el seed lentísimo
+    password = make_password(BENCH_PASSWORD)
+
+    with transaction.atomic():
+        user_objs = User.objects.bulk_create([
+            User(username=f'{USERNAME_PREFIX}{i:05d}', email=f'{USERNAME_PREFIX}{i:05d}@example.com',
+                 first_name=f'Usuario {i}', password=password)
+            for i in range(users)
+        ], batch_size=chunk_size)
+        Profile.objects.bulk_create_for(user_objs, batch_size=chunk_size)
+        user_ids = [user.id for user in user_objs]
+        hot_user_id = user_ids[0]
+
+        owner_ids = rng.choices(user_ids, weights=zipf_weights(users), k=projects)
+        owner_ids[0] = hot_user_id
+        project_objs = Project.objects.bulk_create([
+            Project(name=f'Proyecto {i} {rng.choice(_NOUNS)}', slug=f'bench-proyecto-{i}',
+                    description=_sentence(rng, 12), owner_id=owner_ids[i])
+            for i in range(projects)
+        ], batch_size=chunk_size)
+
+        participants = {}
+        through, access = [], []
+        for project in project_objs:
+            members = set(rng.sample(user_ids, min(rng.randint(1, 8), users)))
+            if rng.random() < 0.5:
+                members.add(hot_user_id)
+            members.discard(project.owner_id)
+            participants[project.id] = [project.owner_id, *sorted(members)]
+            access.append(ProjectAccess(project_id=project.id, user_id=project.owner_id, role=ProjectAccess.ROLE_OWNER))
+            for user_id in sorted(members):
+                through.append(Project.members.through(project_id=project.id, user_id=user_id))
+                access.append(ProjectAccess(project_id=project.id, user_id=user_id, role=ProjectAccess.ROLE_MEMBER))
+        Project.members.through.objects.bulk_create(through, batch_size=chunk_size)
+        ProjectAccess.objects.bulk_create(access, batch_size=chunk_size)
+
+    project_ids = [project.id for project in project_objs]
+    task_projects = rng.choices(project_ids, weights=zipf_weights(projects), k=tasks)
+    statuses = _weighted(rng, _STATUSES, tasks)
+    priorities = _weighted(rng, _PRIORITIES, tasks)
+
+    task_ids, task_project_ids = [], []
+    for start in range(0, tasks, chunk_size):
+        batch = []
+        for i in range(start, min(start + chunk_size, tasks)):
+            project_id = task_projects[i]
+            people = participants[project_id]
+            due_date = now + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.8 else None
+            task = Task(
+                title=f'{rng.choice(_VERBS)} {rng.choice(_NOUNS)} #{i}',
+                description=_sentence(rng, rng.randint(5, 40)),
+                project_id=project_id,
+                created_by_id=rng.choice(people),
+                assigned_to_id=rng.choice(people) if rng.random() < 0.7 else None,
+                status=statuses[i],
+                priority=priorities[i],
+                due_date=due_date,
+            )
+            sync_completed_at(task)
+            batch.append(task)
+        with transaction.atomic():
+            created = Task.objects.bulk_create(batch)
+        task_ids.extend(task.id for task in created)
+        task_project_ids.extend(task.project_id for task in created)
+
+    # Las tareas más comentadas quedan repartidas al azar, no concentradas en
+    # las primeras (que es de donde salen las tareas de los escenarios)
+    ranking = list(range(len(task_ids)))
+    rng.shuffle(ranking)
+    commented = rng.choices(ranking, weights=zipf_weights(len(ranking)), k=comments) if ranking else []
+    for start in range(0, len(commented), chunk_size):
+        batch = [
+            TaskComment(
+                task_id=task_ids[index],
+                author_id=rng.choice(participants[task_project_ids[index]]),
+                content=_sentence(rng, rng.randint(3, 30)),
+            )
+            for index in commented[start:start + chunk_size]
+        ]
+        with transaction.atomic():
+            TaskComment.objects.bulk_create(batch)
+
+    call_command('rebuild_search_index', stdout=io.StringIO())
+    # bulk_create directo no mantiene los contadores de tareas de los proyectos
+    call_command('rebuild_project_counters', stdout=io.StringIO())
+
+    hot_project_id = project_ids[0] if project_ids else None
+    # Tarea del proyecto caliente con algunos comentarios, no la más comentada
+    comment_counts = Counter(commented)
+    hot_tasks = [index for index, project_id in enumerate(task_project_ids) if project_id == hot_project_id]
+    hot_task = next((index for index in hot_tasks if comment_counts[index] >= 3), hot_tasks[0] if hot_tasks else None)
+    hot_task_id = task_ids[hot_task] if hot_task is not None else None
+    return {
+        'seed': random_seed,
+        'counts': {'users': users, 'projects': projects, 'tasks': tasks, 'comments': comments},
+        'password': BENCH_PASSWORD,
+        'hot_user': user_objs[0].username if user_objs else None,
+        'hot_project': hot_project_id,
+        'hot_task': hot_task_id,
+    }
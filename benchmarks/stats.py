@@ -0,0 +1,39 @@
+"""
+Percentiles y resumen de las muestras de un escenario
+"""
+import math
+
+
+def percentile(sorted_values, q):
+    """Percentil `q` (0-100) por interpolación lineal sobre valores ya ordenados."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize(samples):
+    """
+    Resume una lista de muestras `(segundos, consultas, bytes, ok)`.
+
+    Las latencias se informan en milisegundos; consultas y bytes como la
+    mediana, que es lo que se compara contra la línea base.
+    """
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    queries = sorted(sample[1] for sample in samples if sample[1] is not None)
+    sizes = sorted(sample[2] for sample in samples)
+    errors = sum(1 for sample in samples if not sample[3])
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'queries': percentile(queries, 50) if queries else None,
+        'bytes': percentile(sizes, 50),
+    }
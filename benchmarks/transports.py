@@ -0,0 +1,85 @@
+"""
+Formas de enviar las peticiones de un escenario
+
+`InProcessTransport` llama a la API con el cliente de pruebas de Django (sin
+red) y cuenta las consultas SQL de cada petición. `HTTPTransport` usa una
+sesión HTTP contra un servidor levantado y toma las consultas de la cabecera
+`Server-Timing` de la API cuando está presente.
+"""
+import re
+import time
+from collections import namedtuple
+
+Sample = namedtuple('Sample', 'seconds queries bytes ok')
+
+SERVER_TIMING_QUERIES_RE = re.compile(r'sql;[^,]*desc="queries=(\d+)')
+
+
+_test_environment_ready = False
+
+
+class InProcessTransport:
+    def __init__(self):
+        from django.test.utils import setup_test_environment
+        from rest_framework.test import APIClient
+
+        global _test_environment_ready
+        # Admite el host `testserver` del cliente de pruebas (una vez por proceso)
+        if not _test_environment_ready:
+            setup_test_environment()
+            _test_environment_ready = True
+        self.client = APIClient()
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def request(self, method, path, data=None, expect=(200,)):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        send = getattr(self.client, method.lower())
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = send(path, data, format='json') if data is not None else send(path)
+            if response.streaming:
+                body = b''.join(response.streaming_content)
+            else:
+                body = response.content
+            elapsed = time.perf_counter() - start
+        return Sample(elapsed, len(queries), len(body), response.status_code in expect), body
+
+
+class HTTPTransport:
+    """
+    Sesión HTTP con keep-alive. Con `form=True` envía formularios con el token
+    CSRF de la cookie (taskflow_web); si no, JSON (taskflow-api).
+    """
+
+    def __init__(self, base_url, form=False, timeout=30):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.form = form
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def authenticate(self, token):
+        self.session.headers['Authorization'] = f'Bearer {token}'
+
+    def request(self, method, path, data=None, expect=(200,)):
+        kwargs = {}
+        if data is not None and self.form:
+            kwargs['data'] = {**data, 'csrfmiddlewaretoken': self.session.cookies.get('csrftoken', '')}
+            kwargs['headers'] = {'Referer': self.base_url + path}
+        elif data is not None:
+            kwargs['json'] = data
+
+        start = time.perf_counter()
+        response = self.session.request(
+            method, self.base_url + path, allow_redirects=False, timeout=self.timeout, **kwargs
+        )
+        body = response.content
+        elapsed = time.perf_counter() - start
+        match = SERVER_TIMING_QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+        queries = int(match.group(1)) if match else None
+        return Sample(elapsed, queries, len(body), response.status_code in expect), body
@@ -0,0 +1,339 @@
+"""
+Caché de dos niveles con espacios de nombres, invalidación por versión y single-flight
+
+La usan como `CACHES['default']` la API y la web.
+
+`TieredCache` es un backend de Django (`CACHES['default']`) que pone un LRU
+en memoria del proceso (L1, TTL corto) delante de otro alias de `CACHES`
+compartido entre procesos (L2: archivos, Redis o cualquier backend de
+Django). Las lecturas calientes no salen del proceso; las escrituras van a
+ambos niveles. Como otro proceso puede tener una copia en su L1, un cambio
+tarda como máximo `L1_TIMEOUT` segundos en verse fuera del proceso que lo hizo.
+
+Encima del backend:
+
+- `namespace('project', project_id)` agrupa claves que se invalidan juntas
+  incrementando un número de versión, sin recorrer ni borrar claves.
+- `get_or_compute(key, compute)` evita la estampida: ante un fallo, una sola
+  llamada por proceso calcula el valor (las demás esperan su resultado) y un
+  candado `add()` en L2 hace lo mismo entre procesos.
+- `cache_stats()` devuelve aciertos y fallos por nivel.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches, cache as default_cache
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.utils.functional import cached_property
+
+__all__ = ['LRUStore', 'TieredCache', 'Namespace', 'namespace', 'get_or_compute', 'cache_stats']
+
+_MISSING = object()
+
+
+class CacheMetrics:
+    """Contadores aproximados (sin lock: un incremento perdido no importa)."""
+
+    FIELDS = ('l1_hits', 'l2_hits', 'misses', 'sets', 'deletes', 'computes', 'waits')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    def snapshot(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        lookups = data['l1_hits'] + data['l2_hits'] + data['misses']
+        data['hit_rate'] = round((data['l1_hits'] + data['l2_hits']) / lookups, 4) if lookups else None
+        return data
+
+
+class LRUStore:
+    """
+    LRU acotado con expiración por entrada, thread-safe.
+
+    Por defecto guarda los valores serializados con pickle, igual que los
+    backends de Django: quien lee obtiene su propia copia y no comparte objetos
+    mutables con otros requests del proceso. Con `serialize=False` guarda el
+    objeto tal cual, para valores que nadie modifica.
+    """
+
+    def __init__(self, max_entries, serialize=True):
+        self.max_entries = max_entries
+        self.serialize = serialize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, payload = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+        return pickle.loads(payload) if self.serialize else payload
+
+    def set(self, key, value, timeout):
+        if timeout is not None and timeout <= 0:
+            self.delete(key)
+            return
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL) if self.serialize else value
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._data[key] = (expires_at, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Django crea una instancia de backend por hilo: L1 y métricas se comparten
+# por LOCATION a nivel de módulo (como LocMemCache) para ser del proceso
+_l1_stores = {}
+_l1_metrics = {}
+_l1_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """
+    Backend L1 (LRU del proceso) + L2 (alias `OPTIONS['L2']` de `CACHES`).
+
+    Opciones: `L2` (alias, por defecto 'shared'), `L1_MAX_ENTRIES` y
+    `L1_TIMEOUT` (segundos máximos que una entrada vive en L1).
+    """
+
+    def __init__(self, location, params):
+        options = dict(params.get('OPTIONS') or {})
+        self._l2_alias = options.pop('L2', 'shared')
+        self.l1_timeout = options.pop('L1_TIMEOUT', 5)
+        max_entries = options.pop('L1_MAX_ENTRIES', 1024)
+        super().__init__({**params, 'OPTIONS': options})
+        with _l1_lock:
+            self._l1 = _l1_stores.setdefault(location, LRUStore(max_entries))
+            self.metrics = _l1_metrics.setdefault(location, CacheMetrics())
+
+    @cached_property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    def _l1_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        return self.l1_timeout if timeout is None else min(timeout, self.l1_timeout)
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._l1.get(local_key)
+        if value is not _MISSING:
+            self.metrics.l1_hits += 1
+            return value
+
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.metrics.misses += 1
+            return default
+        self.metrics.l2_hits += 1
+        self._l1.set(local_key, value, self.l1_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.metrics.sets += 1
+        self.l2.set(key, value, timeout=self._l2_timeout(timeout), version=version)
+        self._l1.set(self.make_and_validate_key(key, version=version), value, self._l1_timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=self._l2_timeout(timeout), version=version)
+        if added:
+            self.metrics.sets += 1
+            self._l1.set(self.make_and_validate_key(key, version=version), value, self._l1_timeout(timeout))
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout=self._l2_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self.metrics.deletes += 1
+        self._l1.delete(self.make_and_validate_key(key, version=version))
+        return self.l2.delete(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        # El contador vive solo en L2, que es quien puede hacerlo atómico
+        self._l1.delete(self.make_and_validate_key(key, version=version))
+        return self.l2.incr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self):
+        self._l1.clear()
+        self.l2.clear()
+
+    def clear_local(self):
+        """Vacía solo el L1 de este proceso."""
+        self._l1.clear()
+
+    def _l2_timeout(self, timeout):
+        # DEFAULT_TIMEOUT del L2 sería su propio TIMEOUT; se usa el de este backend
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+
+class Namespace:
+    """
+    Grupo de claves invalidable de una vez, p. ej. todo lo de un usuario o proyecto.
+
+    Las claves reales llevan la versión actual del espacio de nombres; invalidar
+    incrementa la versión y las entradas anteriores quedan huérfanas hasta que
+    expiran. La versión se guarda sin expiración en la misma caché.
+    """
+
+    def __init__(self, name, cache=None):
+        self.name = name
+        self.cache = cache or default_cache
+
+    @property
+    def _version_key(self):
+        return f'ns:{self.name}'
+
+    def version(self):
+        version = self.cache.get(self._version_key)
+        if version is None:
+            self.cache.add(self._version_key, 1, timeout=None)
+            version = self.cache.get(self._version_key) or 1
+        return version
+
+    def key(self, key):
+        return f'{self.name}:v{self.version()}:{key}'
+
+    def get(self, key, default=None):
+        return self.cache.get(self.key(key), default)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.cache.set(self.key(key), value, timeout)
+
+    def delete(self, key):
+        self.cache.delete(self.key(key))
+
+    def get_or_compute(self, key, compute, timeout=DEFAULT_TIMEOUT):
+        return get_or_compute(self.key(key), compute, timeout=timeout, cache=self.cache)
+
+    def invalidate(self):
+        try:
+            self.cache.incr(self._version_key)
+        except ValueError:
+            # La versión no existía (o expiró en L2): cualquier valor nuevo sirve
+            self.cache.set(self._version_key, int(time.time()), timeout=None)
+
+
+def namespace(*parts, cache=None):
+    """`namespace('user', 7)` -> espacio de nombres 'user:7'."""
+    return Namespace(':'.join(str(part) for part in parts), cache=cache)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_or_compute(key, compute, timeout=DEFAULT_TIMEOUT, cache=None,
+                   lock_timeout=LOCK_TIMEOUT):
+    """
+    Valor de `key` en caché o, si falta, el resultado de `compute()` guardado.
+
+    Dentro del proceso solo la primera llamada concurrente ejecuta `compute`;
+    las demás esperan y reciben el mismo resultado (o la misma excepción).
+    Entre procesos, quien consigue el candado en la caché calcula y el resto
+    espera hasta `lock_timeout` segundos a que aparezca el valor antes de
+    calcularlo por su cuenta.
+    """
+    cache = cache or default_cache
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        _record(cache, 'waits')
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = _compute_with_lock(cache, key, compute, timeout, lock_timeout)
+        return flight.result
+    except BaseException as error:
+        flight.error = error
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _compute_with_lock(cache, key, compute, timeout, lock_timeout):
+    lock_key = f'lock:{key}'
+    acquired = cache.add(lock_key, 1, timeout=lock_timeout)
+    if not acquired:
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            # Si el otro proceso falló y soltó el candado, tomarlo
+            acquired = cache.add(lock_key, 1, timeout=lock_timeout)
+            if acquired:
+                break
+        # Sin candado: calcular igualmente, sin tocar el candado del otro proceso
+    try:
+        if acquired:
+            # Otro proceso pudo guardar el valor y soltar el candado antes del add()
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        _record(cache, 'computes')
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+    finally:
+        if acquired:
+            cache.delete(lock_key)
+
+
+def _record(cache, field):
+    metrics = getattr(cache, 'metrics', None)
+    if metrics is not None:
+        setattr(metrics, field, getattr(metrics, field) + 1)
+
+
+def cache_stats(alias='default'):
+    """Métricas del backend `alias` si es un `TieredCache`, o None."""
+    metrics = getattr(caches[alias], 'metrics', None)
+    return metrics.snapshot() if metrics is not None else None
@@ -0,0 +1,73 @@
+"""
+Perfil de SQLite para producción (lo usan la API y la web)
+
+Con la configuración por defecto cada escritor toma el bloqueo de toda la
+base y los demás fallan con "database is locked" en cuanto se cruzan dos
+transacciones, y cada request abre la conexión de nuevo. `sqlite_database()`
+arma la entrada de `DATABASES` con:
+
+- PRAGMAs aplicados al abrir cada conexión (`init_command`): WAL para que las
+  lecturas no esperen a las escrituras, `synchronous=NORMAL` (seguro con WAL:
+  solo se puede perder la última transacción ante un corte de energía),
+  `busy_timeout` para esperar el bloqueo en lugar de fallar y `mmap_size` /
+  `cache_size` para servir las lecturas desde memoria.
+- `transaction_mode=IMMEDIATE`: las transacciones toman el bloqueo de
+  escritura al empezar. Con el modo por defecto (DEFERRED) una transacción
+  que lee y después escribe puede chocar con otra y fallar sin que el
+  `busy_timeout` sirva de nada.
+- Conexiones persistentes (`CONN_MAX_AGE`) con `CONN_HEALTH_CHECKS`.
+
+Con `read_only=True` arma la entrada de una réplica de solo lectura (ver
+`taskflow.routers` en la API; la web no la usa porque sesiones y mensajes se
+leen justo después de escribirse).
+
+Este módulo se importa desde los settings de ambos proyectos: no debe
+importar nada de Django.
+"""
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Negativo: en KiB (64 MiB por conexión)
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_database(name, *, pragmas=None, conn_max_age=60, read_only=False):
+    """
+    Entrada de `DATABASES` para el archivo SQLite `name`.
+
+    `pragmas` se combina con `DEFAULT_PRAGMAS` (un valor None quita el PRAGMA).
+    La réplica se abre con `mode=ro` y `query_only`, y no cambia el modo del
+    journal: eso lo decide quien la escribe.
+    """
+    pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+    options = {}
+    if read_only:
+        pragmas.pop('journal_mode', None)
+        pragmas['query_only'] = 'ON'
+        name = f'file:{name}?mode=ro'
+    else:
+        options['transaction_mode'] = 'IMMEDIATE'
+
+    if pragmas.get('busy_timeout') is not None:
+        # Espera del módulo sqlite3 al abrir; el PRAGMA cubre el resto
+        options['timeout'] = pragmas['busy_timeout'] / 1000
+    options['init_command'] = ';'.join(
+        f'PRAGMA {pragma} = {value}' for pragma, value in pragmas.items() if value is not None
+    )
+
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': options,
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': conn_max_age != 0,
+    }
+    if read_only:
+        # En los tests la réplica es la misma base de pruebas
+        database['TEST'] = {'MIRROR': 'default'}
+    return database
@@ -0,0 +1,29 @@
+"""
+Runner de tests de la API y la web
+
+Los settings apuntan el L2 de la caché (`CACHES['shared']`) a archivos o
+Redis, compartidos con los procesos que estén corriendo. Durante los tests se
+sustituye por memoria local con `override_settings`: cada ejecución empieza
+con la caché vacía y no escribe en `.cache/`.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+LOCAL_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+class LocalCacheTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        caches = {
+            alias: {**config, 'BACKEND': LOCAL_CACHE_BACKEND, 'OPTIONS': {}}
+            if alias == 'shared' else config
+            for alias, config in settings.CACHES.items()
+        }
+        self._local_caches = override_settings(CACHES=caches)
+        self._local_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._local_caches.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,66 @@
+"""
+Autenticación JWT con caché de tokens verificados y de usuarios
+
+`JWTAuthentication` decodifica y verifica la firma del token y carga el `User`
+en cada request. `CachedJWTAuthentication` guarda el token ya validado en un
+LRU del proceso, con clave el hash del token y vigencia hasta su `exp`, y
+obtiene el usuario de `user_cache` (caché compartida invalidada al guardar el
+usuario). Un cliente que repite su token no paga ni la verificación HMAC ni la
+consulta del usuario.
+
+Las comprobaciones sobre el usuario (activo, contraseña cambiada si
+`CHECK_REVOKE_TOKEN`) se repiten en cada request con el usuario cacheado.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from shared.cache import LRUStore
+
+from .user_cache import get_cached_user
+
+# El token validado no se modifica: se guarda sin serializar
+_validated_tokens = LRUStore(getattr(settings, 'JWT_TOKEN_CACHE_SIZE', 4096), serialize=False)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        key = hashlib.sha256(raw_token).hexdigest()
+        token = _validated_tokens.get(key, None)
+        if token is not None:
+            return token
+
+        token = super().get_validated_token(raw_token)
+        expires_in = token.get('exp', 0) - time.time()
+        if expires_in > 0:
+            _validated_tokens.set(key, token, expires_in)
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        try:
+            user = get_cached_user(user_id)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != user.cached_password_digest:
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
+
+
+def clear_token_cache():
+    _validated_tokens.clear()
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations
+
+# Índices para la búsqueda por prefijo sin distinguir mayúsculas (istartswith).
+# SQLite solo aplica la optimización de LIKE con índices COLLATE NOCASE;
+# PostgreSQL compara UPPER(columna) LIKE UPPER(...) y necesita *_pattern_ops.
+INDEXES = {
+    'sqlite': [
+        'CREATE INDEX IF NOT EXISTS auth_user_username_nocase_idx ON auth_user (username COLLATE NOCASE)',
+        'CREATE INDEX IF NOT EXISTS auth_user_email_nocase_idx ON auth_user (email COLLATE NOCASE)',
+    ],
+    'postgresql': [
+        'CREATE INDEX IF NOT EXISTS auth_user_username_upper_idx ON auth_user (UPPER(username) varchar_pattern_ops)',
+        'CREATE INDEX IF NOT EXISTS auth_user_email_upper_idx ON auth_user (UPPER(email) varchar_pattern_ops)',
+    ],
+}
+
+INDEX_NAMES = {
+    'sqlite': ['auth_user_username_nocase_idx', 'auth_user_email_nocase_idx'],
+    'postgresql': ['auth_user_username_upper_idx', 'auth_user_email_upper_idx'],
+}
+
+
+def create_indexes(apps, schema_editor):
+    for statement in INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_indexes(apps, schema_editor):
+    for name in INDEX_NAMES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
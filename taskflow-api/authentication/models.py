@@ -1,8 +1,22 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from .user_cache import forget_user
+
+
+class ProfileQuerySet(models.QuerySet):
+    def bulk_create_for(self, users, batch_size=None):
+        """
+        Crea los perfiles de usuarios dados de alta con `User.objects.bulk_create`,
+        que no dispara `post_save`. Un INSERT por lote; los que ya tienen perfil
+        se ignoran.
+        """
+        return self.bulk_create(
+            [Profile(user=user) for user in users], batch_size=batch_size, ignore_conflicts=True
+        )
+
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -13,9 +27,40 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProfileQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded = instance._profile_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Solo se escriben los campos que cambiaron desde que se leyó la fila
+        loaded = getattr(self, '_loaded', None)
+        if not self._state.adding and loaded is not None and kwargs.get('update_fields') is None:
+            current = self._profile_state()
+            changed = [name for name, value in current.items() if name not in loaded or loaded[name] != value]
+            if not changed:
+                return
+            kwargs['update_fields'] = [*changed, 'updated_at']
+        super().save(*args, **kwargs)
+        self._loaded = self._profile_state()
+
+    def _profile_state(self):
+        # Todos los campos concretos editables, incluido `user` (el admin lo
+        # permite cambiar). Los diferidos (only/defer) que no se llegaron a
+        # cargar quedan fuera
+        return {
+            field.name: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if not field.primary_key and field.name not in ('created_at', 'updated_at')
+            and field.attname in self.__dict__
+        }
+
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -24,5 +69,9 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    # Otra vez al confirmar: un request concurrente pudo volver a cachear la fila anterior
+    user_id = instance.pk
+    forget_user(user_id)
+    transaction.on_commit(lambda: forget_user(user_id))
@@ -33,6 +33,15 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Representación mínima de un usuario para listados."""
+
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'first_name', 'last_name')
+        read_only_fields = fields
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     
@@ -45,3 +54,11 @@ class ProfileSerializer(serializers.ModelSerializer):
         if value and not value.replace('+', '').replace('-', '').replace(' ', '').isdigit():
             raise serializers.ValidationError("El teléfono solo debe contener números, + y -")
         return value
+
+
+class UserLookupSerializer(UserSummarySerializer):
+    """Usuario en resultados de búsqueda (incluye el email por el que también se busca)."""
+
+    class Meta(UserSummarySerializer.Meta):
+        fields = UserSummarySerializer.Meta.fields + ('email',)
+        read_only_fields = fields
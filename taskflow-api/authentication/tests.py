@@ -41,3 +41,277 @@ class AuthenticationTests(TestCase):
         self.assertTrue(Profile.objects.filter(user=user).exists())
         profile = Profile.objects.get(user=user)
         self.assertEqual(str(profile), f"{user.username}'s Profile")
+
+
+class ProfileWriteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='writer', email='w@example.com', password='testpass123')
+
+    def _profile_writes(self, action):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            result = action()
+        return result, [q['sql'] for q in queries.captured_queries
+                        if 'authentication_profile' in q['sql'] and not q['sql'].startswith('SELECT')]
+
+    def test_login_does_not_write_profile(self):
+        response, writes = self._profile_writes(lambda: self.client.post(
+            '/api/auth/login/', {'username': 'writer', 'password': 'testpass123'}
+        ))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(writes, [])
+
+    def test_registration_inserts_profile_once(self):
+        response, writes = self._profile_writes(lambda: self.client.post('/api/auth/register/', {
+            'username': 'nuevo', 'email': 'n@example.com', 'password': 'testpass123', 'password_confirm': 'testpass123',
+        }))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('INSERT'))
+
+    def test_save_writes_only_changed_fields(self):
+        profile = Profile.objects.get(user=self.user)
+        _, writes = self._profile_writes(profile.save)
+        self.assertEqual(writes, [])
+
+        profile.bio = 'Hola'
+        _, writes = self._profile_writes(profile.save)
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"bio"', writes[0])
+        self.assertNotIn('"phone"', writes[0])
+        self.assertEqual(Profile.objects.get(pk=profile.pk).bio, 'Hola')
+
+    def test_save_writes_reassigned_user(self):
+        other = User.objects.create_user(username='otro', email='o@example.com', password='testpass123')
+        Profile.objects.filter(user=other).delete()
+        profile = Profile.objects.get(user=self.user)
+
+        profile.user = other
+        _, writes = self._profile_writes(profile.save)
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"user_id"', writes[0])
+        self.assertEqual(Profile.objects.get(pk=profile.pk).user_id, other.pk)
+
+    def test_profile_view_reads_with_join(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'writer')
+        self.assertEqual(len(queries), 1)
+
+    def test_profile_view_creates_missing_profile(self):
+        Profile.objects.filter(user=self.user).delete()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch('/api/auth/profile/', {'location': 'Lima'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Profile.objects.get(user=self.user).location, 'Lima')
+
+    def test_profile_view_tolerates_concurrent_creation(self):
+        from unittest import mock
+        from django.db.models.query import QuerySet
+
+        # Otro request creó el perfil entre la lectura y la creación
+        self.client.force_authenticate(user=self.user)
+        with mock.patch.object(QuerySet, 'first', return_value=None):
+            response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Profile.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_for(self):
+        users = User.objects.bulk_create([User(username=f'bulk{i}') for i in range(3)])
+        Profile.objects.bulk_create_for(users + [self.user])
+        self.assertEqual(Profile.objects.filter(user__username__startswith='bulk').count(), 3)
+        self.assertEqual(Profile.objects.filter(user=self.user).count(), 1)
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='searcher', email='s@example.com', password='testpass123')
+        for i in range(12):
+            User.objects.create_user(username=f'ana{i:02d}', email=f'ana{i:02d}@example.com', password='testpass123')
+        User.objects.create_user(username='zeta', email='Ana.Z@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+
+    def test_prefix_search_on_username_and_email(self):
+        response = self.client.get('/api/auth/users/search/', {'q': 'ANA', 'limit': 50})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        usernames = [user['username'] for user in response.data['results']]
+        self.assertEqual(len(usernames), 13)
+        self.assertIn('zeta', usernames)
+        self.assertIsNone(response.data['next'])
+
+    def test_keyset_paging(self):
+        first = self.client.get('/api/auth/users/search/', {'q': 'ana', 'limit': 5}).data
+        second = self.client.get('/api/auth/users/search/', {'q': 'ana', 'limit': 5, 'cursor': first['next']}).data
+        self.assertEqual([u['username'] for u in first['results']], [f'ana{i:02d}' for i in range(5)])
+        self.assertEqual([u['username'] for u in second['results']], [f'ana{i:02d}' for i in range(5, 10)])
+
+    def test_prefix_filter_uses_index(self):
+        from django.db import connection
+        from .user_search import filter_by_prefix
+
+        if connection.vendor != 'sqlite':
+            self.skipTest('Índices NOCASE específicos de SQLite')
+        plan = filter_by_prefix(User.objects.all(), 'ana').explain()
+        self.assertIn('auth_user_username_nocase_idx', plan)
+        self.assertIn('auth_user_email_nocase_idx', plan)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', email='c@example.com', password='testpass123')
+        self.token = str(AccessToken.for_user(self.user))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def _user_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/user/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and 'FROM "auth_user"' in q['sql']]
+
+    def test_second_request_skips_user_query(self):
+        self.assertEqual(len(self._user_queries()), 1)
+        self.assertEqual(self._user_queries(), [])
+
+    def test_validated_token_is_reused(self):
+        from .authentication import CachedJWTAuthentication
+
+        auth = CachedJWTAuthentication()
+        first = auth.get_validated_token(self.token.encode())
+        self.assertIs(auth.get_validated_token(self.token.encode()), first)
+
+    def test_cached_entry_has_no_password_hash(self):
+        from django.core.cache import caches
+        from rest_framework_simplejwt.utils import get_md5_hash_password
+        from .user_cache import _cache_key, get_cached_user
+
+        self.client.get('/api/auth/user/')
+        entry = caches['shared'].get(_cache_key(self.user.pk))
+        self.assertNotIn(self.user.password, repr(entry))
+        self.assertEqual(entry['password_digest'], get_md5_hash_password(self.user.password))
+
+        user = get_cached_user(self.user.pk)
+        self.assertEqual((user.username, user.email), ('cached', 'c@example.com'))
+        self.assertEqual(user.get_deferred_fields(), {'password'})
+        # Guardar el usuario cacheado no pisa la contraseña
+        user.first_name = 'Nombre'
+        user.save()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('testpass123'))
+
+    def test_revoked_token_checked_against_cached_digest(self):
+        from unittest import mock
+        from rest_framework_simplejwt.settings import api_settings
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+            self._user_queries()
+            self.user.set_password('otra-clave-123')
+            self.user.save()
+            response = self.client.get('/api/auth/user/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saving_user_invalidates_cache(self):
+        self.client.get('/api/auth/user/')
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/auth/user/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class CacheLayerTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        self.cache = cache
+        cache.clear()
+        cache.metrics.reset()
+
+    def test_levels_and_metrics(self):
+        self.cache.set('answer', 42)
+        self.assertEqual(self.cache.get('answer'), 42)
+        self.cache.clear_local()
+        self.assertEqual(self.cache.get('answer'), 42)
+        self.assertIsNone(self.cache.get('missing'))
+        stats = self.cache.metrics.snapshot()
+        self.assertEqual((stats['l1_hits'], stats['l2_hits'], stats['misses']), (1, 1, 1))
+
+    def test_namespace_invalidation(self):
+        from shared.cache import namespace
+
+        project, other = namespace('project', 1), namespace('project', 2)
+        project.set('summary', 'old')
+        other.set('summary', 'kept')
+        project.invalidate()
+        self.assertIsNone(project.get('summary'))
+        self.assertEqual(other.get('summary'), 'kept')
+
+    def test_single_flight(self):
+        import threading
+        import time
+        from shared.cache import get_or_compute
+
+        calls = []
+        results = []
+        barrier = threading.Barrier(5)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        def worker():
+            barrier.wait()
+            results.append(get_or_compute('expensive', compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+
+    def test_foreign_lock_is_not_released(self):
+        from shared.cache import get_or_compute
+
+        # Otro proceso tiene el candado y no termina a tiempo
+        self.cache.add('lock:slow', 1, timeout=60)
+        self.assertEqual(get_or_compute('slow', lambda: 'mine', lock_timeout=0.05), 'mine')
+        self.assertEqual(self.cache.get('lock:slow'), 1)
+
+        self.assertEqual(get_or_compute('fast', lambda: 'value'), 'value')
+        self.assertIsNone(self.cache.get('lock:fast'))
+
+    def test_rechecks_value_after_acquiring_lock(self):
+        from unittest import mock
+        from shared.cache import get_or_compute
+
+        add = self.cache.add
+
+        def add_after_other_process(key, *args, **kwargs):
+            # El otro proceso guarda el valor y suelta el candado justo antes
+            self.cache.set('report', 'theirs')
+            return add(key, *args, **kwargs)
+
+        compute = mock.Mock(return_value='mine')
+        with mock.patch.object(self.cache, 'add', side_effect=add_after_other_process):
+            self.assertEqual(get_or_compute('report', compute), 'theirs')
+        compute.assert_not_called()
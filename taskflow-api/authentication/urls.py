@@ -9,4 +9,5 @@ urlpatterns = [
     path('profile/', views.ProfileView.as_view(), name='profile'),
     path('user/', views.user_profile, name='user-profile'),
     path('users/', views.UserListView.as_view(), name='user-list'),
+    path('users/search/', views.user_search, name='user-search'),
 ]
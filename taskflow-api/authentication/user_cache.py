@@ -0,0 +1,60 @@
+"""
+Caché de usuarios autenticados
+
+La autenticación carga el `User` del token en cada request. Sus campos, salvo
+la contraseña, se guardan en la caché compartida (`shared.cache`) durante
+`USER_CACHE_TIMEOUT` segundos y se borran al guardar o eliminar el usuario
+(receptores en `models.py`). Otros procesos pueden seguir viendo su copia L1
+hasta `L1_TIMEOUT` segundos más.
+
+El hash de la contraseña no llega al L2 (archivos o Redis): en su lugar se
+guarda el digest que usa `CHECK_REVOKE_TOKEN`, el mismo que lleva el token.
+El usuario se reconstruye con `password` diferido, así que leerlo hace una
+consulta y `save()` no lo pisa.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from shared.cache import get_or_compute
+
+
+def _cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _cached_fields(user_model):
+    return [field.attname for field in user_model._meta.concrete_fields if field.attname != 'password']
+
+
+def _load_user(user_model, user_id):
+    fields = _cached_fields(user_model)
+    values = user_model.objects.filter(pk=user_id).values(*fields, 'password').get()
+    return {
+        'values': [values[field] for field in fields],
+        'password_digest': get_md5_hash_password(values['password']),
+    }
+
+
+def get_cached_user(user_id):
+    """
+    Usuario `user_id` desde la caché o la base de datos; `DoesNotExist` si no existe.
+
+    Lleva en `cached_password_digest` el digest del hash de su contraseña.
+    """
+    user_model = get_user_model()
+    entry = get_or_compute(
+        _cache_key(user_id),
+        lambda: _load_user(user_model, user_id),
+        timeout=getattr(settings, 'USER_CACHE_TIMEOUT', 60),
+        cache=cache,
+    )
+    user = user_model.from_db(DEFAULT_DB_ALIAS, _cached_fields(user_model), entry['values'])
+    user.cached_password_digest = entry['password_digest']
+    return user
+
+
+def forget_user(user_id):
+    cache.delete(_cache_key(user_id))
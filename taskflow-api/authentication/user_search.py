@@ -0,0 +1,55 @@
+"""
+Búsqueda de usuarios por prefijo con paginación por keyset
+"""
+import base64
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def parse_limit(value, default=DEFAULT_LIMIT):
+    try:
+        return min(max(int(value), 1), MAX_LIMIT)
+    except (TypeError, ValueError):
+        return default
+
+
+def filter_by_prefix(queryset, query):
+    """
+    Usuarios cuyo username o email empieza por `query` (sin distinguir
+    mayúsculas). Cada rama del OR usa su índice por prefijo, así que el costo
+    depende de las coincidencias y no del total de usuarios.
+    """
+    query = (query or '').strip()
+    if not query:
+        return queryset
+    return queryset.filter(Q(username__istartswith=query) | Q(email__istartswith=query))
+
+
+def encode_cursor(username):
+    return base64.urlsafe_b64encode(username.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise NotFound('Cursor inválido')
+
+
+def keyset_page(queryset, limit, cursor=None):
+    """
+    Página ordenada por `username` (único) a partir del cursor.
+
+    Devuelve `(usuarios, siguiente_cursor)`; el cursor es `None` en la última página.
+    """
+    queryset = queryset.order_by('username')
+    if cursor:
+        queryset = queryset.filter(username__gt=decode_cursor(cursor))
+
+    users = list(queryset[:limit + 1])
+    next_cursor = encode_cursor(users[limit - 1].username) if len(users) > limit else None
+    return users[:limit], next_cursor
@@ -6,17 +6,22 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from .models import Profile
-from .serializers import UserSerializer, ProfileSerializer
-from drf_spectacular.utils import extend_schema
+from .serializers import UserSerializer, ProfileSerializer, UserLookupSerializer
+from .user_search import filter_by_prefix, keyset_page, parse_limit
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 
 class UserListView(generics.ListAPIView):
     """
     Vista para listar todos los usuarios disponibles
     """
-    queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Orden estable para la paginación; ?q= filtra por prefijo usando los índices
+        queryset = User.objects.order_by('username')
+        return filter_by_prefix(queryset, self.request.query_params.get('q'))
     
     @extend_schema(
         summary="Listar todos los usuarios",
@@ -31,6 +36,46 @@ class UserListView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
+@extend_schema(
+    summary="Buscar usuarios",
+    description=(
+        "Busca usuarios cuyo username o email empieza por `q`. Los resultados se ordenan por "
+        "username y se paginan por cursor (`next`), pensado para autocompletado incremental"
+    ),
+    operation_id="auth_users_search",
+    tags=["Autenticacion"],
+    parameters=[
+        OpenApiParameter('q', str, description='Prefijo de username o email'),
+        OpenApiParameter('limit', int, description='Resultados por página (máximo 50, por defecto 10)'),
+        OpenApiParameter('cursor', str, description='Cursor devuelto en `next`'),
+    ],
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'results': {'type': 'array', 'items': {'type': 'object'}},
+                'next': {'type': 'string', 'nullable': True},
+            }
+        },
+        401: {'type': 'object', 'properties': {'detail': {'type': 'string'}}},
+        404: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Cursor inválido'}}}
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_search(request):
+    queryset = filter_by_prefix(User.objects.all(), request.query_params.get('q'))
+    users, next_cursor = keyset_page(
+        queryset,
+        parse_limit(request.query_params.get('limit')),
+        request.query_params.get('cursor'),
+    )
+    return Response({
+        'results': UserLookupSerializer(users, many=True).data,
+        'next': next_cursor,
+    })
+
+
 @extend_schema(
     summary="Iniciar sesión de usuario",
     description="Autentica al usuario y retorna tokens JWT de acceso y refresco",
@@ -99,7 +144,12 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_object(self):
-        profile, created = Profile.objects.get_or_create(user=self.request.user)
+        # Perfil y usuario en un JOIN; solo se crea si falta (usuarios anteriores a la señal).
+        # get_or_create recupera la fila si otro request la crea a la vez
+        user = self.request.user
+        profile = Profile.objects.select_related('user').filter(user=user).first()
+        if profile is None:
+            profile, _created = Profile.objects.get_or_create(user=user)
         return profile
     
     @extend_schema(
@@ -0,0 +1,44 @@
+"""
+Consulta de pertenencia usuario-proyecto compartida por vistas, permisos y serializers
+"""
+from .models import ProjectAccess
+
+
+def _pk(value):
+    return getattr(value, 'pk', value)
+
+
+class MembershipOracle:
+    """
+    Responde "¿participa el usuario X en el proyecto P?" (owner o miembro).
+
+    Cada pregunta es un único `EXISTS` indexado sobre `ProjectAccess`, así que
+    el costo no depende de cuántos miembros tenga el proyecto. Las respuestas
+    se memorizan: usar `membership_for(request)` para compartirlas entre la
+    vista, los permisos y el serializer de un mismo request.
+    """
+
+    def __init__(self):
+        self._answers = {}
+
+    def is_participant(self, user, project):
+        try:
+            key = (int(_pk(user)), int(_pk(project)))
+        except (TypeError, ValueError):
+            return False
+        if key not in self._answers:
+            self._answers[key] = ProjectAccess.objects.filter(
+                user_id=key[0], project_id=key[1]
+            ).exists()
+        return self._answers[key]
+
+
+def membership_for(request):
+    """Oráculo memorizado en el request; sin request se crea uno nuevo."""
+    if request is None:
+        return MembershipOracle()
+    oracle = getattr(request, '_membership_oracle', None)
+    if oracle is None:
+        oracle = MembershipOracle()
+        request._membership_oracle = oracle
+    return oracle
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_project_access(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectAccess = apps.get_model('projects', 'ProjectAccess')
+
+    rows = {}
+    for project_id, user_id in Project.members.through.objects.values_list('project_id', 'user_id'):
+        rows[(user_id, project_id)] = 'member'
+    for project_id, owner_id in Project.objects.values_list('id', 'owner_id'):
+        rows[(owner_id, project_id)] = 'owner'
+
+    ProjectAccess.objects.bulk_create(
+        [ProjectAccess(user_id=user_id, project_id=project_id, role=role)
+         for (user_id, project_id), role in rows.items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_alter_project_members'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('owner', 'Propietario'), ('member', 'Miembro')], max_length=10)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'project'), name='unique_project_access')],
+            },
+        ),
+        migrations.RunPython(backfill_project_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:56
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+
+STATUS_COUNTERS = {
+    'por_hacer': 'todo_count',
+    'en_progreso': 'in_progress_count',
+    'revision': 'review_count',
+    'completado': 'completed_count',
+}
+PRIORITY_COUNTERS = {
+    'baja': 'low_priority_count',
+    'media': 'medium_priority_count',
+    'alta': 'high_priority_count',
+    'urgente': 'urgent_priority_count',
+}
+
+
+def backfill_task_counters(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+
+    aggregates = {'task_count': Count('id'), 'last_activity_at': Max('updated_at')}
+    aggregates.update({field: Count('id', filter=Q(status=status)) for status, field in STATUS_COUNTERS.items()})
+    aggregates.update({field: Count('id', filter=Q(priority=priority)) for priority, field in PRIORITY_COUNTERS.items()})
+    aggregates['overdue_count'] = Count('id', filter=Q(due_date__lt=timezone.now()) & ~Q(status='completado'))
+
+    for row in Task.objects.order_by().values('project_id').annotate(**aggregates):
+        Project.objects.filter(pk=row.pop('project_id')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_version'),
+        ('tasks', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='high_priority_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='last_activity_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='low_priority_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='medium_priority_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='overdue_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todo_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='urgent_priority_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
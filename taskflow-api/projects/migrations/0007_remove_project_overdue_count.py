@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_task_counters'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='project',
+            name='overdue_count',
+        ),
+    ]
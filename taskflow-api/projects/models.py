@@ -1,8 +1,69 @@
-from django.db import models
+import re
+
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import post_save, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.text import slugify
 
 
+# Margen para el sufijo dentro de max_length=200
+SLUG_BASE_LENGTH = 190
+# Altas concurrentes pueden elegir el mismo slug: reintentos con el siguiente libre
+SLUG_ATTEMPTS = 5
+
+
+class ProjectQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Proyectos donde el usuario es propietario o miembro."""
+        return self.filter(id__in=ProjectAccess.project_ids_for(user))
+
+    def allocate_slugs(self, names):
+        """
+        Slugs libres para `names` (en orden; los nombres repetidos reciben
+        sufijos distintos) con una consulta por slug base distinto.
+
+        Se buscan la base y sus variantes `base-N` con un rango sobre el índice
+        único (`base-` <= slug < `base.`) en lugar de `LIKE 'base%'`, que en
+        SQLite no usa el índice, y se continúa desde el mayor sufijo.
+        """
+        taken_by_base = {}
+        slugs = []
+        for name in names:
+            base = slugify(name)[:SLUG_BASE_LENGTH].strip('-') or 'proyecto'
+            taken = taken_by_base.get(base)
+            if taken is None:
+                taken = taken_by_base[base] = set(self.filter(
+                    models.Q(slug=base) | models.Q(slug__gte=f'{base}-', slug__lt=f'{base}.')
+                ).values_list('slug', flat=True))
+
+            slug = base
+            if slug in taken:
+                suffix_re = re.compile(rf'{re.escape(base)}-(\d+)')
+                suffixes = (int(match.group(1)) for match in map(suffix_re.fullmatch, taken) if match)
+                slug = f'{base}-{max(suffixes, default=1) + 1}'
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    def overdue_counts(self):
+        """
+        Tareas abiertas con fecha límite vencida por proyecto, como `{pk: n}`.
+
+        No se guarda como contador: una tarea vence sin que nadie la escriba.
+        """
+        overdue = models.Q(tasks__due_date__lt=timezone.now()) & ~models.Q(tasks__status='completado')
+        return dict(self.order_by().annotate(
+            overdue=models.Count('tasks', filter=overdue)
+        ).values_list('pk', 'overdue'))
+
+    def touch(self):
+        """Renueva `updated_at` (ETags) e incrementa `version` (fragmentos cacheados)."""
+        return self.update(updated_at=timezone.now(), version=F('version') + 1)
+
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('activo', 'Activo'),
@@ -21,6 +82,31 @@ class Project(models.Model):
     end_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Crece con cada cambio de la representación del proyecto (campos, owner,
+    # miembros y sus datos): clave de los fragmentos serializados en caché
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    # Contadores de tareas desnormalizados, mantenidos por tasks.counters con
+    # incrementos F() en la misma transacción que la escritura de la tarea.
+    # Los reconstruye `manage.py rebuild_project_counters`
+    task_count = models.IntegerField(default=0, editable=False)
+    todo_count = models.IntegerField(default=0, editable=False)
+    in_progress_count = models.IntegerField(default=0, editable=False)
+    review_count = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
+    low_priority_count = models.IntegerField(default=0, editable=False)
+    medium_priority_count = models.IntegerField(default=0, editable=False)
+    high_priority_count = models.IntegerField(default=0, editable=False)
+    urgent_priority_count = models.IntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    COUNTER_FIELDS = (
+        'task_count', 'todo_count', 'in_progress_count', 'review_count', 'completed_count',
+        'low_priority_count', 'medium_priority_count', 'high_priority_count', 'urgent_priority_count',
+        'last_activity_at',
+    )
+
+    objects = ProjectQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
@@ -28,15 +114,183 @@ class Project(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Recordar el owner cargado para detectar cambios en post_save
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            i = 2
+        if self.slug:
+            self._save(*args, **kwargs)
+            return
 
-            while Project.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{i}"
-                i += 1
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = Project.objects.allocate_slugs([self.name])[0]
+            try:
+                # Savepoint: el fallo de unicidad no invalida la transacción exterior
+                with transaction.atomic():
+                    self._save(*args, **kwargs)
+                return
+            except IntegrityError:
+                taken = Project.objects.filter(slug=self.slug).exists()
+                self.slug = ''
+                if not taken or attempt == SLUG_ATTEMPTS - 1:
+                    raise
 
-            self.slug = slug
+    def _save(self, *args, **kwargs):
+        if self._state.adding or kwargs.get('force_insert'):
+            super().save(*args, **kwargs)
+            return
+        # Incremento atómico: dos guardados concurrentes nunca comparten versión
+        self.version = F('version') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # Los contadores nunca se escriben desde la instancia: pisarían incrementos concurrentes
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        kwargs['update_fields'] = {*update_fields, 'version'}
         super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+
+    @property
+    def fragment_key(self):
+        # created_at distingue un id reutilizado (base recreada) frente a una caché persistente
+        return f'project:{self.pk}:{self.created_at.timestamp():.6f}:v{self.version}'
+
+
+class ProjectAccess(models.Model):
+    """
+    Índice de acceso (usuario, proyecto, rol) mantenido por señales.
+
+    Evita resolver la visibilidad con OR sobre owner + la tabla M2M de miembros
+    seguido de DISTINCT: cada consulta de visibilidad se convierte en un
+    semi-join indexado sobre esta tabla.
+    """
+    ROLE_OWNER = 'owner'
+    ROLE_MEMBER = 'member'
+    ROLE_CHOICES = [
+        (ROLE_OWNER, 'Propietario'),
+        (ROLE_MEMBER, 'Miembro'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='project_access')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='access')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'project'], name='unique_project_access'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.project_id} ({self.role})"
+
+    @classmethod
+    def project_ids_for(cls, user):
+        """Subconsulta con los IDs de proyectos accesibles por el usuario."""
+        return cls.objects.filter(user=user).values('project_id')
+
+    @classmethod
+    def sync_project(cls, project):
+        """Recalcula las filas de acceso de un proyecto a partir de owner y miembros."""
+        desired = {user_id: cls.ROLE_MEMBER for user_id in project.members.values_list('id', flat=True)}
+        desired[project.owner_id] = cls.ROLE_OWNER
+
+        existing = dict(cls.objects.filter(project=project).values_list('user_id', 'role'))
+
+        stale = [user_id for user_id in existing if user_id not in desired]
+        if stale:
+            cls.objects.filter(project=project, user_id__in=stale).delete()
+
+        for user_id, role in desired.items():
+            if user_id in existing and existing[user_id] != role:
+                cls.objects.filter(project=project, user_id=user_id).update(role=role)
+
+        cls.objects.bulk_create([
+            cls(project=project, user_id=user_id, role=role)
+            for user_id, role in desired.items()
+            if user_id not in existing
+        ])
+
+
+@receiver(post_save, sender=Project)
+def sync_owner_access(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        ProjectAccess.objects.create(project=instance, user_id=instance.owner_id, role=ProjectAccess.ROLE_OWNER)
+    elif instance.owner_id != getattr(instance, '_loaded_owner_id', None):
+        ProjectAccess.sync_project(instance)
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def sync_member_access(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if action == 'post_clear':
+        if reverse:
+            ProjectAccess.objects.filter(user=instance, role=ProjectAccess.ROLE_MEMBER).delete()
+        else:
+            ProjectAccess.objects.filter(project=instance, role=ProjectAccess.ROLE_MEMBER).delete()
+        return
+
+    if not pk_set:
+        return
+
+    # Normalizar a pares (user_id, project_id) sin importar el lado de la relación
+    if reverse:
+        pairs = [(instance.pk, project_id) for project_id in pk_set]
+    else:
+        pairs = [(user_id, instance.pk) for user_id in pk_set]
+
+    if action == 'post_add':
+        # ignore_conflicts conserva el rol de owner si el propietario se agrega como miembro
+        ProjectAccess.objects.bulk_create(
+            [ProjectAccess(user_id=user_id, project_id=project_id, role=ProjectAccess.ROLE_MEMBER)
+             for user_id, project_id in pairs],
+            ignore_conflicts=True
+        )
+    else:
+        lookup = {'user': instance} if reverse else {'project': instance}
+        related = 'project_id__in' if reverse else 'user_id__in'
+        ProjectAccess.objects.filter(
+            role=ProjectAccess.ROLE_MEMBER, **lookup, **{related: pk_set}
+        ).delete()
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def touch_projects_on_member_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Los miembros son parte de la representación del proyecto: renovar
+    `updated_at` invalida sus ETags y la nueva `version` sus fragmentos.
+    """
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        Project.objects.filter(pk=instance.pk).touch()
+        # La instancia se sigue usando (p. ej. para la respuesta): que serialice con la versión nueva
+        instance.refresh_from_db(fields=['version', 'updated_at'])
+    elif reverse and action in ('post_add', 'post_remove') and pk_set:
+        Project.objects.filter(pk__in=pk_set).touch()
+    elif reverse and action == 'pre_clear':
+        # Tras el clear ya no se sabe de qué proyectos era miembro el usuario
+        instance.projects_as_member.touch()
+
+
+# Campos del usuario que aparecen en la representación del proyecto (UserSerializer)
+SERIALIZED_USER_FIELDS = {'username', 'email', 'first_name', 'last_name', 'date_joined'}
+
+
+@receiver(post_save, sender=User)
+def touch_projects_on_user_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Owner y miembros se serializan dentro del proyecto: sus cambios invalidan los fragmentos."""
+    if created or raw:
+        return
+    # Guardados parciales ajenos a la representación (p. ej. `last_login` al iniciar sesión)
+    if update_fields is not None and not SERIALIZED_USER_FIELDS.intersection(update_fields):
+        return
+    Project.objects.filter(id__in=ProjectAccess.objects.filter(user=instance).values('project_id')).touch()
@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from .membership import membership_for
 
 class IsProjectOwner(permissions.BasePermission):
     """
@@ -17,4 +18,4 @@ class IsProjectMember(permissions.BasePermission):
     Permiso que verifica si el usuario es miembro o propietario del proyecto.
     """
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user or obj.members.filter(id=request.user.id).exists()
+        return membership_for(request).is_participant(request.user, obj)
@@ -1,10 +1,47 @@
 from rest_framework import serializers
+from django.core.cache import cache
+from django.db import models
+from django.db.models import prefetch_related_objects
 from .models import Project
 from authentication.serializers import UserSerializer
 from django.contrib.auth.models import User
+from taskflow.eager_loading import EagerLoadingMixin
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+def render_project_fragments(projects, render):
+    """
+    Representación serializada de cada proyecto, como `{pk: datos}`.
+
+    Los fragmentos se guardan en caché bajo `Project.fragment_key` (id y
+    versión), así que un cambio en el proyecto o en sus miembros los deja sin
+    usar. Solo los que faltan se serializan con `render`, cargando antes los
+    miembros de todos ellos en una única consulta.
+    """
+    unique = {project.pk: project for project in projects}
+    keys = {project.fragment_key: pk for pk, project in unique.items()}
+    fragments = {keys[key]: data for key, data in cache.get_many(keys).items()}
+
+    missing = [project for pk, project in unique.items() if pk not in fragments]
+    if missing:
+        prefetch_related_objects(missing, 'members')
+        rendered = {project.pk: render(project) for project in missing}
+        cache.set_many({unique[pk].fragment_key: data for pk, data in rendered.items()})
+        fragments.update(rendered)
+    return fragments
+
+
+class ProjectListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        projects = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        fragments = render_project_fragments(projects, self.child.render)
+        overdue = self.child.overdue_counts(projects)
+        return [self.child.splice_counters(fragments[project.pk], project, overdue) for project in projects]
+
+
+class ProjectSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    # Los miembros no se precargan: solo hacen falta para los fragmentos que no están en caché
+    select_related_fields = ('owner',)
+
     owner = UserSerializer(read_only=True)
     members = UserSerializer(many=True, read_only=True)
     member_ids = serializers.ListField(
@@ -16,6 +53,40 @@ class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = '__all__'
+        list_serializer_class = ProjectListSerializer
+
+    def __init__(self, *args, counters=True, **kwargs):
+        # counters=False al anidar el proyecto (p. ej. en la tarea), donde los contadores no aportan
+        super().__init__(*args, **kwargs)
+        self.include_counters = counters
+
+    def to_representation(self, instance):
+        fragment = render_project_fragments([instance], self.render)[instance.pk]
+        return self.splice_counters(fragment, instance, self.overdue_counts([instance]))
+
+    def render(self, instance):
+        """Serialización sin caché y sin contadores (la parte que depende de `version`)."""
+        data = super().to_representation(instance)
+        for name in Project.COUNTER_FIELDS:
+            data.pop(name, None)
+        return data
+
+    def overdue_counts(self, projects):
+        """Tareas vencidas de `projects` en una consulta (se calculan al leer, ver `tasks.counters`)."""
+        if not self.include_counters or not projects:
+            return {}
+        return Project.objects.filter(pk__in=[project.pk for project in projects]).overdue_counts()
+
+    def splice_counters(self, fragment, instance, overdue):
+        """Los contadores cambian sin cambiar la versión: se toman de la fila cargada, no del fragmento."""
+        if not self.include_counters:
+            return fragment
+        data = dict(fragment)
+        for name in Project.COUNTER_FIELDS:
+            value = getattr(instance, name)
+            data[name] = None if value is None else self.fields[name].to_representation(value)
+        data['overdue_count'] = overdue.get(instance.pk, 0)
+        return data
     
     def validate_member_ids(self, value):
         if value:
@@ -50,3 +121,12 @@ class ProjectSerializer(serializers.ModelSerializer):
             instance.members.set(members)
         
         return instance
+
+
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    """Representación mínima de un proyecto (sin owner ni miembros) para resúmenes."""
+
+    class Meta:
+        model = Project
+        fields = ('id', 'name', 'slug', 'description', 'status', 'created_at')
+        read_only_fields = fields
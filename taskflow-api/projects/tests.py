@@ -1,7 +1,8 @@
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import Project
+from .models import Project, ProjectAccess
+from .membership import MembershipOracle
 
 class ProjectTests(APITestCase):
     def setUp(self):
@@ -52,3 +53,191 @@ class ProjectTests(APITestCase):
         response = self.client.get('/api/projects/')
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['name'], 'Test Project')
+
+
+class ProjectAccessTests(APITestCase):
+    """El índice de acceso se mantiene sincronizado con owner y miembros."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.project = Project.objects.create(name='Access Project', owner=self.owner)
+
+    def _roles(self):
+        return dict(ProjectAccess.objects.filter(project=self.project).values_list('user_id', 'role'))
+
+    def test_owner_row_created_with_project(self):
+        self.assertEqual(self._roles(), {self.owner.id: 'owner'})
+
+    def test_member_add_and_remove(self):
+        self.project.members.add(self.member)
+        self.assertEqual(self._roles(), {self.owner.id: 'owner', self.member.id: 'member'})
+
+        self.member.projects_as_member.remove(self.project)
+        self.assertEqual(self._roles(), {self.owner.id: 'owner'})
+
+    def test_owner_change_keeps_previous_owner_as_member(self):
+        self.project.members.add(self.owner, self.member)
+        self.project.owner = self.member
+        self.project.save()
+        self.assertEqual(self._roles(), {self.owner.id: 'member', self.member.id: 'owner'})
+
+    def test_member_sees_project_in_list(self):
+        self.project.members.add(self.member)
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([p['id'] for p in response.data['results']], [self.project.id])
+
+
+class ProjectConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.project = Project.objects.create(name='ETag Project', owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_unchanged_project_returns_not_modified(self):
+        etag = self.client.get(f'/api/projects/{self.project.id}/')['ETag']
+        response = self.client.get(f'/api/projects/{self.project.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_member_change_invalidates_etag(self):
+        etag = self.client.get('/api/projects/')['ETag']
+        self.member.projects_as_member.add(self.project)
+        response = self.client.get('/api/projects/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_task_falling_overdue_invalidates_etag(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from tasks.models import Task
+
+        now = timezone.now()
+        Task.objects.create(title='Vence', project=self.project, created_by=self.owner,
+                            due_date=now + timedelta(hours=1))
+        for url in ('/api/projects/', f'/api/projects/{self.project.id}/'):
+            etag = self.client.get(url)['ETag']
+            # La fecha límite pasa sin que se escriba ninguna fila
+            with mock.patch('django.utils.timezone.now', return_value=now + timedelta(days=1)):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            data = response.data['results'][0] if 'results' in response.data else response.data
+            self.assertEqual(data['overdue_count'], 1)
+
+
+class MembershipOracleTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.outsider = User.objects.create_user(username='outsider', password='password123')
+        self.project = Project.objects.create(name='Oracle Project', owner=self.owner)
+        self.project.members.add(self.member)
+
+    def test_owner_and_members_are_participants(self):
+        oracle = MembershipOracle()
+        self.assertTrue(oracle.is_participant(self.owner, self.project))
+        self.assertTrue(oracle.is_participant(self.member.id, self.project.id))
+        self.assertFalse(oracle.is_participant(self.outsider, self.project))
+        self.assertFalse(oracle.is_participant(self.member, 'no-es-un-id'))
+
+    def test_answers_are_memoized(self):
+        oracle = MembershipOracle()
+        oracle.is_participant(self.member, self.project)
+        with self.assertNumQueries(0):
+            self.assertTrue(oracle.is_participant(self.member.id, str(self.project.id)))
+
+
+class AvailableUsersTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.candidates = [
+            User.objects.create_user(username=f'maria{i}', password='password123') for i in range(3)
+        ]
+        self.project = Project.objects.create(name='Available Project', owner=self.owner)
+        self.project.members.add(self.member)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_excludes_participants_and_filters_by_prefix(self):
+        response = self.client.get(f'/api/projects/{self.project.id}/members/list/')
+        self.assertEqual([u['username'] for u in response.data['users']], ['maria0', 'maria1', 'maria2'])
+
+        response = self.client.get(f'/api/projects/{self.project.id}/members/list/', {'q': 'maria1'})
+        self.assertEqual([u['username'] for u in response.data['users']], ['maria1'])
+        self.assertIsNone(response.data['next'])
+
+
+class ProjectFragmentCacheTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.project = Project.objects.create(name='Cacheado', owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def _members(self):
+        response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [member['username'] for member in response.data['results'][0]['members']]
+
+    def test_save_and_member_changes_bump_version(self):
+        version = self.project.version
+        self.project.name = 'Renombrado'
+        self.project.save()
+        self.assertEqual(self.project.version, version + 1)
+        self.project.members.add(self.member)
+        self.assertEqual(self.project.version, version + 2)
+
+    def test_cached_fragment_is_reused_until_version_changes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.assertEqual(self._members(), [])
+        with CaptureQueriesContext(connection) as queries:
+            self._members()
+        self.assertFalse(any('projects_project_members' in q['sql'] for q in queries.captured_queries))
+
+        self.project.members.add(self.member)
+        self.assertEqual(self._members(), ['member'])
+
+    def test_member_user_change_invalidates_fragment(self):
+        self.project.members.add(self.member)
+        self._members()
+        self.member.username = 'renamed'
+        self.member.save()
+        self.assertEqual(self._members(), ['renamed'])
+
+
+class ProjectSlugTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+
+    def test_suffixes_continue_from_highest(self):
+        slugs = [Project.objects.create(name='Sprint', owner=self.owner).slug for _ in range(3)]
+        self.assertEqual(slugs, ['sprint', 'sprint-2', 'sprint-3'])
+        # Otra base que comparte prefijo no cuenta como sufijo
+        self.assertEqual(Project.objects.create(name='Sprint planning', owner=self.owner).slug, 'sprint-planning')
+        self.assertEqual(Project.objects.allocate_slugs(['Sprint', 'Sprint', 'Otro']), ['sprint-4', 'sprint-5', 'otro'])
+
+    def test_allocation_is_one_query_regardless_of_existing(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for _ in range(20):
+            Project.objects.create(name='Sprint', owner=self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            slug = Project.objects.allocate_slugs(['Sprint'])[0]
+        self.assertEqual(slug, 'sprint-21')
+        self.assertEqual(len(queries), 1)
+
+    def test_concurrent_slug_conflict_is_retried(self):
+        from unittest import mock
+        from .models import ProjectQuerySet
+
+        Project.objects.create(name='Sprint', owner=self.owner)
+        # Simula otro alta que tomó 'sprint' entre el cálculo y el INSERT
+        with mock.patch.object(ProjectQuerySet, 'allocate_slugs', side_effect=[['sprint'], ['sprint-2']]):
+            project = Project.objects.create(name='Sprint', owner=self.owner)
+        self.assertEqual(project.slug, 'sprint-2')
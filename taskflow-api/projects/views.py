@@ -2,14 +2,30 @@ from rest_framework import generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db import models
-from .models import Project
+from django.utils import timezone
+from .models import Project, ProjectAccess
 from .serializers import ProjectSerializer
 from .permissions import IsProjectOwner
-from drf_spectacular.utils import extend_schema
+from tasks.models import Task
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from taskflow.eager_loading import EagerLoadingViewMixin
+from taskflow.conditional import ConditionalGetMixin
+from authentication.user_search import filter_by_prefix, keyset_page, parse_limit
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 
+class ProjectValidatorsMixin(ConditionalGetMixin):
+    # Los contadores de tareas renuevan `last_activity_at`, no `updated_at`
+    validator_fields = ('updated_at', 'last_activity_at')
+
+    def get_validator_extras(self, queryset):
+        # `overdue_count` se calcula al leer y crece sin escrituras cuando vence
+        # una tarea: sin esto un ETag viejo seguiría respondiendo 304
+        return Task.objects.filter(
+            project__in=queryset.values('pk'), due_date__lt=timezone.now()
+        ).exclude(status='completado').count()
+
+
 @extend_schema(
     summary="Listar proyectos del usuario",
     description="Retorna todos los proyectos donde el usuario es propietario o miembro",
@@ -19,15 +35,12 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
         401: {'type': 'object', 'properties': {'detail': {'type': 'string'}}}
     }
 )
-class ProjectListCreateView(generics.ListCreateAPIView):
+class ProjectListCreateView(ProjectValidatorsMixin, EagerLoadingViewMixin, generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Project.objects.filter(
-            models.Q(owner=self.request.user) | 
-            models.Q(members=self.request.user)
-        ).distinct()
+        return Project.objects.visible_to(self.request.user)
     
     @extend_schema(
         summary="Crear nuevo proyecto",
@@ -55,16 +68,13 @@ class ProjectListCreateView(generics.ListCreateAPIView):
         404: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Proyecto no encontrado'}}}
     }
 )
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(ProjectValidatorsMixin, EagerLoadingViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsProjectOwner]
 
     def get_queryset(self):
         # Cualq""" u """ier owner/miembro puede ver el proyecto.
-        return Project.objects.filter(
-            models.Q(owner=self.request.user) |
-            models.Q(members=self.request.user)
-        ).distinct()
+        return Project.objects.visible_to(self.request.user)
 
     def perform_update(self, serializer):
         # El permiso IsProjectOwner ya verifica que sea el dueño
@@ -196,10 +206,22 @@ def remove_project_member(request, project_id, user_id):
 
 @extend_schema(
     summary="Listar usuarios disponibles",
-    description="Retorna usuarios que no son miembros del proyecto (solo propietario)",
+    description=(
+        "Retorna usuarios que no son miembros del proyecto (solo propietario), filtrados por "
+        "prefijo de username o email y paginados por cursor"
+    ),
     tags=["Proyectos"],
+    parameters=[
+        OpenApiParameter('q', str, description='Prefijo de username o email'),
+        OpenApiParameter('limit', int, description='Resultados por página (máximo 50, por defecto 10)'),
+        OpenApiParameter('cursor', str, description='Cursor devuelto en `next`'),
+    ],
     responses={
-        200: {'type': 'object', 'properties': {'success': {'type': 'boolean'}, 'users': {'type': 'array'}}},
+        200: {'type': 'object', 'properties': {
+            'success': {'type': 'boolean'},
+            'users': {'type': 'array'},
+            'next': {'type': 'string', 'nullable': True},
+        }},
         403: {'type': 'object', 'properties': {'error': {'type': 'string'}}},
         404: {'type': 'object', 'properties': {'error': {'type': 'string'}}}
     }
@@ -215,8 +237,14 @@ def list_available_users(request, project_id):
 
     from django.contrib.auth.models import User
 
-    # Excluir usuarios que ya son miembros
-    users = User.objects.exclude(id__in=project.members.all())
+    # Excluir usuarios que ya participan (owner o miembros) y devolver solo una página
+    queryset = User.objects.exclude(id__in=ProjectAccess.objects.filter(project=project).values('user_id'))
+    queryset = filter_by_prefix(queryset, request.query_params.get('q'))
+    users, next_cursor = keyset_page(
+        queryset,
+        parse_limit(request.query_params.get('limit')),
+        request.query_params.get('cursor'),
+    )
 
     data = [
         {
@@ -227,4 +255,4 @@ def list_available_users(request, project_id):
         for u in users
     ]
 
-    return Response({'success': True, 'users': data})
+    return Response({'success': True, 'users': data, 'next': next_cursor})
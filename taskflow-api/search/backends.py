@@ -0,0 +1,257 @@
+"""
+Backends de búsqueda de texto completo
+
+`SQLiteFTS5Backend` mantiene un índice invertido en una tabla virtual FTS5.
+`DatabaseSearchBackend` es el respaldo para motores sin índice propio: no
+mantiene nada y busca con `icontains` (recorre las tablas).
+"""
+import html
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .documents import KIND_TASK, KIND_COMMENT, KIND_PROJECT, KINDS
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+# Marcadores de resaltado que no pueden aparecer en el texto; se sustituyen
+# por <mark> después de escapar el HTML
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query or '')[:MAX_TERMS]
+
+
+def render_highlight(text):
+    """Escapa el texto y convierte los marcadores en `<mark>`."""
+    return html.escape(text or '').replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def _hit(kind, object_id, project_id, task_id, title, snippet, score):
+    return {
+        'type': kind,
+        'id': object_id,
+        'project_id': project_id,
+        'task_id': task_id,
+        'title': render_highlight(title),
+        'snippet': render_highlight(snippet),
+        'score': score,
+    }
+
+
+class BaseSearchBackend:
+    def index(self, documents):
+        """Inserta o reemplaza documentos."""
+        raise NotImplementedError
+
+    def remove(self, kind, object_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, user, limit=20):
+        """Resultados visibles para `user`, del más al menos relevante."""
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    Índice invertido en la tabla virtual `search_index` (creada por migración).
+
+    El rowid se deriva de (tipo, id) para que reemplazar o borrar un documento
+    sea una búsqueda por clave y no un recorrido de la tabla. El ranking usa
+    BM25 con más peso en el título que en el cuerpo.
+    """
+    table = 'search_index'
+    title_weight = 10.0
+    body_weight = 1.0
+    snippet_tokens = 16
+
+    def _rowid(self, kind, object_id):
+        return int(object_id) * len(KINDS) + KINDS.index(kind)
+
+    def index(self, documents):
+        rows = [
+            (self._rowid(doc.kind, doc.object_id), doc.kind, doc.object_id, doc.project_id,
+             doc.task_id, doc.title, doc.body)
+            for doc in documents
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, kind, object_id, project_id, task_id, title, body) '
+                f'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+                rows
+            )
+
+    def remove(self, kind, object_ids):
+        rowids = [(self._rowid(kind, object_id),) for object_id in object_ids]
+        if not rowids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', rowids)
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+
+    min_prefix_length = 3
+
+    def build_match(self, terms):
+        """
+        Cada término va entre comillas para no interpretar sintaxis FTS del
+        usuario. Solo el último se busca como prefijo (escritura en curso): los
+        prefijos expanden a muchos términos y son la parte cara de la consulta.
+        """
+        phrases = ['"%s"' % term.replace('"', '') for term in terms]
+        if len(terms[-1]) >= self.min_prefix_length:
+            phrases[-1] += '*'
+        return ' '.join(phrases)
+
+    def search(self, query, user, limit=20):
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        from projects.models import ProjectAccess
+        from tasks.models import Task
+
+        access = f'SELECT project_id FROM {ProjectAccess._meta.db_table} WHERE user_id = %s'
+        task_table = Task._meta.db_table
+        # Tareas y comentarios se filtran por la tarea actual (visible por proyecto
+        # o asignación); los proyectos, por el índice de acceso
+        sql = f'''
+            SELECT kind, object_id,
+                   COALESCE((SELECT t.project_id FROM {task_table} t WHERE t.id = {self.table}.task_id), project_id),
+                   task_id,
+                   highlight({self.table}, 4, %s, %s),
+                   snippet({self.table}, 5, %s, %s, '…', %s),
+                   bm25({self.table}, 0, 0, 0, 0, %s, %s) AS score
+            FROM {self.table}
+            WHERE {self.table} MATCH %s
+              AND (
+                (kind = '{KIND_PROJECT}' AND project_id IN ({access}))
+                OR (kind != '{KIND_PROJECT}' AND task_id IN (
+                    SELECT id FROM {task_table} WHERE project_id IN ({access}) OR assigned_to_id = %s
+                ))
+              )
+            ORDER BY score
+            LIMIT %s
+        '''
+        params = [
+            MARK_START, MARK_END,
+            MARK_START, MARK_END, self.snippet_tokens,
+            self.title_weight, self.body_weight,
+            self.build_match(terms),
+            user.pk, user.pk, user.pk,
+            limit,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        # bm25 devuelve valores negativos: más pequeño es más relevante
+        return [
+            _hit(kind, object_id, project_id, task_id, title, snippet, round(-score, 4))
+            for kind, object_id, project_id, task_id, title, snippet, score in rows
+        ]
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Respaldo sin índice: `icontains` sobre los modelos, con resaltado en Python."""
+    snippet_chars = 120
+
+    def index(self, documents):
+        pass
+
+    def remove(self, kind, object_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def _matches(self, fields, terms):
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for field in fields:
+                term_condition |= Q(**{f'{field}__icontains': term})
+            condition &= term_condition
+        return condition
+
+    def _mark(self, text, terms):
+        pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+        return pattern.sub(lambda match: f'{MARK_START}{match.group(0)}{MARK_END}', text or '')
+
+    def _snippet(self, text, terms):
+        text = text or ''
+        lowered = text.lower()
+        positions = [lowered.find(term.lower()) for term in terms if term.lower() in lowered]
+        start = max(min(positions) - self.snippet_chars // 4, 0) if positions else 0
+        fragment = text[start:start + self.snippet_chars]
+        prefix = '…' if start > 0 else ''
+        suffix = '…' if start + self.snippet_chars < len(text) else ''
+        return prefix + self._mark(fragment, terms) + suffix
+
+    def _score(self, title, body, terms):
+        title, body = (title or '').lower(), (body or '').lower()
+        return sum(10 * title.count(term.lower()) + body.count(term.lower()) for term in terms)
+
+    def search(self, query, user, limit=20):
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        from projects.models import Project
+        from tasks.models import Task, TaskComment
+
+        tasks = Task.objects.visible_to(user)
+        hits = []
+        for project in Project.objects.visible_to(user).filter(self._matches(['name', 'description'], terms))[:limit]:
+            hits.append(_hit(
+                KIND_PROJECT, project.pk, project.pk, None, self._mark(project.name, terms),
+                self._snippet(project.description, terms), self._score(project.name, project.description, terms)
+            ))
+        for task in tasks.filter(self._matches(['title', 'description'], terms))[:limit]:
+            hits.append(_hit(
+                KIND_TASK, task.pk, task.project_id, task.pk, self._mark(task.title, terms),
+                self._snippet(task.description, terms), self._score(task.title, task.description, terms)
+            ))
+        comments = TaskComment.objects.filter(task__in=tasks).select_related('task')
+        for comment in comments.filter(self._matches(['content'], terms))[:limit]:
+            hits.append(_hit(
+                KIND_COMMENT, comment.pk, comment.task.project_id, comment.task_id, '',
+                self._snippet(comment.content, terms), self._score('', comment.content, terms)
+            ))
+
+        hits.sort(key=lambda hit: hit['score'], reverse=True)
+        return hits[:limit]
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_backend():
+    """
+    Backend configurado en `SEARCH_BACKEND`; si está vacío se elige según el
+    motor de base de datos (FTS5 en SQLite, `icontains` en los demás).
+    """
+    path = getattr(settings, 'SEARCH_BACKEND', '')
+    if not path:
+        if connection.vendor == 'sqlite':
+            path = 'search.backends.SQLiteFTS5Backend'
+        else:
+            path = 'search.backends.DatabaseSearchBackend'
+    return _load_backend(path)
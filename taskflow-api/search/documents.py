@@ -0,0 +1,42 @@
+"""
+Documentos indexables: tareas, comentarios y proyectos
+"""
+from collections import namedtuple
+
+KIND_TASK = 'task'
+KIND_COMMENT = 'comment'
+KIND_PROJECT = 'project'
+KINDS = (KIND_TASK, KIND_COMMENT, KIND_PROJECT)
+
+Document = namedtuple('Document', 'kind object_id project_id task_id title body')
+
+
+def task_document(task):
+    return Document(KIND_TASK, task.pk, task.project_id, task.pk, task.title, task.description or '')
+
+
+def comment_document(comment):
+    # El proyecto se resuelve a partir de la tarea al buscar, así mover una
+    # tarea de proyecto no obliga a reindexar sus comentarios
+    return Document(KIND_COMMENT, comment.pk, None, comment.task_id, '', comment.content)
+
+
+def project_document(project):
+    return Document(KIND_PROJECT, project.pk, project.pk, None, project.name, project.description or '')
+
+
+def iter_documents(Project, Task, TaskComment, chunk_size=2000):
+    """
+    Recorre todas las filas indexables sin cargarlas completas en memoria.
+
+    Recibe los modelos como argumentos para poder usarse desde migraciones
+    con los modelos históricos.
+    """
+    for project in Project.objects.only('id', 'name', 'description').iterator(chunk_size=chunk_size):
+        yield project_document(project)
+
+    for task in Task.objects.only('id', 'project_id', 'title', 'description').iterator(chunk_size=chunk_size):
+        yield task_document(task)
+
+    for comment in TaskComment.objects.only('id', 'task_id', 'content').iterator(chunk_size=chunk_size):
+        yield comment_document(comment)
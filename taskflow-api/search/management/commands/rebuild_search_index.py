@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.models import Project
+from tasks.models import Task, TaskComment
+from search.backends import get_backend
+from search.documents import iter_documents
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda a partir de proyectos, tareas y comentarios'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        batch, total = [], 0
+
+        # Una sola transacción: en autocommit cada fila del índice sería un
+        # commit a disco, y así las búsquedas ven el índice anterior hasta el final
+        with transaction.atomic():
+            backend.clear()
+            for document in iter_documents(Project, Task, TaskComment):
+                batch.append(document)
+                if len(batch) >= options['batch_size']:
+                    backend.index(batch)
+                    total += len(batch)
+                    batch = []
+            backend.index(batch)
+            total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'{total} documentos indexados'))
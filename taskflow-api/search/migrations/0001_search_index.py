@@ -0,0 +1,49 @@
+from django.db import migrations
+
+from search.backends import SQLiteFTS5Backend
+from search.documents import iter_documents
+
+BATCH_SIZE = 1000
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED, task_id UNINDEXED, "
+        "title, body, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+    backend = SQLiteFTS5Backend()
+    batch = []
+    documents = iter_documents(
+        apps.get_model('projects', 'Project'),
+        apps.get_model('tasks', 'Task'),
+        apps.get_model('tasks', 'TaskComment'),
+    )
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= BATCH_SIZE:
+            backend.index(batch)
+            batch = []
+    backend.index(batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS search_index")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_projectaccess'),
+        ('tasks', '0003_task_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,52 @@
+"""
+Mantenimiento incremental del índice de búsqueda
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from projects.models import Project
+from tasks.models import Task, TaskComment
+from tasks.signals import tasks_bulk_saved
+from .backends import get_backend
+from .documents import (
+    KIND_TASK, KIND_COMMENT, KIND_PROJECT,
+    task_document, comment_document, project_document,
+)
+
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_backend().index([project_document(instance)])
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_backend().index([task_document(instance)])
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def index_bulk_tasks(sender, tasks, **kwargs):
+    get_backend().index(task_document(task) for task in tasks)
+
+
+@receiver(post_save, sender=TaskComment)
+def index_comment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_backend().index([comment_document(instance)])
+
+
+@receiver(post_delete, sender=Project)
+def remove_project(sender, instance, **kwargs):
+    get_backend().remove(KIND_PROJECT, [instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def remove_task(sender, instance, **kwargs):
+    get_backend().remove(KIND_TASK, [instance.pk])
+
+
+@receiver(post_delete, sender=TaskComment)
+def remove_comment(sender, instance, **kwargs):
+    get_backend().remove(KIND_COMMENT, [instance.pk])
@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from projects.models import Project
+from tasks.models import Task, TaskComment
+from .backends import _load_backend
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.project = Project.objects.create(name='Migración de facturas', owner=self.owner)
+        self.task = Task.objects.create(
+            title='Exportar facturas', description='Generar el CSV mensual',
+            project=self.project, created_by=self.owner
+        )
+        self.other_task = Task.objects.create(
+            title='Revisar diseño', description='Incluye facturas <b>viejas</b>',
+            project=self.project, created_by=self.owner
+        )
+        foreign = Project.objects.create(name='Facturas ajenas', owner=self.other)
+        Task.objects.create(title='Facturas secretas', project=foreign, created_by=self.other)
+        self.client.force_authenticate(user=self.owner)
+
+    def _search(self, query):
+        response = self.client.get('/api/search/', {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results']
+
+    def test_ranks_title_matches_first_and_hides_foreign_projects(self):
+        results = self._search('facturas')
+        self.assertEqual(
+            [(hit['type'], hit['id']) for hit in results],
+            [('project', self.project.id), ('task', self.task.id), ('task', self.other_task.id)]
+        )
+        self.assertIn('<mark>facturas</mark>', results[1]['title'])
+        # El HTML del contenido se escapa
+        self.assertIn('&lt;b&gt;', results[2]['snippet'])
+
+    def test_accent_insensitive_prefix_match(self):
+        results = self._search('migracion')
+        self.assertEqual([hit['id'] for hit in results], [self.project.id])
+
+    def test_index_follows_saves_and_deletes(self):
+        comment = TaskComment.objects.create(task=self.task, author=self.owner, content='Falta el presupuesto')
+        self.assertEqual([hit['type'] for hit in self._search('presupuesto')], ['comment'])
+
+        self.task.title = 'Exportar presupuesto'
+        self.task.save()
+        self.assertEqual(len(self._search('presupuesto')), 2)
+
+        self.task.delete()
+        self.assertEqual(self._search('presupuesto'), [])
+        self.assertFalse(TaskComment.objects.filter(pk=comment.pk).exists())
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(len(self._search('facturas) OR "NEAR(')), 0)
+        self.assertEqual(len(self._search('"facturas*)')), 3)
+        self.assertEqual(self._search('   '), [])
+
+    @override_settings(SEARCH_BACKEND='search.backends.DatabaseSearchBackend')
+    def test_database_fallback_backend(self):
+        _load_backend.cache_clear()
+        results = self._search('facturas')
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['type'], 'project')
+        self.assertIn('<mark>', results[0]['title'])
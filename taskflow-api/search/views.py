@@ -0,0 +1,58 @@
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from .backends import get_backend
+
+MAX_LIMIT = 50
+
+
+@extend_schema(
+    summary="Buscar en tareas, comentarios y proyectos",
+    description=(
+        "Búsqueda de texto completo sobre título y descripción de tareas, contenido de "
+        "comentarios y nombre de proyectos visibles para el usuario. Los resultados vienen "
+        "ordenados por relevancia, con las coincidencias marcadas con <mark> (HTML escapado)"
+    ),
+    operation_id="search",
+    tags=["Búsqueda"],
+    parameters=[
+        OpenApiParameter('q', str, required=True, description='Texto a buscar'),
+        OpenApiParameter('limit', int, description=f'Cantidad máxima de resultados (máximo {MAX_LIMIT}, por defecto 20)'),
+    ],
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'query': {'type': 'string'},
+                'results': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'type': {'type': 'string', 'enum': ['task', 'comment', 'project']},
+                            'id': {'type': 'integer'},
+                            'project_id': {'type': 'integer', 'nullable': True},
+                            'task_id': {'type': 'integer', 'nullable': True},
+                            'title': {'type': 'string'},
+                            'snippet': {'type': 'string'},
+                            'score': {'type': 'number'},
+                        }
+                    }
+                }
+            }
+        },
+        401: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'No autorizado'}}}
+    }
+)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def search(request):
+    query = request.query_params.get('q', '').strip()
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = 20
+
+    results = get_backend().search(query, request.user, limit=limit) if query else []
+    return Response({'query': query, 'results': results})
@@ -0,0 +1,90 @@
+"""
+Peticiones condicionales (ETag / Last-Modified) para listados y detalles
+"""
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para vistas genéricas que emite `ETag` fuertes (y `Last-Modified`
+    en los detalles).
+
+    Los validadores se calculan con un único agregado (COUNT y MAX de los
+    campos de `validator_fields`) sobre el queryset visible, así que una
+    revalidación con `If-None-Match` responde 304 sin cargar ni serializar filas.
+    El conteo detecta borrados; los máximos de `updated_at` detectan altas y
+    modificaciones (incluidas las de objetos anidados que renuevan ese campo).
+
+    Lo que cambia sin que se escriba ninguna fila (p. ej. tareas que vencen con
+    el paso del tiempo) se agrega al ETag con `get_validator_extras()`.
+
+    Los listados no emiten `Last-Modified`: borrar una fila que no es la más
+    reciente no cambia ningún máximo, y un cliente que solo enviara
+    `If-Modified-Since` recibiría un 304 con datos viejos.
+    """
+    validator_fields = ('updated_at',)
+
+    def get_validators(self, queryset):
+        aggregates = {f'max_{index}': Max(field) for index, field in enumerate(self.validator_fields)}
+        values = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+
+        timestamps = [values[f'max_{index}'] for index in range(len(self.validator_fields))]
+        seed = [
+            self.request.user.pk,
+            self.request.get_full_path(),
+            getattr(self.request.accepted_renderer, 'format', None),
+            values['count'],
+            [value.isoformat() if value else None for value in timestamps],
+            self.get_validator_extras(queryset),
+        ]
+        etag = '"%s"' % hashlib.sha1(json.dumps(seed).encode()).hexdigest()
+
+        present = [value for value in timestamps if value is not None]
+        last_modified = int(max(present).timestamp()) if present else None
+        return values['count'], etag, last_modified
+
+    def get_validator_extras(self, queryset):
+        """Valores serializables en JSON que también invalidan el ETag."""
+        return None
+
+    def conditional_response(self, queryset, handler, request, *args, allow_empty=True,
+                             use_last_modified=True, **kwargs):
+        count, etag, last_modified = self.get_validators(queryset)
+        if not use_last_modified:
+            last_modified = None
+        # En un detalle sin filas se deja que la vista responda 404
+        if count or allow_empty:
+            not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return self._add_validators(not_modified, etag, last_modified)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            self._add_validators(response, etag, last_modified)
+        return response
+
+    def _add_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Siempre revalidar: el contenido depende del usuario autenticado
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            self.get_queryset(), super().list, request, *args, use_last_modified=False, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return self.conditional_response(
+            queryset, super().retrieve, request, *args, allow_empty=False, **kwargs
+        )
@@ -0,0 +1,39 @@
+"""
+Carga anticipada (eager loading) declarada por los serializers
+"""
+
+
+class EagerLoadingMixin:
+    """
+    Mixin para serializers que declaran el grafo de relaciones que necesitan.
+
+    Cada serializer indica en `select_related_fields` y `prefetch_related_fields`
+    las relaciones que recorre al serializar, de modo que las vistas puedan
+    aplicarlas al queryset en lugar de resolverlas fila por fila (N+1).
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Aplica al queryset el grafo de relaciones declarado por el serializer."""
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class EagerLoadingViewMixin:
+    """
+    Mixin para vistas genéricas que aplica automáticamente el grafo de carga
+    anticipada del serializer a los querysets de listado y detalle.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        setup_eager_loading = getattr(serializer_class, 'setup_eager_loading', None)
+        if setup_eager_loading is not None:
+            queryset = setup_eager_loading(queryset)
+        return queryset
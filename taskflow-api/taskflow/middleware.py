@@ -0,0 +1,177 @@
+"""
+Instrumentación de consultas SQL por request
+
+`QueryInstrumentationMiddleware` envuelve todas las conexiones con
+`connection.execute_wrapper` mientras se atiende el request y:
+
+- publica el número de consultas, duplicadas y el tiempo SQL en la cabecera
+  `Server-Timing` (visible en las herramientas del navegador y en la web);
+- registra cada request en el logger `taskflow.sql` (con los datos también
+  en `extra` para formateadores estructurados), con nivel WARNING si hay un
+  patrón N+1 o si el request fue lento;
+- guarda una muestra de los requests lentos o con N+1 en un buffer circular
+  que el endpoint `api/debug/sql/` expone a los administradores.
+
+Las consultas que se ejecutan al consumir una respuesta en streaming (por
+ejemplo la exportación) ocurren después del middleware y no se cuentan.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .routers import read_from_replica
+
+logger = logging.getLogger('taskflow.sql')
+
+MAX_SQL_LENGTH = 500
+TOP_STATEMENTS = 5
+
+
+class QueryStats:
+    """
+    Wrapper de ejecución que acumula consultas y tiempo por texto SQL.
+
+    Se agrupa por la plantilla (con `%s` en lugar de parámetros), que es lo que
+    se repite en un N+1: la misma consulta por cada fila del listado.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # sql -> [ejecuciones, segundos]
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            entry = self.statements.get(sql)
+            if entry is None:
+                self.statements[sql] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    @property
+    def duplicates(self):
+        """Ejecuciones de más: las repeticiones de una misma plantilla."""
+        return sum(count - 1 for count, _duration in self.statements.values() if count > 1)
+
+    def repeated(self, threshold):
+        """Plantillas ejecutadas más de `threshold` veces, de la más repetida a la menos."""
+        found = [(sql, count) for sql, (count, _duration) in self.statements.items() if count > threshold]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+    def slowest(self, limit=TOP_STATEMENTS):
+        ordered = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [(sql, count, duration) for sql, (count, duration) in ordered[:limit]]
+
+
+class SlowRequestLog:
+    """Buffer circular (en memoria del proceso) de requests lentos o con N+1."""
+
+    def __init__(self, size):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self):
+        """Copia de las entradas, de la más reciente a la más antigua."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_requests = SlowRequestLog(getattr(settings, 'SQL_RING_BUFFER_SIZE', 200))
+
+
+def _truncate(sql):
+    return sql if len(sql) <= MAX_SQL_LENGTH else sql[:MAX_SQL_LENGTH] + '…'
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        response['Server-Timing'] = (
+            f'sql;dur={stats.duration * 1000:.2f};desc="queries={stats.count} duplicates={stats.duplicates}", '
+            f'total;dur={total * 1000:.2f}'
+        )
+        self._report(request, response, stats, total)
+        return response
+
+    def _report(self, request, response, stats, total):
+        threshold = getattr(settings, 'SQL_N_PLUS_ONE_THRESHOLD', 5)
+        slow_ms = getattr(settings, 'SQL_SLOW_REQUEST_MS', 500)
+        repeated = stats.repeated(threshold)
+        slow = total * 1000 >= slow_ms
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': getattr(getattr(request, 'user', None), 'pk', None),
+            'total_ms': round(total * 1000, 2),
+            'sql_ms': round(stats.duration * 1000, 2),
+            'queries': stats.count,
+            'duplicates': stats.duplicates,
+            'n_plus_one': [{'sql': _truncate(sql), 'count': count} for sql, count in repeated[:TOP_STATEMENTS]],
+        }
+        level = logging.WARNING if (repeated or slow) else logging.DEBUG
+        logger.log(
+            level,
+            'method=%s path=%s status=%s total_ms=%.2f sql_ms=%.2f queries=%d duplicates=%d n_plus_one=%d',
+            record['method'], record['path'], record['status'], record['total_ms'], record['sql_ms'],
+            record['queries'], record['duplicates'], len(repeated),
+            extra={'sql_stats': record},
+        )
+
+        sample_rate = getattr(settings, 'SQL_SLOW_REQUEST_SAMPLE_RATE', 1.0)
+        if (repeated or slow) and random.random() < sample_rate:
+            record['timestamp'] = timezone.now().isoformat()
+            record['slowest'] = [
+                {'sql': _truncate(sql), 'count': count, 'ms': round(duration * 1000, 2)}
+                for sql, count, duration in stats.slowest()
+            ]
+            slow_requests.add(record)
+
+
+class ReadReplicaMiddleware:
+    """Lecturas de los requests de solo lectura a la réplica (ver `taskflow.routers`)."""
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in self.SAFE_METHODS:
+            return self.get_response(request)
+        with read_from_replica():
+            return self.get_response(request)
@@ -0,0 +1,163 @@
+"""
+Paginación por keyset (cursor) para listados ordenados por fecha
+"""
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por keyset sobre (`created_at`, `id`).
+
+    Cada página se obtiene con un filtro de rango sobre la última fila vista en
+    lugar de un OFFSET, así que el costo no crece al avanzar en el historial.
+    El total es opcional (`?count=true`) y se sirve desde caché durante
+    `count_cache_timeout` segundos.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at', '-id')
+    count_cache_timeout = 60
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.count = self.get_count(queryset) if self.count_requested(request) else None
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self._reversed_ordering() if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._position_filter(position, ordering))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'description': 'Total de elementos (solo con ?count=true)'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor de paginación devuelto en `next`/`previous`',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Incluye el total de elementos en la respuesta',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+
+    def count_requested(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_count(self, queryset):
+        queryset = queryset.order_by()
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return 0
+        key = 'keyset-count:' + hashlib.sha1(sql.encode()).hexdigest()
+        return cache.get_or_set(key, queryset.count, self.count_cache_timeout)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            value = parse_datetime(payload['v'])
+            pk = int(payload['i'])
+            reverse = bool(payload.get('r', False))
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (value, pk), reverse
+
+    def encode_cursor(self, instance, reverse):
+        field = self.ordering[0].lstrip('-')
+        payload = {'v': getattr(instance, field).isoformat(), 'i': instance.pk, 'r': reverse}
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        url = remove_query_param(self.base_url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _reversed_ordering(self):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering)
+
+    def _position_filter(self, position, ordering):
+        """Filas estrictamente posteriores a `position` en el orden dado."""
+        value, pk = position
+        field, pk_field = (name.lstrip('-') for name in ordering)
+        lookup = 'lt' if ordering[0].startswith('-') else 'gt'
+        return (
+            Q(**{f'{field}__{lookup}': value}) |
+            Q(**{field: value, f'{pk_field}__{lookup}': pk})
+        )
+
+
+class CommentKeysetPagination(KeysetPagination):
+    """Comentarios en orden cronológico ascendente."""
+    ordering = ('created_at', 'id')
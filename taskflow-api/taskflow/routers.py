@@ -0,0 +1,60 @@
+"""
+Réplica de lectura opcional para los endpoints de solo lectura
+
+Si `DB_REPLICA_PATH` apunta a una copia de la base (mantenida por fuera, por
+ejemplo con Litestream o `sqlite3 .backup` periódico), settings define el
+alias `replica` y activa `ReadReplicaMiddleware` y `ReadReplicaRouter`. El
+middleware marca los requests GET/HEAD/OPTIONS y, mientras dura el request,
+el router manda sus lecturas a la réplica.
+
+Siguen yendo a la base principal:
+
+- las escrituras, y las lecturas dentro de una transacción de la principal
+  (lo que se lee ahí suele ser para escribir después);
+- los modelos de `READ_REPLICA_EXCLUDED_APPS` (por defecto usuarios y
+  sesiones: un usuario recién registrado tiene que poder autenticarse aunque
+  la réplica vaya atrasada).
+
+Un GET puede ver datos con el retraso de la réplica.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+DEFAULT_EXCLUDED_APPS = ('auth', 'authentication', 'contenttypes', 'sessions', 'admin')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def read_from_replica():
+    """Manda a la réplica las lecturas del bloque (lo usa el middleware)."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or REPLICA_ALIAS not in settings.DATABASES:
+            return None
+        if model._meta.app_label in getattr(settings, 'READ_REPLICA_EXCLUDED_APPS', DEFAULT_EXCLUDED_APPS):
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las dos bases tienen las mismas filas
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
@@ -2,12 +2,18 @@
 Django settings for taskflow project.
 """
 
+import sys
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Raíz del repositorio: paquete `shared` (compartido con la web)
+sys.path.append(str(BASE_DIR.parent))
+
+from shared.db import sqlite_database  # noqa: E402
+
 SECRET_KEY = config('SECRET_KEY')
 DEBUG = config('DEBUG', default=False, cast=bool)
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='127.0.0.1,localhost').split(',')
@@ -25,9 +31,11 @@ INSTALLED_APPS = [
     'authentication',
     'projects',
     'tasks',
+    'search',
 ]
 
 MIDDLEWARE = [
+    'taskflow.middleware.QueryInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -58,13 +66,28 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'taskflow.wsgi.application'
 
+# SQLite con WAL, PRAGMAs y conexiones persistentes (ver shared/db.py)
+DATABASE_PRAGMAS = {
+    'synchronous': config('DB_SYNCHRONOUS', default='NORMAL'),
+    'busy_timeout': config('DB_BUSY_TIMEOUT', default=5000, cast=int),
+    'mmap_size': config('DB_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+    'cache_size': config('DB_CACHE_SIZE', default=-64000, cast=int),
+}
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', pragmas=DATABASE_PRAGMAS, conn_max_age=DB_CONN_MAX_AGE),
 }
 
+# Réplica opcional para los GET (ver taskflow/routers.py)
+DB_REPLICA_PATH = config('DB_REPLICA_PATH', default='')
+if DB_REPLICA_PATH:
+    DATABASES['replica'] = sqlite_database(
+        DB_REPLICA_PATH, pragmas=DATABASE_PRAGMAS, conn_max_age=DB_CONN_MAX_AGE, read_only=True
+    )
+    DATABASE_ROUTERS = ['taskflow.routers.ReadReplicaRouter']
+    MIDDLEWARE.insert(1, 'taskflow.middleware.ReadReplicaMiddleware')
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -81,7 +104,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -106,6 +129,67 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Caché de dos niveles (shared/cache.py, compartida con la web): LRU en memoria
+# del proceso (L1) delante de una caché compartida entre procesos (L2). Por
+# defecto L2 es en archivos; para Redis:
+# CACHE_L2_BACKEND=django.core.cache.backends.redis.RedisCache y
+# CACHE_L2_LOCATION=redis://127.0.0.1:6379/1. Los tests usan memoria local
+# (TEST_RUNNER).
+CACHE_L2_BACKEND = config('CACHE_L2_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'shared.cache.TieredCache',
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {
+            'L2': 'shared',
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=5, cast=int),
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1024, cast=int),
+        },
+    },
+    'shared': {
+        'BACKEND': CACHE_L2_BACKEND,
+        'LOCATION': config('CACHE_L2_LOCATION', default=str(BASE_DIR / '.cache')),
+        'KEY_PREFIX': 'taskflow-api',
+        # MAX_ENTRIES solo lo entienden los backends de archivos y memoria
+        'OPTIONS': {} if 'redis' in CACHE_L2_BACKEND.lower() else {
+            'MAX_ENTRIES': config('CACHE_L2_MAX_ENTRIES', default=10000, cast=int),
+        },
+    },
+}
+
+TEST_RUNNER = 'shared.testing.LocalCacheTestRunner'
+
+# Autenticación JWT (authentication.authentication): tokens verificados que se
+# recuerdan por proceso y segundos que un usuario permanece en caché
+JWT_TOKEN_CACHE_SIZE = config('JWT_TOKEN_CACHE_SIZE', default=4096, cast=int)
+USER_CACHE_TIMEOUT = config('USER_CACHE_TIMEOUT', default=60, cast=int)
+
+# Backend de búsqueda de texto completo; vacío = según el motor de base de datos
+# (search.backends.SQLiteFTS5Backend en SQLite, DatabaseSearchBackend en otros)
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+
+# Instrumentación SQL por request (taskflow.middleware)
+SQL_N_PLUS_ONE_THRESHOLD = config('SQL_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+SQL_SLOW_REQUEST_MS = config('SQL_SLOW_REQUEST_MS', default=500, cast=float)
+SQL_SLOW_REQUEST_SAMPLE_RATE = config('SQL_SLOW_REQUEST_SAMPLE_RATE', default=1.0, cast=float)
+SQL_RING_BUFFER_SIZE = config('SQL_RING_BUFFER_SIZE', default=200, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'taskflow.sql': {
+            'handlers': ['console'],
+            'level': config('SQL_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'TaskFlow API',
     'DESCRIPTION': 'API REST para TaskFlow',
@@ -0,0 +1,41 @@
+"""
+Sparse fieldsets: permite al cliente pedir solo los campos que necesita
+"""
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin para serializers que acepta el argumento `fields` con la lista de
+    campos a conservar. El resto se descarta antes de serializar.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Mixin para vistas genéricas que traduce `?fields=a,b,c` en el argumento
+    `fields` del serializer. Solo aplica a lecturas para no afectar la
+    validación de escrituras.
+    """
+    fields_query_param = 'fields'
+
+    def get_sparse_fields(self):
+        if self.request.method != 'GET':
+            return None
+        raw_fields = self.request.query_params.get(self.fields_query_param)
+        if not raw_fields:
+            return None
+        return [name.strip() for name in raw_fields.split(',') if name.strip()]
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 from authentication.jwt_views import HiddenTokenRefreshView
+from tasks.views import dashboard_summary, export_project_tasks, import_project_tasks
+from taskflow.views import cache_debug, sql_debug
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
 urlpatterns = [
@@ -32,7 +34,13 @@ urlpatterns = [
     # Endpoints de la API
     path('api/auth/', include('authentication.urls')),
     path('api/projects/', include('projects.urls')),
+    path('api/projects/<int:project_id>/export/', export_project_tasks, name='project-export'),
+    path('api/projects/<int:project_id>/import/', import_project_tasks, name='project-import'),
     path('api/tasks/', include('tasks.urls')),
+    path('api/dashboard/summary/', dashboard_summary, name='dashboard-summary'),
+    path('api/search/', include('search.urls')),
+    path('api/debug/sql/', sql_debug, name='sql-debug'),
+    path('api/debug/cache/', cache_debug, name='cache-debug'),
 
     # JWT refresh
     path('api/token/refresh/', HiddenTokenRefreshView.as_view(), name='token_refresh'),
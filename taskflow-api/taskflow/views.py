@@ -5,10 +5,13 @@ from django.http import JsonResponse
 from django.conf import settings
 from django.views.decorators.http import require_http_methods
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
+from django.core.cache import cache
+from shared.cache import cache_stats
+from .middleware import slow_requests
 
 
 @api_view(['GET'])
@@ -170,3 +173,51 @@ def health_check(request):
         "api": "TaskFlow API",
         "version": "1.0.0"
     })
+
+
+@extend_schema(
+    summary="Requests lentos o con N+1",
+    description=(
+        "Muestra de los últimos requests que superaron SQL_SLOW_REQUEST_MS o repitieron una misma "
+        "consulta más de SQL_N_PLUS_ONE_THRESHOLD veces (más reciente primero). Solo administradores; "
+        "DELETE vacía el buffer"
+    ),
+    tags=["General"],
+    responses={
+        200: {'type': 'object', 'properties': {'results': {'type': 'array', 'items': {'type': 'object'}}}},
+        204: None,
+        403: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Permiso denegado'}}}
+    }
+)
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def sql_debug(request):
+    if request.method == 'DELETE':
+        slow_requests.clear()
+        return Response(status=204)
+    return Response({'results': slow_requests.entries()})
+
+
+@extend_schema(
+    summary="Métricas de la caché",
+    description=(
+        "Aciertos en L1 (memoria del proceso) y L2 (caché compartida), fallos, escrituras y cálculos "
+        "de la caché por defecto en este proceso. Solo administradores; DELETE reinicia las métricas "
+        "y vacía el L1 del proceso"
+    ),
+    tags=["General"],
+    responses={
+        200: {'type': 'object'},
+        204: None,
+        403: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Permiso denegado'}}}
+    }
+)
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def cache_debug(request):
+    if request.method == 'DELETE':
+        if hasattr(cache, 'metrics'):
+            cache.metrics.reset()
+            cache.clear_local()
+        return Response(status=204)
+    return Response(cache_stats() or {})
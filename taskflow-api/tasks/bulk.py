@@ -0,0 +1,233 @@
+"""
+Operaciones en bloque sobre tareas (crear, actualizar y eliminar)
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from projects.models import ProjectAccess
+from . import counters
+from .models import Task
+from .signals import tasks_bulk_saved
+
+OP_CREATE = 'create'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+OPERATIONS = (OP_CREATE, OP_UPDATE, OP_DELETE)
+
+
+def sync_completed_at(task):
+    # Misma regla que Task.save(), que bulk_create/bulk_update no invocan
+    if task.status == 'completado' and not task.completed_at:
+        task.completed_at = timezone.now()
+    elif task.status != 'completado':
+        task.completed_at = None
+
+
+class TaskBulkSerializer(serializers.ModelSerializer):
+    """
+    Valida los campos de una operación sin consultar la base de datos.
+
+    Proyecto y asignado llegan como IDs; la pertenencia se resuelve para todo
+    el lote de una vez en `BulkTaskProcessor`.
+    """
+    project_id = serializers.IntegerField()
+    assigned_to_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = ('title', 'description', 'status', 'priority', 'due_date', 'project_id', 'assigned_to_id')
+
+
+class BulkTaskProcessor:
+    """
+    Aplica una lista de operaciones `{"op", "id", "data"}` para un usuario.
+
+    Independientemente del tamaño del lote se hacen dos lecturas (tareas
+    afectadas y filas de `ProjectAccess` de proyectos y usuarios involucrados)
+    y las escrituras van con `bulk_create`/`bulk_update`, todo en una
+    transacción: las tareas se leen con `select_for_update`, así una edición
+    concurrente no se pisa con valores leídos antes. Cada `bulk_update` escribe
+    solo los campos que pidió cada operación (un UPDATE por combinación de
+    campos). Cada operación obtiene su propio resultado; las inválidas no
+    impiden aplicar las demás.
+    """
+    max_operations = 500
+
+    def __init__(self, user):
+        self.user = user
+
+    def process(self, operations):
+        results = [None] * len(operations)
+        parsed = []
+
+        for index, operation in enumerate(operations):
+            item, errors = self._parse(operation)
+            if errors:
+                results[index] = self._error(index, operation, errors)
+            else:
+                parsed.append((index, item))
+
+        with transaction.atomic():
+            tasks = self._load_tasks(parsed)
+            access = self._load_access(parsed, tasks)
+
+            to_create, to_update, to_delete = [], [], []
+            seen_ids = set()
+            for index, item in parsed:
+                errors = self._check(item, tasks, access, seen_ids)
+                if errors:
+                    results[index] = self._error(index, item, errors)
+                    continue
+                if item['op'] == OP_CREATE:
+                    to_create.append((index, self._build_task(item)))
+                elif item['op'] == OP_UPDATE:
+                    # Solo se escriben los campos que pidió la operación
+                    fields = {*item['data'].keys(), 'completed_at', 'updated_at'}
+                    to_update.append((index, self._apply_update(tasks[item['id']], item['data']), frozenset(fields)))
+                else:
+                    to_delete.append((index, item['id']))
+
+            self._write(to_create, to_update, to_delete)
+
+        for index, task in to_create:
+            results[index] = self._ok(index, OP_CREATE, task.pk)
+        for index, task, _fields in to_update:
+            results[index] = self._ok(index, OP_UPDATE, task.pk)
+        for index, task_id in to_delete:
+            results[index] = self._ok(index, OP_DELETE, task_id)
+        return results
+
+    # --- Validación ---
+
+    def _parse(self, operation):
+        if not isinstance(operation, dict):
+            return None, {'non_field_errors': ['Cada operación debe ser un objeto']}
+
+        op = operation.get('op')
+        if op not in OPERATIONS:
+            return None, {'op': [f'Operación no soportada: {op}']}
+
+        item = {'op': op, 'id': operation.get('id'), 'data': {}}
+        if op != OP_CREATE:
+            try:
+                item['id'] = int(item['id'])
+            except (TypeError, ValueError):
+                return None, {'id': ['Se requiere el ID de la tarea']}
+        if op == OP_DELETE:
+            return item, None
+
+        data = operation.get('data') or {}
+        if op == OP_UPDATE and 'project_id' in data:
+            return None, {'project_id': ['No se puede cambiar el proyecto en una operación en bloque']}
+
+        serializer = TaskBulkSerializer(data=data, partial=(op == OP_UPDATE))
+        if not serializer.is_valid():
+            return None, serializer.errors
+        item['data'] = serializer.validated_data
+        if 'assigned_to_id' in item['data'] and not item['data']['assigned_to_id']:
+            # Igual que en TaskSerializer: 0/null desasignan
+            item['data']['assigned_to_id'] = None
+        item['fields'] = set(data.keys())
+        return item, None
+
+    def _load_tasks(self, parsed):
+        task_ids = {item['id'] for _index, item in parsed if item['op'] != OP_CREATE}
+        if not task_ids:
+            return {}
+        queryset = Task.objects.visible_to(self.user).filter(id__in=task_ids).select_for_update()
+        return {task.id: task for task in queryset}
+
+    def _load_access(self, parsed, tasks):
+        """Roles por (proyecto, usuario) del solicitante y los asignados, en una consulta."""
+        project_ids = {task.project_id for task in tasks.values()}
+        user_ids = {self.user.id}
+        for _index, item in parsed:
+            if item['op'] == OP_CREATE:
+                project_ids.add(item['data']['project_id'])
+            if item['data'].get('assigned_to_id'):
+                user_ids.add(item['data']['assigned_to_id'])
+
+        if not project_ids:
+            return {}
+        rows = ProjectAccess.objects.filter(
+            project_id__in=project_ids, user_id__in=user_ids
+        ).values_list('project_id', 'user_id', 'role')
+        return {(project_id, user_id): role for project_id, user_id, role in rows}
+
+    def _check(self, item, tasks, access, seen_ids):
+        op, data = item['op'], item['data']
+
+        if op == OP_CREATE:
+            project_id = data['project_id']
+            if (project_id, self.user.id) not in access:
+                return {'project_id': ['No tienes permiso para crear tareas en este proyecto']}
+        else:
+            task = tasks.get(item['id'])
+            if task is None:
+                return {'id': ['Tarea no encontrada']}
+            if task.id in seen_ids:
+                return {'id': ['La tarea ya aparece en otra operación del lote']}
+            seen_ids.add(task.id)
+
+            project_id = task.project_id
+            can_manage = (
+                access.get((project_id, self.user.id)) == ProjectAccess.ROLE_OWNER or
+                task.created_by_id == self.user.id
+            )
+            if not can_manage:
+                # Como en el endpoint individual, el responsable solo puede cambiar el estado
+                if op == OP_DELETE or task.assigned_to_id != self.user.id:
+                    return {'non_field_errors': ['No tienes permiso para modificar esta tarea']}
+                if not item['fields'] <= {'status'}:
+                    return {'non_field_errors': ['Como Responsable, solo puedes cambiar el estado.']}
+
+        assigned_to_id = data.get('assigned_to_id')
+        if assigned_to_id and (project_id, assigned_to_id) not in access:
+            return {'assigned_to_id': ['El usuario no pertenece al proyecto']}
+        return None
+
+    # --- Escritura ---
+
+    def _build_task(self, item):
+        task = Task(created_by=self.user, **item['data'])
+        sync_completed_at(task)
+        return task
+
+    def _apply_update(self, task, data):
+        for attr, value in data.items():
+            setattr(task, attr, value)
+        sync_completed_at(task)
+        # bulk_update no aplica auto_now
+        task.updated_at = timezone.now()
+        return task
+
+    def _write(self, to_create, to_update, to_delete):
+        # batch(): los contadores del proyecto se ajustan con un UPDATE por proyecto, no por tarea
+        with counters.batch():
+            if to_create:
+                created = Task.objects.bulk_create([task for _index, task in to_create])
+                tasks_bulk_saved.send(sender=Task, tasks=created, created=True)
+            if to_update:
+                updated = [task for _index, task, _fields in to_update]
+                # Un bulk_update por combinación de campos, para no reescribir los demás
+                groups = defaultdict(list)
+                for _index, task, fields in to_update:
+                    groups[fields].append(task)
+                for fields, group in groups.items():
+                    Task.objects.bulk_update(group, sorted(fields))
+                tasks_bulk_saved.send(sender=Task, tasks=updated, created=False)
+            if to_delete:
+                Task.objects.filter(id__in=[task_id for _index, task_id in to_delete]).delete()
+
+    # --- Resultados ---
+
+    def _ok(self, index, op, task_id):
+        return {'index': index, 'op': op, 'status': 'ok', 'id': task_id}
+
+    def _error(self, index, operation, errors):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        task_id = operation.get('id') if isinstance(operation, dict) else None
+        return {'index': index, 'op': op, 'status': 'error', 'id': task_id, 'errors': errors}
@@ -0,0 +1,159 @@
+"""
+Contadores de tareas desnormalizados en `Project`
+
+Cada escritura de tareas se traduce en deltas por proyecto que se aplican con
+`UPDATE ... SET campo = campo + delta` (F()), sin leer ni recalcular, así que
+dos escrituras concurrentes no se pisan. `Task.save()` y el borrado aplican
+sus deltas en la misma transacción que la fila de la tarea; las rutas en
+bloque los acumulan con `batch()` y emiten un UPDATE por proyecto.
+
+`rebuild()` recalcula los contadores desde `Task` para verificarlos o
+corregirlos (comando `rebuild_project_counters`).
+
+Las tareas vencidas no se cuentan aquí: una tarea pasa a estar vencida sin
+que nadie la escriba, así que un delta no sabría si ya se había sumado. Se
+calculan al leer (`ProjectQuerySet.overdue_counts`).
+"""
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+
+from projects.models import Project
+
+STATUS_COUNTERS = {
+    'por_hacer': 'todo_count',
+    'en_progreso': 'in_progress_count',
+    'revision': 'review_count',
+    'completado': 'completed_count',
+}
+PRIORITY_COUNTERS = {
+    'baja': 'low_priority_count',
+    'media': 'medium_priority_count',
+    'alta': 'high_priority_count',
+    'urgente': 'urgent_priority_count',
+}
+COUNT_FIELDS = ('task_count', *STATUS_COUNTERS.values(), *PRIORITY_COUNTERS.values())
+
+_local = threading.local()
+
+
+def snapshot(task):
+    """Lo que una tarea aporta a los contadores, para compararlo después de modificarla."""
+    return (task.project_id, task.status, task.priority)
+
+
+def _contribution(state):
+    project_id, status, priority = state
+    counts = Counter(task_count=1)
+    if status in STATUS_COUNTERS:
+        counts[STATUS_COUNTERS[status]] += 1
+    if priority in PRIORITY_COUNTERS:
+        counts[PRIORITY_COUNTERS[priority]] += 1
+    return project_id, counts
+
+
+def record(old=None, new=None):
+    """
+    Registra que una tarea pasó del estado `old` al `new` (resultados de
+    `snapshot`; None si no existía o ya no existe).
+
+    Fuera de `batch()` los deltas se aplican de inmediato.
+    """
+    deltas = defaultdict(Counter)
+    if old is not None:
+        project_id, counts = _contribution(old)
+        deltas[project_id].subtract(counts)
+    if new is not None:
+        project_id, counts = _contribution(new)
+        deltas[project_id].update(counts)
+
+    pending = getattr(_local, 'deltas', None)
+    if pending is None:
+        _apply(deltas)
+        return
+    for project_id, counts in deltas.items():
+        pending[project_id].update(counts)
+
+
+@contextmanager
+def batch():
+    """
+    Acumula los deltas registrados dentro del bloque y los aplica al salir,
+    un UPDATE por proyecto. Debe usarse dentro de la transacción de la
+    escritura; si el bloque falla no se aplica nada.
+    """
+    if getattr(_local, 'deltas', None) is not None:
+        # Anidado: los deltas van al lote exterior
+        yield
+        return
+    _local.deltas = defaultdict(Counter)
+    try:
+        yield
+        deltas = _local.deltas
+    finally:
+        _local.deltas = None
+    _apply(deltas)
+
+
+def _apply(deltas):
+    now = timezone.now()
+    for project_id, counts in deltas.items():
+        changes = {field: F(field) + value for field, value in counts.items() if value}
+        # También sin cambios en los conteos: la actividad del proyecto se renueva
+        Project.objects.filter(pk=project_id).update(last_activity_at=now, **changes)
+
+
+def _actual_counts(project_ids):
+    from .models import Task
+
+    aggregates = {'task_count': Count('id'), 'last_task_update': Max('updated_at')}
+    aggregates.update({field: Count('id', filter=Q(status=status)) for status, field in STATUS_COUNTERS.items()})
+    aggregates.update({field: Count('id', filter=Q(priority=priority)) for priority, field in PRIORITY_COUNTERS.items()})
+    rows = Task.objects.filter(project_id__in=project_ids).order_by().values('project_id').annotate(**aggregates)
+    return {row.pop('project_id'): row for row in rows}
+
+
+def rebuild(project_ids=None, fix=True, batch_size=500):
+    """
+    Recalcula los contadores desde `Task`, por páginas de proyectos.
+
+    Devuelve las diferencias encontradas como `(project_id, campo, guardado,
+    real)`; con `fix` además las corrige. Cada página se lee con
+    `select_for_update` dentro de una transacción, así las escrituras
+    concurrentes de tareas esperan en lugar de perderse. `last_activity_at`
+    solo se completa si falta o es anterior a la última modificación de una tarea.
+    """
+    queryset = Project.objects.order_by('pk')
+    if project_ids:
+        queryset = queryset.filter(pk__in=project_ids)
+
+    mismatches = []
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            page = list(
+                queryset.filter(pk__gt=last_pk).select_for_update()
+                .values_list('pk', *COUNT_FIELDS, 'last_activity_at')[:batch_size]
+            )
+            if not page:
+                return mismatches
+            last_pk = page[-1][0]
+            actual = _actual_counts([row[0] for row in page])
+
+            for pk, *stored, last_activity_at in page:
+                counts = actual.get(pk, {})
+                changes = {}
+                for field, value in zip(COUNT_FIELDS, stored):
+                    real = counts.get(field, 0)
+                    if value != real:
+                        mismatches.append((pk, field, value, real))
+                        changes[field] = real
+                last_task_update = counts.get('last_task_update')
+                if last_task_update and (last_activity_at is None or last_activity_at < last_task_update):
+                    changes['last_activity_at'] = last_task_update
+                if fix and changes:
+                    Project.objects.filter(pk=pk).update(**changes)
@@ -0,0 +1,128 @@
+"""
+Exportación en streaming de las tareas de un proyecto (NDJSON o CSV)
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Task, TaskComment
+
+EXPORT_CHUNK_SIZE = 2000
+
+TASK_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'due_date', 'completed_at',
+    'created_at', 'updated_at', 'created_by__username',
+    'assigned_to_id', 'assigned_to__username', 'assigned_to__email',
+)
+COMMENT_FIELDS = ('id', 'task_id', 'author__username', 'content', 'created_at')
+
+CSV_HEADER = (
+    'task_id', 'title', 'description', 'status', 'priority', 'due_date', 'completed_at',
+    'created_at', 'updated_at', 'created_by', 'assigned_to_id', 'assigned_to_username',
+    'assigned_to_email', 'comment_id', 'comment_author', 'comment_content', 'comment_created_at',
+)
+
+
+def iter_tasks_with_comments(project_id, after=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Genera `(tarea, comentarios)` en orden de ID de tarea.
+
+    Tareas y comentarios se leen como dos flujos `values()` con `iterator()`,
+    ambos ordenados por ID de tarea, y se combinan como un merge join: en
+    memoria solo están el bloque actual de cada flujo y los comentarios de
+    una tarea. `after` reanuda a partir de la última tarea exportada.
+    """
+    tasks = Task.objects.filter(project_id=project_id).order_by('id').values(*TASK_FIELDS)
+    comments = (
+        TaskComment.objects.filter(task__project_id=project_id)
+        .order_by('task_id', 'created_at', 'id')
+        .values(*COMMENT_FIELDS)
+    )
+    if after is not None:
+        tasks = tasks.filter(id__gt=after)
+        comments = comments.filter(task_id__gt=after)
+
+    comment_stream = comments.iterator(chunk_size=chunk_size)
+    pending = next(comment_stream, None)
+
+    for task in tasks.iterator(chunk_size=chunk_size):
+        # Comentarios de tareas que ya no aparecen (borradas entre ambas lecturas)
+        while pending is not None and pending['task_id'] < task['id']:
+            pending = next(comment_stream, None)
+
+        task_comments = []
+        while pending is not None and pending['task_id'] == task['id']:
+            task_comments.append(pending)
+            pending = next(comment_stream, None)
+
+        yield task, task_comments
+
+
+def _task_record(task, comments):
+    assigned_to = None
+    if task['assigned_to_id'] is not None:
+        assigned_to = {
+            'id': task['assigned_to_id'],
+            'username': task['assigned_to__username'],
+            'email': task['assigned_to__email'],
+        }
+    return {
+        'id': task['id'],
+        'title': task['title'],
+        'description': task['description'],
+        'status': task['status'],
+        'priority': task['priority'],
+        'due_date': task['due_date'],
+        'completed_at': task['completed_at'],
+        'created_at': task['created_at'],
+        'updated_at': task['updated_at'],
+        'created_by': task['created_by__username'],
+        'assigned_to': assigned_to,
+        'comments': [
+            {
+                'id': comment['id'],
+                'author': comment['author__username'],
+                'content': comment['content'],
+                'created_at': comment['created_at'],
+            }
+            for comment in comments
+        ],
+    }
+
+
+def iter_ndjson(rows):
+    """Una tarea por línea, con sus comentarios y el asignado anidados."""
+    for task, comments in rows:
+        yield json.dumps(_task_record(task, comments), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """Buffer de escritura que devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """Una fila por comentario (o una sola fila si la tarea no tiene comentarios)."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+
+    for task, comments in rows:
+        task_columns = [
+            task['id'], task['title'], task['description'], task['status'], task['priority'],
+            _iso(task['due_date']), _iso(task['completed_at']), _iso(task['created_at']),
+            _iso(task['updated_at']), task['created_by__username'], task['assigned_to_id'],
+            task['assigned_to__username'], task['assigned_to__email'],
+        ]
+        if not comments:
+            yield writer.writerow(task_columns + [None] * 4)
+        for comment in comments:
+            yield writer.writerow(task_columns + [
+                comment['id'], comment['author__username'], comment['content'], _iso(comment['created_at']),
+            ])
+
+
+def _iso(value):
+    return value.isoformat() if value else None
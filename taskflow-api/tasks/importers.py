@@ -0,0 +1,289 @@
+"""
+Importación en bloque de tareas desde CSV o NDJSON
+"""
+import codecs
+import csv
+import json
+from datetime import datetime, time
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from projects.models import ProjectAccess
+from .bulk import sync_completed_at
+from .models import Task
+from .signals import tasks_bulk_saved
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_TYPES = ('ndjson', 'csv')
+
+_STATUSES = {value for value, _label in Task.STATUS_CHOICES}
+_PRIORITIES = {value for value, _label in Task.PRIORITY_CHOICES}
+_TITLE_MAX_LENGTH = Task._meta.get_field('title').max_length
+
+
+def guess_import_type(filename):
+    """Formato según la extensión del archivo (NDJSON si no se reconoce)."""
+    return 'csv' if (filename or '').lower().endswith('.csv') else 'ndjson'
+
+
+class ImportFileError(Exception):
+    """El archivo no se puede seguir leyendo desde `line` (codificación o formato)."""
+
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+        self.message = message
+
+
+def _decoded_lines(stream):
+    """Líneas de texto de un archivo binario UTF-8; lanza `ImportFileError` en la primera inválida."""
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    line_number = 0
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            raise ImportFileError(line_number + 1, 'El archivo no está codificado en UTF-8')
+        line_number += 1
+        if '\x00' in line:
+            raise ImportFileError(line_number, 'La línea contiene un byte NUL')
+        yield line
+
+
+def iter_csv_rows(stream):
+    """
+    Genera `(fila, registro)` a partir de un archivo CSV binario.
+
+    Acepta las columnas de la exportación CSV; como ésta repite la tarea en
+    una fila por comentario, las filas consecutivas con el mismo `task_id` se
+    importan una sola vez. Un archivo que deja de poder leerse lanza
+    `ImportFileError`.
+    """
+    # strict: comillas mal cerradas son un error en lugar de un campo deformado
+    reader = csv.DictReader(_decoded_lines(stream), strict=True)
+    previous_task_id = None
+    records = iter(reader)
+    while True:
+        try:
+            record = next(records)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # line_num aún no cuenta la línea que falló
+            raise ImportFileError(reader.line_num + 1, f'CSV inválido: {exc}')
+        task_id = record.get('task_id')
+        if task_id and task_id == previous_task_id:
+            continue
+        previous_task_id = task_id
+        # line_num es la última línea física leída (incluye la cabecera)
+        yield reader.line_num, {
+            'title': record.get('title'),
+            'description': record.get('description'),
+            'status': record.get('status'),
+            'priority': record.get('priority'),
+            'due_date': record.get('due_date'),
+            'completed_at': record.get('completed_at'),
+            'assigned_to': record.get('assigned_to_username') or record.get('assigned_to'),
+        }
+
+
+def iter_ndjson_rows(stream):
+    """
+    Genera `(línea, registro)` a partir de un archivo NDJSON binario; ignora
+    líneas vacías. Una línea que no es UTF-8 lanza `ImportFileError`.
+    """
+    for line_number, line in enumerate(_decoded_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None
+            continue
+        assigned_to = record.get('assigned_to')
+        if isinstance(assigned_to, dict):
+            # Formato de la exportación: asignado anidado
+            assigned_to = assigned_to.get('username')
+        record['assigned_to'] = assigned_to
+        yield line_number, record
+
+
+ROW_READERS = {
+    'ndjson': iter_ndjson_rows,
+    'csv': iter_csv_rows,
+}
+
+
+def _parse_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class ImportReport:
+    """Progreso y errores por fila de una importación."""
+
+    def __init__(self, max_errors=MAX_REPORTED_ERRORS):
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.max_errors = max_errors
+        # Error que cortó la lectura del archivo: {'line': n, 'error': mensaje}
+        self.file_error = None
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'file_error': self.file_error,
+        }
+
+
+class TaskImporter:
+    """
+    Crea tareas en `project` a partir de un flujo de registros.
+
+    El archivo se lee fila a fila y se procesa en lotes de `batch_size`: la
+    validación de campos es local (sin serializers ni consultas), los nombres
+    de usuario asignados se resuelven contra `ProjectAccess` con una consulta
+    por lote solo para los nombres aún no vistos, y cada lote se inserta con
+    `bulk_create` en su propia transacción. Un lote fallido no deshace los
+    anteriores; las filas inválidas se informan y no detienen la importación.
+
+    Si el archivo deja de poder leerse (no es UTF-8, CSV mal formado) se
+    importan las filas leídas hasta ahí y el error queda en `file_error`.
+    """
+
+    def __init__(self, project, user, batch_size=IMPORT_BATCH_SIZE, on_progress=None):
+        self.project = project
+        self.user = user
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        # username -> user_id de los participantes del proyecto (None si no lo es)
+        self._members = {}
+
+    def run(self, stream, import_type):
+        report = ImportReport()
+        batch = []
+        try:
+            for row, record in ROW_READERS[import_type](stream):
+                report.rows += 1
+                batch.append((row, record))
+                if len(batch) >= self.batch_size:
+                    self._process_batch(batch, report)
+                    batch = []
+        except ImportFileError as exc:
+            report.file_error = {'line': exc.line, 'error': exc.message}
+        if batch:
+            self._process_batch(batch, report)
+        return report
+
+    def _process_batch(self, batch, report):
+        cleaned = []
+        for row, record in batch:
+            data, errors = self._clean(record)
+            if errors:
+                report.add_error(row, errors)
+            else:
+                cleaned.append((row, data))
+
+        self._resolve_members({data['assigned_to'] for _row, data in cleaned if data['assigned_to']})
+
+        tasks = []
+        for row, data in cleaned:
+            username = data.pop('assigned_to')
+            assigned_to_id = None
+            if username:
+                assigned_to_id = self._members.get(username)
+                if assigned_to_id is None:
+                    report.add_error(row, {'assigned_to': [f'El usuario {username} no pertenece al proyecto']})
+                    continue
+            task = Task(project=self.project, created_by=self.user, assigned_to_id=assigned_to_id, **data)
+            sync_completed_at(task)
+            tasks.append(task)
+
+        if tasks:
+            with transaction.atomic():
+                created = Task.objects.bulk_create(tasks)
+                tasks_bulk_saved.send(sender=Task, tasks=created, created=True)
+            report.created += len(created)
+
+        if self.on_progress:
+            self.on_progress(report)
+
+    def _clean(self, record):
+        if record is None:
+            return None, {'non_field_errors': ['La fila no es un objeto JSON válido']}
+
+        errors = {}
+        data = {
+            'title': self._text(record, 'title', errors).strip(),
+            'description': self._text(record, 'description', errors),
+            'status': self._text(record, 'status', errors) or 'por_hacer',
+            'priority': self._text(record, 'priority', errors) or 'media',
+            'due_date': None,
+            'completed_at': None,
+            'assigned_to': self._text(record, 'assigned_to', errors).strip() or None,
+        }
+        if not data['title'] and 'title' not in errors:
+            errors['title'] = ['Este campo es requerido.']
+        elif len(data['title']) > _TITLE_MAX_LENGTH:
+            errors['title'] = [f'Asegúrese de que este campo no tenga más de {_TITLE_MAX_LENGTH} caracteres.']
+        if data['status'] not in _STATUSES and 'status' not in errors:
+            errors['status'] = [f'"{data["status"]}" no es una elección válida.']
+        if data['priority'] not in _PRIORITIES and 'priority' not in errors:
+            errors['priority'] = [f'"{data["priority"]}" no es una elección válida.']
+
+        for field in ('due_date', 'completed_at'):
+            value = record.get(field)
+            if not value:
+                continue
+            try:
+                data[field] = _parse_datetime(value)
+            except (TypeError, ValueError):
+                errors[field] = ['Formato de fecha inválido.']
+
+        return data, errors or None
+
+    def _text(self, record, field, errors):
+        value = record.get(field)
+        if value is None:
+            return ''
+        if not isinstance(value, str):
+            errors[field] = ['Se esperaba texto.']
+            return ''
+        return value
+
+    def _resolve_members(self, usernames):
+        missing = usernames - self._members.keys()
+        if not missing:
+            return
+        rows = ProjectAccess.objects.filter(
+            project=self.project, user__username__in=missing
+        ).values_list('user__username', 'user_id')
+        self._members.update(dict.fromkeys(missing))
+        self._members.update(rows)
@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Project
+from tasks.importers import TaskImporter, IMPORT_BATCH_SIZE, IMPORT_TYPES, guess_import_type
+
+
+class Command(BaseCommand):
+    help = 'Importa tareas a un proyecto desde un archivo CSV o NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=int)
+        parser.add_argument('path')
+        parser.add_argument('--type', choices=IMPORT_TYPES, help='Formato del archivo (por defecto según la extensión)')
+        parser.add_argument('--user', help='Usuario creador de las tareas (por defecto el dueño del proyecto)')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.select_related('owner').get(id=options['project_id'])
+        except Project.DoesNotExist:
+            raise CommandError(f"No existe el proyecto {options['project_id']}")
+
+        user = project.owner
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"No existe el usuario {options['user']}")
+            if not Project.objects.visible_to(user).filter(id=project.id).exists():
+                raise CommandError(f'{user.username} no participa en el proyecto')
+
+        import_type = options['type'] or guess_import_type(options['path'])
+        started = time.monotonic()
+
+        def progress(report):
+            self.stdout.write(
+                f'{report.rows} filas procesadas, {report.created} creadas, {report.failed} con errores '
+                f'({time.monotonic() - started:.1f}s)'
+            )
+
+        importer = TaskImporter(project, user, batch_size=options['batch_size'], on_progress=progress)
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = importer.run(stream, import_type)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for error in report.errors:
+            self.stderr.write(f"Fila {error['row']}: {error['errors']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f'... y {report.failed - len(report.errors)} filas más con errores')
+
+        if report.file_error:
+            raise CommandError(
+                f"Línea {report.file_error['line']}: {report.file_error['error']} "
+                f"({report.created} tareas importadas de {report.rows} filas leídas hasta ahí)"
+            )
+        self.stdout.write(self.style.SUCCESS(f'{report.created} tareas importadas de {report.rows} filas'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks import counters
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de tareas de los proyectos y corrige las diferencias'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help='ID de proyecto (repetible); por defecto todos')
+        parser.add_argument('--verify', action='store_true',
+                            help='Solo informar las diferencias, sin corregirlas; falla si hay alguna')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        mismatches = counters.rebuild(
+            project_ids=options['projects'], fix=not options['verify'], batch_size=options['batch_size']
+        )
+        for project_id, field, stored, actual in mismatches:
+            self.stdout.write(f'Proyecto {project_id}: {field} {stored} -> {actual}')
+
+        if options['verify'] and mismatches:
+            raise CommandError(f'{len(mismatches)} contadores no coinciden')
+        action = 'verificados' if options['verify'] else 'reconstruidos'
+        self.stdout.write(self.style.SUCCESS(f'Contadores {action}: {len(mismatches)} diferencias'))
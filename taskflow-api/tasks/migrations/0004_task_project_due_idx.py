@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_remove_project_overdue_count'),
+        ('tasks', '0003_task_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'due_date', 'status'], name='task_project_due_idx'),
+        ),
+    ]
@@ -1,6 +1,23 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from projects.models import Project
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from projects.models import Project, ProjectAccess
+from . import counters
+from .signals import tasks_bulk_saved
+
+# Campos de los que dependen los contadores del proyecto
+COUNTED_FIELDS = ('project_id', 'status', 'priority')
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Tareas de proyectos accesibles por el usuario o asignadas a él."""
+        return self.filter(
+            models.Q(project_id__in=ProjectAccess.project_ids_for(user)) |
+            models.Q(assigned_to=user)
+        )
 
 
 class Task(models.Model):
@@ -30,19 +47,48 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'status', '-created_at'], name='task_project_status_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+            # Vencidas por proyecto (overdue_count y ETags de proyectos) sin leer la tabla
+            models.Index(fields=['project', 'due_date', 'status'], name='task_project_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.project.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Recordar lo que la tarea aporta a los contadores para aplicar solo la diferencia
+        if all(name in instance.__dict__ for name in COUNTED_FIELDS):
+            instance._counted = counters.snapshot(instance)
+        return instance
+
     def save(self, *args, **kwargs):
         if self.status == 'completado' and not self.completed_at:
             from django.utils import timezone
             self.completed_at = timezone.now()
         elif self.status != 'completado':
             self.completed_at = None
-        super().save(*args, **kwargs)
+
+        previous = None if self._state.adding else self._counted_state()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Transiciones de estado, prioridad, vencimiento o proyecto en la misma transacción
+            counters.record(previous, counters.snapshot(self))
+        self._counted = counters.snapshot(self)
+
+    def _counted_state(self):
+        counted = getattr(self, '_counted', None)
+        if counted is None:
+            counted = Task.objects.filter(pk=self.pk).values_list(*COUNTED_FIELDS).first()
+        return counted
 
 
 class TaskComment(models.Model):
@@ -54,6 +100,35 @@ class TaskComment(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='taskcomment_task_created_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.task.title}"
+
+
+@receiver(post_save, sender=TaskComment)
+@receiver(post_delete, sender=TaskComment)
+def touch_task_on_comment_change(sender, instance, raw=False, **kwargs):
+    """Los comentarios se anidan en la tarea: renovar `updated_at` invalida sus ETags."""
+    if raw:
+        return
+    Task.objects.filter(pk=instance.task_id).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Task)
+def discount_deleted_task(sender, instance, origin=None, **kwargs):
+    # Al borrar el proyecto sus contadores desaparecen con él
+    if isinstance(origin, Project):
+        return
+    counters.record(old=getattr(instance, '_counted', None) or counters.snapshot(instance))
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def count_bulk_saved_tasks(sender, tasks, created, **kwargs):
+    """bulk_create/bulk_update no pasan por `Task.save()`: un UPDATE por proyecto para todo el lote."""
+    with counters.batch():
+        for task in tasks:
+            counters.record(None if created else task._counted_state(), counters.snapshot(task))
+            task._counted = counters.snapshot(task)
@@ -1,15 +1,14 @@
 from rest_framework import permissions
+from projects.membership import membership_for
 
 class IsProjectParticipant(permissions.BasePermission):
     """
     Permiso que permite ver tareas a propietarios, miembros o asignados del proyecto.
     """
     def has_object_permission(self, request, view, obj):
-        project = obj.project
         return (
-            project.owner == request.user or 
-            project.members.filter(id=request.user.id).exists() or
-            obj.assigned_to == request.user
+            membership_for(request).is_participant(request.user, obj.project_id) or
+            obj.assigned_to_id == request.user.id
         )
 
 class CanManageTask(permissions.BasePermission):
@@ -21,8 +20,8 @@ class CanManageTask(permissions.BasePermission):
             return True
             
         return (
-            obj.project.owner == request.user or 
-            obj.created_by == request.user
+            obj.project.owner_id == request.user.id or
+            obj.created_by_id == request.user.id
         )
 
 class IsTaskAssignee(permissions.BasePermission):
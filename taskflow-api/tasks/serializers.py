@@ -1,12 +1,19 @@
 from rest_framework import serializers
+from django.db import models
+from django.db.models import Prefetch
 from .models import Task, TaskComment
-from projects.serializers import ProjectSerializer
+from projects.serializers import ProjectSerializer, render_project_fragments
 from projects.models import Project
-from authentication.serializers import UserSerializer
+from projects.membership import membership_for
+from authentication.serializers import UserSerializer, UserSummarySerializer
 from django.contrib.auth.models import User
+from taskflow.eager_loading import EagerLoadingMixin
+from taskflow.sparse_fieldsets import SparseFieldsetMixin
 
 
-class TaskCommentSerializer(serializers.ModelSerializer):
+class TaskCommentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    select_related_fields = ('author',)
+
     author = UserSerializer(read_only=True)
     
     class Meta:
@@ -15,12 +22,36 @@ class TaskCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('task', 'author')
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskPageSerializer(serializers.ListSerializer):
+    """
+    Listado de `TaskSerializer`: prepara de una vez los fragmentos de los
+    proyectos anidados (`project_detail`), así los que falten en caché cargan
+    sus miembros en una sola consulta y el resto de tareas los toma de la caché.
+    """
+
+    def to_representation(self, data):
+        tasks = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        project_field = self.child.fields.get('project_detail')
+        if project_field is not None:
+            render_project_fragments([task.project for task in tasks], project_field.render)
+        return super().to_representation(tasks)
+
+
+class TaskSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    # Los miembros del proyecto salen de los fragmentos cacheados de `ProjectSerializer`
+    select_related_fields = ('project__owner', 'assigned_to', 'created_by')
+    prefetch_related_fields = (
+        Prefetch(
+            'comments',
+            queryset=TaskCommentSerializer.setup_eager_loading(TaskComment.objects.all())
+        ),
+    )
+
     project = serializers.PrimaryKeyRelatedField(
         queryset=Project.objects.all(),
         write_only=True
     )
-    project_detail = ProjectSerializer(source='project', read_only=True)
+    project_detail = ProjectSerializer(source='project', read_only=True, counters=False)
     assigned_to = UserSerializer(read_only=True)
     created_by = UserSerializer(read_only=True)
     comments = TaskCommentSerializer(many=True, read_only=True)
@@ -32,28 +63,29 @@ class TaskSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'project': {'write_only': True}
         }
+        list_serializer_class = TaskPageSerializer
     
+    @property
+    def membership(self):
+        if not hasattr(self, '_membership'):
+            self._membership = membership_for(self.context.get('request'))
+        return self._membership
+
     def validate_assigned_to_id(self, value):
         # Permitir valores nulos/"vacíos" para desasignar
         if value in (None, '', 0):
             return None
-        # Validar que el usuario exista
-        try:
-            user = User.objects.get(id=value)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Usuario no encontrado")
         # Determinar el proyecto en contexto (create/update)
         project_id = self.initial_data.get('project')
-        project = None
+        if not project_id and self.instance:
+            project_id = self.instance.project_id
+        # Si hay proyecto, el usuario asignado debe pertenecer (un EXISTS, sin cargar miembros)
+        if project_id and self.membership.is_participant(value, project_id):
+            return value
+        # Validar que el usuario exista
+        if not User.objects.filter(id=value).exists():
+            raise serializers.ValidationError("Usuario no encontrado")
         if project_id:
-            try:
-                project = Project.objects.get(id=project_id)
-            except Project.DoesNotExist:
-                raise serializers.ValidationError("Proyecto no válido para la asignación")
-        elif self.instance:
-            project = self.instance.project
-        # Si hay proyecto, el usuario asignado debe pertenecer
-        if project and (user != project.owner and user not in project.members.all()):
             raise serializers.ValidationError("El usuario no pertenece al proyecto")
         return value
     
@@ -62,10 +94,9 @@ class TaskSerializer(serializers.ModelSerializer):
         project = validated_data.get('project')
 
         if assigned_to_id:
-            assigned_to = User.objects.get(id=assigned_to_id)
-            if project and (assigned_to != project.owner and assigned_to not in project.members.all()):
+            if project and not self.membership.is_participant(assigned_to_id, project):
                 raise serializers.ValidationError("El usuario no pertenece al proyecto")
-            validated_data['assigned_to'] = assigned_to
+            validated_data['assigned_to_id'] = assigned_to_id
 
         task = Task.objects.create(**validated_data)
         return task
@@ -77,7 +108,7 @@ class TaskSerializer(serializers.ModelSerializer):
         # Si se cambia la asignación, validar permisos: owner del proyecto o creador
         if assigned_to_id is not None and request:
             project = instance.project
-            if request.user != project.owner and request.user != instance.created_by:
+            if request.user.id not in (project.owner_id, instance.created_by_id):
                 raise serializers.ValidationError({"assigned_to_id": "Solo el propietario del proyecto o el creador de la tarea pueden asignar o reasignar tareas"})
 
         for attr, value in validated_data.items():
@@ -86,12 +117,34 @@ class TaskSerializer(serializers.ModelSerializer):
         # Aplicar cambio de asignación
         if assigned_to_id is not None:
             if assigned_to_id:
-                assigned_to = User.objects.get(id=assigned_to_id)
-                if assigned_to != instance.project.owner and assigned_to not in instance.project.members.all():
+                if not self.membership.is_participant(assigned_to_id, instance.project_id):
                     raise serializers.ValidationError("El usuario no pertenece al proyecto")
-                instance.assigned_to = assigned_to
+                instance.assigned_to_id = assigned_to_id
             else:
                 instance.assigned_to = None
 
         instance.save()
         return instance
+
+
+class TaskListSerializer(SparseFieldsetMixin, EagerLoadingMixin, serializers.ModelSerializer):
+    """
+    Representación compacta de una tarea para listados.
+
+    No incluye comentarios ni el detalle completo del proyecto; para eso
+    está `TaskSerializer` en el endpoint de detalle.
+    """
+    select_related_fields = ('project', 'assigned_to')
+
+    project_name = serializers.CharField(source='project.name', read_only=True)
+    project_owner_id = serializers.IntegerField(source='project.owner_id', read_only=True)
+    assigned_to = UserSummarySerializer(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = (
+            'id', 'title', 'description', 'status', 'priority', 'due_date',
+            'created_at', 'project', 'project_name', 'project_owner_id',
+            'created_by', 'assigned_to',
+        )
+        read_only_fields = fields
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Las rutas en bloque (bulk_create/bulk_update) no emiten post_save.
+# Argumentos: tasks (lista de instancias ya escritas), created (bool).
+tasks_bulk_saved = Signal()
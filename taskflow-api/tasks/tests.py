@@ -1,8 +1,12 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from projects.models import Project
-from .models import Task
+from .models import Task, TaskComment
 
 class TaskTests(APITestCase):
     def setUp(self):
@@ -49,3 +53,688 @@ class TaskTests(APITestCase):
         self.client.force_authenticate(user=self.member)
         response = self.client.patch(self.task_url, {'status': 'completada'})
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TaskListQueryCountTests(APITestCase):
+    """El listado de tareas no debe crecer en consultas con el tamaño de la página."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.members = [
+            User.objects.create_user(username=f'member{i}', password='password123')
+            for i in range(5)
+        ]
+        self.project = Project.objects.create(name='Query Project', owner=self.owner)
+        self.project.members.add(*self.members)
+
+    def _create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                title=f'Task {i}',
+                project=self.project,
+                created_by=self.owner,
+                assigned_to=self.members[i % len(self.members)]
+            )
+            for member in self.members[:2]:
+                TaskComment.objects.create(task=task, author=member, content='Comentario')
+
+    def _count_list_queries(self):
+        # Peor caso: sin fragmentos de proyecto en caché
+        cache.clear()
+        self.client.force_authenticate(user=self.owner)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_task_list_query_count_is_constant(self):
+        self._create_tasks(3)
+        small_page = self._count_list_queries()
+
+        self._create_tasks(17)
+        full_page = self._count_list_queries()
+
+        self.assertEqual(small_page, full_page)
+        self.assertLessEqual(full_page, 6)
+
+
+class TaskListRepresentationTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.project = Project.objects.create(name='Compact Project', owner=self.owner)
+        self.task = Task.objects.create(title='Compact Task', project=self.project, created_by=self.owner)
+        TaskComment.objects.create(task=self.task, author=self.owner, content='Comentario')
+        self.client.force_authenticate(user=self.owner)
+
+    def test_compact_view_omits_nested_payload(self):
+        response = self.client.get('/api/tasks/', {'view': 'compact'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = response.data['results'][0]
+        self.assertEqual(item['project_name'], 'Compact Project')
+        self.assertEqual(item['project_owner_id'], self.owner.id)
+        self.assertNotIn('comments', item)
+        self.assertNotIn('project_detail', item)
+
+    def test_sparse_fieldset(self):
+        response = self.client.get('/api/tasks/', {'fields': 'id,title,status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'status'})
+
+
+class TaskIndexTests(APITestCase):
+    """Las rutas de filtrado principales deben resolverse con índices compuestos."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.project = Project.objects.create(name='Index Project', owner=self.owner)
+
+    def test_project_status_filter_uses_index(self):
+        plan = Task.objects.filter(project=self.project, status='por_hacer').explain()
+        self.assertIn('task_project_status_idx', plan)
+
+    def test_assignee_status_filter_uses_index(self):
+        plan = Task.objects.filter(assigned_to=self.owner, status='por_hacer').explain()
+        self.assertIn('task_assignee_status_idx', plan)
+
+    def test_comment_thread_uses_index(self):
+        task = Task.objects.create(title='Task', project=self.project, created_by=self.owner)
+        plan = TaskComment.objects.filter(task=task).explain()
+        self.assertIn('taskcomment_task_created_idx', plan)
+
+
+class TaskKeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.project = Project.objects.create(name='Paged Project', owner=self.owner)
+        tasks = [
+            Task.objects.create(title=f'Task {i}', project=self.project, created_by=self.owner)
+            for i in range(25)
+        ]
+        # Forzar empates en created_at para verificar el desempate por id
+        Task.objects.filter(id__in=[t.id for t in tasks[10:15]]).update(created_at=tasks[10].created_at)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_pages_cover_all_rows_without_duplicates(self):
+        first = self.client.get('/api/tasks/', {'view': 'compact'})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', first.data)
+        self.assertIsNone(first.data['previous'])
+        self.assertEqual(len(first.data['results']), 20)
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+
+        ids = [t['id'] for t in first.data['results'] + second.data['results']]
+        self.assertEqual(len(set(ids)), 25)
+
+        back = self.client.get(second.data['previous'])
+        self.assertEqual([t['id'] for t in back.data['results']], ids[:20])
+
+    def test_count_is_optional(self):
+        response = self.client.get('/api/tasks/', {'count': 'true'})
+        self.assertEqual(response.data['count'], 25)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tasks/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DashboardSummaryTests(APITestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.project = Project.objects.create(name='Summary Project', owner=self.owner)
+        Project.objects.create(name='Foreign Project', owner=self.other)
+
+        yesterday = timezone.now() - timedelta(days=1)
+        for i in range(25):
+            Task.objects.create(
+                title=f'Task {i}',
+                project=self.project,
+                created_by=self.owner,
+                status='completado' if i < 22 else 'por_hacer',
+                priority='alta' if i % 5 == 0 else 'media',
+                due_date=yesterday,
+            )
+        self.client.force_authenticate(user=self.owner)
+
+    def test_counts_cover_all_tasks(self):
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['projects_count'], 1)
+        self.assertEqual(response.data['tasks_count'], 25)
+        # Más allá de la primera página de 20
+        self.assertEqual(response.data['completed_count'], 22)
+        self.assertEqual(response.data['by_status']['por_hacer'], 3)
+        self.assertEqual(response.data['by_priority']['alta'], 5)
+        self.assertEqual(response.data['overdue_count'], 3)
+        self.assertEqual(len(response.data['recent_tasks']), 5)
+        self.assertEqual(response.data['recent_projects'][0]['name'], 'Summary Project')
+
+
+class TaskConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.project = Project.objects.create(name='ETag Project', owner=self.owner)
+        self.task = Task.objects.create(title='Task', project=self.project, created_by=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def test_list_revalidates_with_etag(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Solo ETag: Last-Modified no detecta borrados en un listado
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+
+    def test_etag_changes_when_task_changes(self):
+        etag = self.client.get(f'/api/tasks/{self.task.id}/')['ETag']
+        Task.objects.create(title='Other', project=self.project, created_by=self.owner)
+        # Otra tarea no afecta al detalle de esta
+        response = self.client.get(f'/api/tasks/{self.task.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag_list = self.client.get('/api/tasks/')['ETag']
+        self.task.title = 'Renamed'
+        self.task.save()
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag_list)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_comment_invalidates_task_detail(self):
+        etag = self.client.get(f'/api/tasks/{self.task.id}/')['ETag']
+        TaskComment.objects.create(task=self.task, author=self.owner, content='Hola')
+        response = self.client.get(f'/api/tasks/{self.task.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['comments']), 1)
+
+    def test_delete_not_hidden_by_if_modified_since(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from django.utils.http import http_date
+
+        newest = Task.objects.create(title='Newest', project=self.project, created_by=self.owner)
+        Task.objects.filter(pk=self.task.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        since = http_date((timezone.now() + timedelta(seconds=1)).timestamp())
+        self.assertIn('Last-Modified', self.client.get(f'/api/tasks/{newest.id}/'))
+
+        self.task.delete()
+        response = self.client.get('/api/tasks/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['results']], [newest.id])
+
+    def test_missing_task_is_not_found(self):
+        response = self.client.get('/api/tasks/999/', HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.outsider = User.objects.create_user(username='outsider', password='password123')
+        self.project = Project.objects.create(name='Bulk Project', owner=self.owner)
+        self.project.members.add(self.member)
+        self.foreign = Project.objects.create(name='Foreign Project', owner=self.outsider)
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', project=self.project, created_by=self.owner)
+            for i in range(30)
+        ]
+        self.client.force_authenticate(user=self.owner)
+
+    def test_bulk_update_runs_constant_queries(self):
+        operations = [
+            {'op': 'update', 'id': task.id, 'data': {'status': 'completado'}}
+            for task in self.tasks
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/tasks/bulk/', operations, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(item['status'] == 'ok' for item in response.data['results']))
+        # Lecturas, bulk_update e índice de búsqueda: constante, no depende del tamaño del lote
+        self.assertLessEqual(len(queries), 8)
+        self.assertEqual(Task.objects.filter(status='completado', completed_at__isnull=False).count(), 30)
+
+    def test_mixed_operations_report_per_item_results(self):
+        operations = [
+            {'op': 'create', 'data': {'title': 'Nueva', 'project_id': self.project.id, 'assigned_to_id': self.member.id}},
+            {'op': 'create', 'data': {'title': 'Ajena', 'project_id': self.foreign.id}},
+            {'op': 'update', 'id': self.tasks[0].id, 'data': {'assigned_to_id': self.outsider.id}},
+            {'op': 'delete', 'id': self.tasks[1].id},
+            {'op': 'archive', 'id': self.tasks[2].id},
+        ]
+        response = self.client.post('/api/tasks/bulk/', operations, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [item['status'] for item in response.data['results']]
+        self.assertEqual(statuses, ['ok', 'error', 'error', 'ok', 'error'])
+
+        created = Task.objects.get(id=response.data['results'][0]['id'])
+        self.assertEqual(created.assigned_to, self.member)
+        self.assertEqual(created.created_by, self.owner)
+        self.assertFalse(Task.objects.filter(id=self.tasks[1].id).exists())
+        self.assertFalse(Task.objects.filter(project=self.foreign).exists())
+
+    def test_assignee_can_only_change_status(self):
+        task = self.tasks[0]
+        task.assigned_to = self.member
+        task.save()
+        self.client.force_authenticate(user=self.member)
+
+        operations = [
+            {'op': 'update', 'id': task.id, 'data': {'status': 'en_progreso'}},
+            {'op': 'update', 'id': self.tasks[1].id, 'data': {'title': 'Otro'}},
+        ]
+        response = self.client.post('/api/tasks/bulk/', operations, format='json')
+        self.assertEqual([item['status'] for item in response.data['results']], ['ok', 'error'])
+
+    def test_updates_write_only_requested_fields(self):
+        operations = [
+            {'op': 'update', 'id': self.tasks[0].id, 'data': {'status': 'en_progreso'}},
+            {'op': 'update', 'id': self.tasks[1].id, 'data': {'title': 'Renombrada'}},
+            {'op': 'update', 'id': self.tasks[2].id, 'data': {'status': 'revision'}},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/tasks/bulk/', operations, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(sum('"title"' in sql for sql in updates), 1)
+        self.assertEqual(sum('"status"' in sql for sql in updates), 1)
+        self.assertEqual(Task.objects.get(pk=self.tasks[1].id).title, 'Renombrada')
+        self.assertEqual(Task.objects.get(pk=self.tasks[2].id).status, 'revision')
+
+    def test_rejects_non_list_body(self):
+        response = self.client.post('/api/tasks/bulk/', {'op': 'create'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskMembershipValidationTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.outsider = User.objects.create_user(username='outsider', password='password123')
+        self.project = Project.objects.create(name='Members Project', owner=self.owner)
+        self.members = [
+            User.objects.create_user(username=f'member{i}', password='password123')
+            for i in range(20)
+        ]
+        self.project.members.add(*self.members)
+        self.client.force_authenticate(user=self.owner)
+
+    def _create(self, assigned_to_id):
+        return self.client.post('/api/tasks/', {
+            'title': 'Tarea', 'project': self.project.id, 'assigned_to_id': assigned_to_id,
+        }, format='json')
+
+    def test_assignment_validation(self):
+        self.assertEqual(self._create(self.members[-1].id).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._create(self.outsider.id).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._create(99999).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_membership_checks_do_not_load_members(self):
+        from .serializers import TaskSerializer
+
+        serializer = TaskSerializer(data={
+            'title': 'Tarea', 'project': self.project.id, 'assigned_to_id': self.members[-1].id,
+        })
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(serializer.is_valid())
+            serializer.save(created_by=self.owner)
+        member_queries = [q['sql'] for q in queries if 'projects_project_members' in q['sql']]
+        self.assertEqual(member_queries, [])
+
+
+class ProjectExportTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='password123')
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.project = Project.objects.create(name='Export Project', owner=self.owner)
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', project=self.project, created_by=self.owner,
+                                assigned_to=self.owner if i == 0 else None)
+            for i in range(5)
+        ]
+        TaskComment.objects.create(task=self.tasks[0], author=self.owner, content='Primero')
+        TaskComment.objects.create(task=self.tasks[0], author=self.owner, content='Segundo')
+        TaskComment.objects.create(task=self.tasks[3], author=self.owner, content='Otro')
+        self.client.force_authenticate(user=self.owner)
+
+    def _export(self, **params):
+        response = self.client.get(f'/api/projects/{self.project.id}/export/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_merges_comments_and_assignee(self):
+        import json
+
+        records = [json.loads(line) for line in self._export().splitlines()]
+        self.assertEqual([r['id'] for r in records], [task.id for task in self.tasks])
+        self.assertEqual([c['content'] for c in records[0]['comments']], ['Primero', 'Segundo'])
+        self.assertEqual(records[0]['assigned_to']['email'], 'owner@example.com')
+        self.assertEqual(len(records[3]['comments']), 1)
+        self.assertIsNone(records[1]['assigned_to'])
+
+    def test_resume_after_cursor(self):
+        import json
+
+        records = [json.loads(line) for line in self._export(after=self.tasks[2].id).splitlines()]
+        self.assertEqual([r['id'] for r in records], [self.tasks[3].id, self.tasks[4].id])
+
+    def test_csv_has_one_row_per_comment(self):
+        import csv
+        import io
+
+        rows = list(csv.DictReader(io.StringIO(self._export(type='csv'))))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1]['comment_content'], 'Segundo')
+
+    def test_non_participant_gets_not_found(self):
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get(f'/api/projects/{self.project.id}/export/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProjectImportTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.member = User.objects.create_user(username='member', password='password123')
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.project = Project.objects.create(name='Import Project', owner=self.owner)
+        self.project.members.add(self.member)
+        self.client.force_authenticate(user=self.owner)
+
+    def _import(self, content, name, **data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(
+            f'/api/projects/{self.project.id}/import/', {'file': upload, **data}, format='multipart'
+        )
+
+    def test_ndjson_import_reports_row_errors(self):
+        lines = [
+            '{"title": "Uno", "assigned_to": "member", "status": "completado"}',
+            '{"title": "", "status": "por_hacer"}',
+            'no es json',
+            '{"title": "Dos", "assigned_to": {"username": "other"}}',
+            '{"title": "Tres", "priority": "alta", "due_date": "2030-01-15"}',
+        ]
+        response = self._import('\n'.join(lines), 'tasks.ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rows'], 5)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3, 4])
+        self.assertIn('assigned_to', response.data['errors'][2]['errors'])
+
+        first = Task.objects.get(title='Uno')
+        self.assertEqual(first.assigned_to, self.member)
+        self.assertEqual(first.created_by, self.owner)
+        self.assertIsNotNone(first.completed_at)
+        self.assertEqual(Task.objects.get(title='Tres').due_date.year, 2030)
+
+    def test_csv_export_round_trip(self):
+        task = Task.objects.create(title='Original', project=self.project, created_by=self.owner, assigned_to=self.member)
+        TaskComment.objects.create(task=task, author=self.owner, content='a')
+        TaskComment.objects.create(task=task, author=self.owner, content='b')
+        exported = b''.join(
+            self.client.get(f'/api/projects/{self.project.id}/export/', {'type': 'csv'}).streaming_content
+        ).decode()
+
+        response = self._import(exported, 'tasks.csv')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(Task.objects.filter(title='Original', assigned_to=self.member).count(), 2)
+
+    def test_usernames_resolved_once_per_batch(self):
+        from .importers import TaskImporter
+        import io
+
+        content = '\n'.join(
+            '{"title": "T%d", "assigned_to": "%s"}' % (i, 'member' if i % 2 else 'owner') for i in range(50)
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            report = TaskImporter(self.project, self.owner, batch_size=25).run(io.BytesIO(content.encode()), 'ndjson')
+        self.assertEqual(report.created, 50)
+        # Una consulta de usuarios (el segundo lote ya los conoce) y por lote
+        # el INSERT más la indexación de búsqueda
+        user_lookups = [q for q in ctx.captured_queries if 'auth_user' in q['sql']]
+        self.assertEqual(len(user_lookups), 1)
+
+    def test_latin1_file_reports_line_and_imported_rows(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        content = 'title,status\nUno,por_hacer\nDos,por_hacer\nCanción,por_hacer\nCuatro,por_hacer\n'
+        upload = SimpleUploadedFile('tasks.csv', content.encode('latin-1'))
+        response = self.client.post(f'/api/projects/{self.project.id}/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['file_error']['line'], 4)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(set(Task.objects.values_list('title', flat=True)), {'Uno', 'Dos'})
+
+    def test_nul_byte_in_csv(self):
+        from io import StringIO
+        from tempfile import NamedTemporaryFile
+        from django.core.management import call_command, CommandError
+
+        response = self._import('title\nUno\nD\x00os\n', 'tasks.csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['file_error']['line'], 3)
+        self.assertEqual(response.data['created'], 1)
+
+        with NamedTemporaryFile(suffix='.csv') as upload:
+            upload.write(b'title\nTres\nC\x00uatro\n')
+            upload.flush()
+            with self.assertRaisesMessage(CommandError, 'Línea 3'):
+                call_command('import_tasks', self.project.id, upload.name, stdout=StringIO(), stderr=StringIO())
+        self.assertTrue(Task.objects.filter(title='Tres').exists())
+
+    def test_bad_quoting_in_csv(self):
+        response = self._import('title,status\nUno,por_hacer\n"Dos"x,por_hacer\n', 'tasks.csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['file_error']['line'], 3)
+        self.assertEqual(response.data['created'], 1)
+
+    def test_unsupported_type_and_non_participant(self):
+        response = self._import('x', 'tasks.txt', type='xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.other)
+        response = self._import('{"title": "x"}', 'tasks.ndjson')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SQLInstrumentationTests(APITestCase):
+    def setUp(self):
+        from taskflow.middleware import slow_requests
+
+        self.user = User.objects.create_user(username='user', password='password123')
+        self.admin = User.objects.create_user(username='admin', password='password123', is_staff=True)
+        self.project = Project.objects.create(name='P', owner=self.user)
+        Task.objects.create(title='T', project=self.project, created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+        slow_requests.clear()
+
+    def test_server_timing_reports_queries(self):
+        import re
+
+        response = self.client.get('/api/tasks/')
+        match = re.search(r'sql;dur=[\d.]+;desc="queries=(\d+) duplicates=(\d+)"', response['Server-Timing'])
+        self.assertIsNotNone(match)
+        self.assertGreater(int(match.group(1)), 0)
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_repeated_statements_detected(self):
+        from taskflow.middleware import QueryStats
+
+        stats = QueryStats()
+        execute = lambda sql, params, many, context: None
+        for task_id in range(4):
+            stats(execute, 'SELECT * FROM tasks_task WHERE id = %s', (task_id,), False, {})
+        stats(execute, 'SELECT 1', (), False, {})
+
+        self.assertEqual(stats.count, 5)
+        self.assertEqual(stats.duplicates, 3)
+        self.assertEqual(stats.repeated(3), [('SELECT * FROM tasks_task WHERE id = %s', 4)])
+        self.assertEqual(stats.repeated(4), [])
+
+    def test_slow_requests_visible_to_admins_only(self):
+        from django.test import override_settings
+
+        with override_settings(SQL_SLOW_REQUEST_MS=0):
+            self.client.get('/api/tasks/')
+
+        response = self.client.get('/api/debug/sql/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/api/debug/sql/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry = response.data['results'][0]
+        self.assertEqual(entry['path'], '/api/tasks/')
+        self.assertEqual(entry['user_id'], self.user.id)
+        self.assertGreater(entry['queries'], 0)
+
+
+class ProjectCounterTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='password123')
+        self.project = Project.objects.create(name='Counted Project', owner=self.owner)
+        self.client.force_authenticate(user=self.owner)
+
+    def _counts(self, *fields):
+        self.project.refresh_from_db()
+        return tuple(getattr(self.project, field) for field in fields)
+
+    def _overdue(self):
+        return self.client.get(f'/api/projects/{self.project.id}/').data['overdue_count']
+
+    def test_save_and_delete_keep_counters(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        task = Task.objects.create(title='Uno', project=self.project, created_by=self.owner,
+                                   priority='alta', due_date=timezone.now() - timedelta(days=1))
+        Task.objects.create(title='Dos', project=self.project, created_by=self.owner)
+        self.assertEqual(self._counts('task_count', 'todo_count', 'high_priority_count'), (2, 2, 1))
+        self.assertIsNotNone(self.project.last_activity_at)
+        self.assertEqual(self._overdue(), 1)
+
+        task.status = 'completado'
+        task.save()
+        self.assertEqual(self._counts('todo_count', 'completed_count'), (1, 1))
+        self.assertEqual(self._overdue(), 0)
+
+        task.delete()
+        self.assertEqual(self._counts('task_count', 'completed_count', 'high_priority_count'), (1, 0, 0))
+
+    def test_bulk_operations_match_rebuild(self):
+        from tasks import counters
+
+        tasks = [Task.objects.create(title=f'Task {i}', project=self.project, created_by=self.owner) for i in range(4)]
+        operations = [
+            {'op': 'create', 'data': {'title': 'Nueva', 'project_id': self.project.id, 'status': 'revision'}},
+            {'op': 'update', 'id': tasks[0].id, 'data': {'status': 'completado', 'priority': 'urgente'}},
+            {'op': 'delete', 'id': tasks[1].id},
+        ]
+        response = self.client.post('/api/tasks/bulk/', operations, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(counters.rebuild(fix=False), [])
+        self.assertEqual(self._counts('task_count', 'review_count', 'completed_count', 'urgent_priority_count'), (4, 1, 1, 1))
+
+    def test_task_completed_after_due_date_is_not_discounted_twice(self):
+        from datetime import timedelta
+        from unittest import mock
+        from django.utils import timezone
+        from tasks import counters
+
+        now = timezone.now()
+        task = Task.objects.create(title='Uno', project=self.project, created_by=self.owner,
+                                   due_date=now + timedelta(hours=1))
+        self.assertEqual(self._overdue(), 0)
+
+        # Vence sin escribirse y se completa dos días después
+        with mock.patch('django.utils.timezone.now', return_value=now + timedelta(days=2)):
+            self.assertEqual(self._overdue(), 1)
+            task.status = 'completado'
+            task.save()
+            self.assertEqual(self._overdue(), 0)
+        self.assertEqual(counters.rebuild(fix=False), [])
+
+    def test_project_list_exposes_counters_without_queries(self):
+        Task.objects.create(title='Uno', project=self.project, created_by=self.owner, status='completado')
+        self.client.get('/api/projects/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/projects/')
+        project = response.data['results'][0]
+        self.assertEqual((project['task_count'], project['completed_count'], project['overdue_count']), (1, 1, 0))
+        # Solo las vencidas: una consulta para el ETag y otra para toda la página
+        self.assertEqual(len([q for q in queries.captured_queries if 'tasks_task' in q['sql']]), 2)
+
+    def test_rebuild_command_verifies_and_fixes(self):
+        from django.core.management import call_command, CommandError
+        from io import StringIO
+
+        Task.objects.create(title='Uno', project=self.project, created_by=self.owner)
+        Project.objects.filter(pk=self.project.pk).update(task_count=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_project_counters', '--verify', stdout=StringIO())
+        call_command('rebuild_project_counters', stdout=StringIO())
+        self.assertEqual(self._counts('task_count'), (1,))
+
+
+class DatabaseProfileTests(APITestCase):
+    def test_pragmas_applied_on_connect(self):
+        cursor = connection.cursor()
+        cursor.execute('PRAGMA busy_timeout')
+        self.assertEqual(cursor.fetchone()[0], 5000)
+        cursor.execute('PRAGMA cache_size')
+        self.assertEqual(cursor.fetchone()[0], -64000)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_replica_entry_is_read_only(self):
+        from shared.db import sqlite_database
+
+        replica = sqlite_database('/tmp/replica.sqlite3', pragmas={'mmap_size': None}, read_only=True)
+        self.assertEqual(replica['NAME'], 'file:/tmp/replica.sqlite3?mode=ro')
+        self.assertIn('PRAGMA query_only = ON', replica['OPTIONS']['init_command'])
+        self.assertNotIn('journal_mode', replica['OPTIONS']['init_command'])
+        self.assertNotIn('mmap_size', replica['OPTIONS']['init_command'])
+        self.assertNotIn('transaction_mode', replica['OPTIONS'])
+        self.assertEqual(replica['TEST'], {'MIRROR': 'default'})
+
+
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        from unittest import mock
+        from django.conf import settings
+        from taskflow.routers import ReadReplicaRouter
+
+        patcher = mock.patch.dict(settings.DATABASES, {'replica': {}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReadReplicaRouter()
+
+    def test_reads_go_to_replica_only_inside_safe_requests(self):
+        from taskflow.routers import read_from_replica
+
+        self.assertIsNone(self.router.db_for_read(Task))
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Task), 'replica')
+            self.assertIsNone(self.router.db_for_read(User))
+            self.assertEqual(self.router.db_for_write(Task), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'tasks'))
+
+    def test_middleware_marks_safe_methods(self):
+        from django.test import RequestFactory
+        from taskflow.middleware import ReadReplicaMiddleware
+
+        middleware = ReadReplicaMiddleware(lambda request: self.router.db_for_read(Task))
+        self.assertEqual(middleware(RequestFactory().get('/api/tasks/')), 'replica')
+        self.assertIsNone(middleware(RequestFactory().post('/api/tasks/')))
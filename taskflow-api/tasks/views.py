@@ -1,36 +1,56 @@
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.db import models
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Q
+from django.utils import timezone
 from .models import Task, TaskComment
-from .serializers import TaskSerializer, TaskCommentSerializer
+from .serializers import TaskSerializer, TaskListSerializer, TaskCommentSerializer
 from projects.models import Project
+from projects.membership import membership_for
+from projects.serializers import ProjectSummarySerializer
 from .permissions import IsProjectParticipant, CanManageTask
-from drf_spectacular.utils import extend_schema
+from .bulk import BulkTaskProcessor, OPERATIONS
+from .exports import iter_tasks_with_comments, iter_ndjson, iter_csv
+from .importers import TaskImporter, IMPORT_TYPES, guess_import_type
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from taskflow.eager_loading import EagerLoadingViewMixin
+from taskflow.sparse_fieldsets import SparseFieldsetViewMixin
+from taskflow.pagination import KeysetPagination, CommentKeysetPagination
+from taskflow.conditional import ConditionalGetMixin
 
 
 @extend_schema(
     summary="Listar tareas del usuario",
     description="Retorna todas las tareas donde el usuario es propietario, miembro o asignado del proyecto",
     tags=["Tareas"],
+    parameters=[
+        OpenApiParameter('view', str, enum=['compact'], description='Usa la representación compacta de listado'),
+        OpenApiParameter('fields', str, description='Lista de campos separados por comas a incluir en la respuesta'),
+    ],
     responses={
         200: TaskSerializer(many=True),
         401: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'No autorizado'}}},
         403: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Permiso denegado'}}}
     }
 )
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(ConditionalGetMixin, SparseFieldsetViewMixin, EagerLoadingViewMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    # La tarea incluye datos del proyecto: sus cambios también invalidan el ETag
+    validator_fields = ('updated_at', 'project__updated_at')
+
+    def get_serializer_class(self):
+        # La representación compacta solo aplica a lecturas; crear sigue usando el serializer completo
+        if self.request.method == 'GET' and self.request.query_params.get('view') == 'compact':
+            return TaskListSerializer
+        return TaskSerializer
     
     def get_queryset(self):
         project_id = self.request.query_params.get('project')
-        queryset = Task.objects.filter(
-            models.Q(project__owner=self.request.user) | 
-            models.Q(project__members=self.request.user) |
-            models.Q(assigned_to=self.request.user)
-        ).distinct()
+        queryset = Task.objects.visible_to(self.request.user)
         
         if project_id:
             queryset = queryset.filter(project_id=project_id)
@@ -58,7 +78,7 @@ class TaskListCreateView(generics.ListCreateAPIView):
         project = get_object_or_404(Project, id=project_id)
         
         # Verificacion de seguridad: solo el propietario o miembros pueden crear tareas
-        if project.owner != self.request.user and self.request.user not in project.members.all():
+        if not membership_for(self.request).is_participant(self.request.user, project):
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("No tienes permiso para crear tareas en este proyecto")
         
@@ -75,21 +95,18 @@ class TaskListCreateView(generics.ListCreateAPIView):
         404: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Tarea no encontrada'}}}
     }
 )
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ConditionalGetMixin, EagerLoadingViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, CanManageTask]
+    validator_fields = ('updated_at', 'project__updated_at')
 
     def get_queryset(self):
-        return Task.objects.filter(
-            models.Q(project__owner=self.request.user) |
-            models.Q(project__members=self.request.user) |
-            models.Q(assigned_to=self.request.user)
-        ).distinct()
+        return Task.objects.visible_to(self.request.user)
 
     def perform_update(self, serializer):
         # Permiso base ya verificado por CanManageTask. 
         # La lógica de "Asignado solo cambia status" la mantenemos aquí por brevedad.
-        task = self.get_object()
+        task = serializer.instance
         user = self.request.user
         
         if user != task.project.owner and user != task.created_by and user == task.assigned_to:
@@ -163,9 +180,10 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         403: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Permiso denegado'}}}
     }
 )
-class TaskCommentListCreateView(generics.ListCreateAPIView):
+class TaskCommentListCreateView(ConditionalGetMixin, EagerLoadingViewMixin, generics.ListCreateAPIView):
     serializer_class = TaskCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CommentKeysetPagination
     
     def get_queryset(self):
         task_id = self.kwargs['task_id']
@@ -191,9 +209,8 @@ class TaskCommentListCreateView(generics.ListCreateAPIView):
         task_id = self.kwargs['task_id']
         task = get_object_or_404(Task, id=task_id)
         
-        if (task.project.owner != self.request.user and 
-            self.request.user not in task.project.members.all() and 
-            task.assigned_to != self.request.user):
+        if (not membership_for(self.request).is_participant(self.request.user, task.project_id) and
+            task.assigned_to_id != self.request.user.id):
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("No tienes permiso para comentar en esta tarea")
         
@@ -225,8 +242,8 @@ class TaskCommentListCreateView(generics.ListCreateAPIView):
 def assign_task(request, task_id):
     task = get_object_or_404(Task, id=task_id)
     
-    if (task.project.owner != request.user and 
-        request.user not in task.project.members.all()):
+    membership = membership_for(request)
+    if not membership.is_participant(request.user, task.project_id):
         return Response(
             {'error': 'No tienes permiso para asignar esta tarea'}, 
             status=status.HTTP_403_FORBIDDEN # type: ignore
@@ -239,7 +256,7 @@ def assign_task(request, task_id):
         user = User.objects.get(id=user_id)
         
         # Seguridad: Solo se puede asignar a personas vinculadas al proyecto
-        if user != task.project.owner and user not in task.project.members.all():
+        if not membership.is_participant(user, task.project_id):
             return Response(
                 {'error': 'No puedes asignar esta tarea a un usuario que no es miembro del proyecto'}, 
                 status=status.HTTP_400_BAD_REQUEST # type: ignore
@@ -254,3 +271,266 @@ def assign_task(request, task_id):
             status=status.HTTP_404_NOT_FOUND # type: ignore
         )
 
+
+@extend_schema(
+    summary="Operaciones en bloque sobre tareas",
+    description=(
+        "Crea, actualiza y elimina varias tareas en una sola petición. Los permisos se "
+        "verifican una vez por proyecto y cada operación devuelve su propio resultado"
+    ),
+    operation_id="tasks_bulk",
+    tags=["Tareas"],
+    request={
+        'application/json': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'op': {'type': 'string', 'enum': list(OPERATIONS)},
+                    'id': {'type': 'integer', 'description': 'ID de la tarea (update/delete)'},
+                    'data': {'type': 'object', 'description': 'Campos de la tarea (create/update)'},
+                },
+                'required': ['op'],
+            },
+        }
+    },
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'results': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'index': {'type': 'integer'},
+                            'op': {'type': 'string'},
+                            'status': {'type': 'string', 'enum': ['ok', 'error']},
+                            'id': {'type': 'integer', 'nullable': True},
+                            'errors': {'type': 'object'},
+                        }
+                    }
+                }
+            }
+        },
+        400: {'type': 'object', 'properties': {'error': {'type': 'string', 'description': 'Mensaje de error'}}},
+        401: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'No autorizado'}}}
+    }
+)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_tasks(request):
+    operations = request.data
+    if not isinstance(operations, list):
+        return Response(
+            {'error': 'Se esperaba una lista de operaciones'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    processor = BulkTaskProcessor(request.user)
+    if len(operations) > processor.max_operations:
+        return Response(
+            {'error': f'Máximo {processor.max_operations} operaciones por petición'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response({'results': processor.process(operations)})
+
+
+EXPORT_TYPES = {
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+    'csv': ('text/csv', iter_csv),
+}
+
+
+@extend_schema(
+    summary="Exportar tareas de un proyecto",
+    description=(
+        "Descarga en streaming todas las tareas del proyecto con sus comentarios y asignado, "
+        "en orden de ID. Para reanudar una exportación interrumpida se pasa `after` con el "
+        "último ID de tarea recibido"
+    ),
+    operation_id="projects_export",
+    tags=["Proyectos"],
+    parameters=[
+        OpenApiParameter('type', str, enum=list(EXPORT_TYPES), description='Formato de salida (por defecto ndjson)'),
+        OpenApiParameter('after', int, description='Exporta solo tareas con ID mayor a este'),
+    ],
+    responses={
+        (200, 'application/x-ndjson'): {'type': 'string', 'description': 'Una tarea JSON por línea'},
+        (200, 'text/csv'): {'type': 'string', 'description': 'Una fila por comentario de cada tarea'},
+        400: {'type': 'object', 'properties': {'error': {'type': 'string', 'description': 'Mensaje de error'}}},
+        401: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'No autorizado'}}},
+        404: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Proyecto no encontrado'}}}
+    }
+)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def export_project_tasks(request, project_id):
+    project = get_object_or_404(Project.objects.visible_to(request.user), id=project_id)
+
+    # `format` lo reserva DRF para la negociación de contenido
+    export_type = request.query_params.get('type', 'ndjson')
+    if export_type not in EXPORT_TYPES:
+        return Response(
+            {'error': f"Formato no soportado: {export_type}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    after = request.query_params.get('after')
+    if after is not None:
+        try:
+            after = int(after)
+        except ValueError:
+            return Response({'error': 'after debe ser un ID de tarea'}, status=status.HTTP_400_BAD_REQUEST)
+
+    content_type, render = EXPORT_TYPES[export_type]
+    response = StreamingHttpResponse(
+        render(iter_tasks_with_comments(project.id, after=after)),
+        content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{project.slug or project.id}-tasks.{export_type}"'
+    return response
+
+
+@extend_schema(
+    summary="Importar tareas a un proyecto",
+    description=(
+        "Crea tareas a partir de un archivo CSV o NDJSON (mismas columnas que la exportación). "
+        "El archivo se procesa en lotes; las filas inválidas se informan con su número de línea "
+        "y no impiden importar las demás. El asignado se indica por nombre de usuario y debe "
+        "participar en el proyecto. Si el archivo deja de poder leerse (no es UTF-8 o el CSV está "
+        "mal formado) se responde 400 con el informe de lo importado hasta esa línea"
+    ),
+    operation_id="projects_import",
+    tags=["Proyectos"],
+    request={
+        'multipart/form-data': {
+            'type': 'object',
+            'properties': {
+                'file': {'type': 'string', 'format': 'binary'},
+                'type': {'type': 'string', 'enum': list(IMPORT_TYPES)},
+            },
+            'required': ['file'],
+        }
+    },
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'rows': {'type': 'integer'},
+                'created': {'type': 'integer'},
+                'failed': {'type': 'integer'},
+                'errors': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'row': {'type': 'integer'},
+                            'errors': {'type': 'object'},
+                        }
+                    }
+                },
+                'errors_truncated': {'type': 'boolean'},
+                'file_error': {
+                    'type': 'object',
+                    'nullable': True,
+                    'description': 'Error que cortó la lectura del archivo (la respuesta es 400)',
+                    'properties': {
+                        'line': {'type': 'integer'},
+                        'error': {'type': 'string'},
+                    }
+                },
+            }
+        },
+        400: {
+            'type': 'object',
+            'description': 'Archivo o formato inválido; si el archivo se empezó a importar, el informe con `file_error`',
+            'properties': {'error': {'type': 'string', 'description': 'Mensaje de error'}}
+        },
+        401: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'No autorizado'}}},
+        404: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'Proyecto no encontrado'}}}
+    }
+)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def import_project_tasks(request, project_id):
+    project = get_object_or_404(Project.objects.visible_to(request.user), id=project_id)
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'Se requiere un archivo en el campo file'}, status=status.HTTP_400_BAD_REQUEST)
+
+    import_type = request.data.get('type') or guess_import_type(upload.name)
+    if import_type not in IMPORT_TYPES:
+        return Response(
+            {'error': f"Formato no soportado: {import_type}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    report = TaskImporter(project, request.user).run(upload, import_type)
+    if report.file_error:
+        return Response(report.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+    return Response(report.as_dict())
+
+
+@extend_schema(
+    summary="Resumen del dashboard",
+    description="Retorna conteos de proyectos y tareas (por estado, prioridad y vencidas) y los elementos más recientes del usuario",
+    operation_id="dashboard_summary",
+    tags=["Dashboard"],
+    parameters=[
+        OpenApiParameter('recent', int, description='Cantidad de proyectos y tareas recientes (máximo 20, por defecto 5)'),
+    ],
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'projects_count': {'type': 'integer'},
+                'tasks_count': {'type': 'integer'},
+                'completed_count': {'type': 'integer'},
+                'overdue_count': {'type': 'integer'},
+                'by_status': {'type': 'object', 'additionalProperties': {'type': 'integer'}},
+                'by_priority': {'type': 'object', 'additionalProperties': {'type': 'integer'}},
+                'recent_projects': {'type': 'array', 'items': {'type': 'object'}},
+                'recent_tasks': {'type': 'array', 'items': {'type': 'object'}},
+            }
+        },
+        401: {'type': 'object', 'properties': {'detail': {'type': 'string', 'description': 'No autorizado'}}}
+    }
+)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def dashboard_summary(request):
+    try:
+        recent = min(max(int(request.query_params.get('recent', 5)), 0), 20)
+    except ValueError:
+        recent = 5
+
+    tasks = Task.objects.visible_to(request.user)
+    projects = Project.objects.visible_to(request.user)
+
+    # Un solo agregado con conteos condicionales en lugar de traer filas a Python
+    aggregates = {'tasks_count': Count('id')}
+    for value, _label in Task.STATUS_CHOICES:
+        aggregates[f'status_{value}'] = Count('id', filter=Q(status=value))
+    for value, _label in Task.PRIORITY_CHOICES:
+        aggregates[f'priority_{value}'] = Count('id', filter=Q(priority=value))
+    aggregates['overdue_count'] = Count(
+        'id', filter=Q(due_date__lt=timezone.now()) & ~Q(status='completado')
+    )
+    counts = tasks.order_by().aggregate(**aggregates)
+
+    recent_tasks = TaskListSerializer.setup_eager_loading(tasks.order_by('-created_at', '-id'))[:recent]
+    recent_projects = projects.order_by('-created_at', '-id')[:recent]
+
+    return Response({
+        'projects_count': projects.count(),
+        'tasks_count': counts['tasks_count'],
+        'completed_count': counts['status_completado'],
+        'overdue_count': counts['overdue_count'],
+        'by_status': {value: counts[f'status_{value}'] for value, _label in Task.STATUS_CHOICES},
+        'by_priority': {value: counts[f'priority_{value}'] for value, _label in Task.PRIORITY_CHOICES},
+        'recent_projects': ProjectSummarySerializer(recent_projects, many=True).data,
+        'recent_tasks': TaskListSerializer(recent_tasks, many=True).data,
+    })
@@ -1,9 +1,11 @@
+from functools import partial
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.views.generic import TemplateView, FormView
 from django.urls import reverse_lazy
 from .forms import LoginForm, RegisterForm, ProfileForm
 from core.api import API
+from core.concurrency import gather
 from core.utils import add_form_errors
 from core.mixins import LoginRequiredMixin
 
@@ -128,27 +130,30 @@ class ProfileView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        success, result = API.get_user_profile(self.request)
+        # Las tres consultas son independientes: se lanzan en paralelo
+        (success, result), (success_pr, profile), (success_s, summary) = gather(
+            partial(API.get_user_profile, self.request),
+            partial(API.get_profile, self.request),
+            partial(API.get_dashboard_summary, self.request),
+        )
+
         context['user_profile'] = result if success else self.request.session.get('user_data', {})
 
         context['user_data'] = self.request.session.get('user_data', {})
 
-        success, profile = API.get_profile(self.request)
-        context['profile_data'] = profile if success else self.request.session.get('profile_data', {})
-
-        # --- ESTADÍSTICAS ---
-        # 1. Proyectos
-        success_p, projects_result = API.get_projects(self.request)
-        context['projects_count'] = projects_result.get('count', 0) if success_p else 0
-
-        # 2. Tareas
-        success_t, tasks_result = API.get_tasks(self.request)
-        if success_t:
-            tasks = tasks_result.get('results', [])
-            context['tasks_count'] = tasks_result.get('count', 0)
-            context['completed_count'] = sum(1 for t in tasks if t.get('status') == 'completado')
-            context['in_progress_count'] = sum(1 for t in tasks if t.get('status') == 'en_progreso')
+        if success_pr:
+            # Respaldo para precargar formularios; se escribe aquí y no dentro de gather()
+            self.request.session['profile_data'] = profile
+        context['profile_data'] = profile if success_pr else self.request.session.get('profile_data', {})
+
+        # --- ESTADÍSTICAS (agregadas por la API) ---
+        if success_s:
+            context['projects_count'] = summary.get('projects_count', 0)
+            context['tasks_count'] = summary.get('tasks_count', 0)
+            context['completed_count'] = summary.get('completed_count', 0)
+            context['in_progress_count'] = summary.get('by_status', {}).get('en_progreso', 0)
         else:
+            context['projects_count'] = 0
             context['tasks_count'] = 0
             context['completed_count'] = 0
             context['in_progress_count'] = 0
@@ -175,6 +180,8 @@ class ProfileEditView(LoginRequiredMixin, FormView):
         kwargs = super().get_form_kwargs()
 
         success, profile = API.get_profile(self.request)
+        if success:
+            self.request.session['profile_data'] = profile
         data = profile if success else self.request.session.get('profile_data', {})
 
         kwargs['initial'] = {
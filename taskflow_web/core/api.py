@@ -1,15 +1,22 @@
+import threading
+import time
 import requests
 from datetime import date, datetime
 from django.conf import settings
+from core.http import get_session, response_cache
+from core.timing import timings_for, timed_json
 
 __all__ = ['API']
 
+_request_state_lock = threading.Lock()
+
 class API:
     """
     Servicio para comunicarse con la API REST de TaskFlow
     """
     
     BASE_URL = settings.API_BASE_URL
+    TIMEOUT = settings.API_HTTP_TIMEOUT
 
     @classmethod
     def _jsonable(cls, value):
@@ -45,8 +52,33 @@ class API:
         return False
     
     @classmethod
-    def _refresh_token(cls, request):
-        """Intenta refrescar el token de acceso usando el refresh token."""
+    def _get_refresh_lock(cls, request):
+        """Lock por request para que las llamadas concurrentes refresquen el token una sola vez."""
+        lock = getattr(request, '_api_refresh_lock', None)
+        if lock is None:
+            with _request_state_lock:
+                lock = getattr(request, '_api_refresh_lock', None)
+                if lock is None:
+                    lock = threading.Lock()
+                    request._api_refresh_lock = lock
+        return lock
+
+    @classmethod
+    def _refresh_token(cls, request, stale_token=None):
+        """
+        Intenta refrescar el token de acceso usando el refresh token.
+
+        Si `stale_token` ya no es el token de la sesión, otra llamada concurrente
+        lo refrescó mientras tanto y basta con reintentar con el nuevo.
+        """
+        with cls._get_refresh_lock(request):
+            current_token = request.session.get('access')
+            if stale_token and current_token and current_token != stale_token:
+                return True
+            return cls._request_new_token(request)
+
+    @classmethod
+    def _request_new_token(cls, request):
         refresh_token = request.session.get('refresh')
         
         if not refresh_token:
@@ -56,37 +88,103 @@ class API:
         data = {'refresh': refresh_token}
         
         try:
-            response = requests.post(url, json=data, timeout=10, proxies={'http': None, 'https': None})
+            response = get_session().post(url, json=data, timeout=cls.TIMEOUT)
             response.raise_for_status()
             result = response.json()
             
-            # Actualizar tokens en sesión (nombres correctos)
+            # Actualizar tokens en sesión (nombres correctos). Puede correr en un
+            # hilo de `gather()`: no se guarda aquí, lo hace SessionMiddleware
+            # al terminar el request, desde su propio hilo
             request.session['access'] = result.get('access')
             if result.get('refresh'):
                 request.session['refresh'] = result.get('refresh')
-            request.session.save()
             return True
         except requests.exceptions.HTTPError:
             # Si el refresh token también expiró, limpiar sesión
             request.session.pop('access', None)
             request.session.pop('refresh', None)
             request.session.pop('user_data', None)
-            request.session.save()
             return False
         except requests.exceptions.RequestException:
             return False
     
+    @classmethod
+    def _get_request_cache(cls, request):
+        """Caché de respuestas GET que vive lo que dura el request de Django."""
+        cache = getattr(request, '_api_response_cache', None)
+        if cache is None:
+            with _request_state_lock:
+                cache = getattr(request, '_api_response_cache', None)
+                if cache is None:
+                    cache = {}
+                    request._api_response_cache = cache
+        return cache
+
+    @classmethod
+    def _request_cache_key(cls, request, method, url, params):
+        if isinstance(params, dict):
+            params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+        return (method, url, params, request.session.get('access'))
+
     @classmethod
     def _make_request(cls, request, method, url, **kwargs):
-        """Método centralizado para hacer requests con manejo de token expirado."""
-        headers = cls._get_headers(request)
-        final_headers = headers.copy()
-        if 'headers' in kwargs and kwargs['headers']:
-            final_headers.update(kwargs['headers'])
-        kwargs['headers'] = final_headers
+        """
+        Método centralizado para hacer requests con manejo de token expirado.
+
+        Los GET idénticos (método, URL, parámetros y token) dentro de un mismo
+        request de Django se sirven desde memoria; cualquier escritura vacía esa caché.
+        """
+        cache = cls._get_request_cache(request)
+        if method.upper() != 'GET':
+            cache.clear()
+            return cls._send_request(request, method, url, **kwargs)
+
+        key = cls._request_cache_key(request, method.upper(), url, kwargs.get('params'))
+        response = cache.get(key)
+        if response is None:
+            response = cls._send_conditional_get(request, url, **kwargs)
+            if response.status_code < 400:
+                # Recalcular la clave por si el token se refrescó durante la llamada
+                cache[cls._request_cache_key(request, method.upper(), url, kwargs.get('params'))] = response
+        return response
+
+    @classmethod
+    def _send_conditional_get(cls, request, url, **kwargs):
+        """
+        GET que revalida con `If-None-Match` la última respuesta guardada para
+        el usuario; ante un 304 se reutiliza el cuerpo guardado.
+        """
+        user_id = request.session.get('user_data', {}).get('id')
+        if user_id is None:
+            return cls._send_request(request, 'GET', url, **kwargs)
+
+        params = kwargs.get('params')
+        if isinstance(params, dict):
+            params = tuple(sorted((str(k), str(v)) for k, v in params.items()))
+        key = (url, params)
+
+        entry = response_cache.get(user_id, key)
+        if entry is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), 'If-None-Match': entry['etag']}
+
+        response = cls._send_request(request, 'GET', url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cached = response_cache.build_response(entry, response.url)
+            timings = timings_for(request)
+            return timed_json(cached, timings) if timings else cached
+        if response.status_code == 200 and 'ETag' in response.headers:
+            response_cache.set(user_id, key, response)
+        return response
+
+    @classmethod
+    def _send_request(cls, request, method, url, **kwargs):
+        used_token = request.session.get('access')
+        # Cabeceras propias de la llamada; la autenticación se arma en cada intento
+        extra_headers = kwargs.get('headers') or {}
+        kwargs['headers'] = {**cls._get_headers(request), **extra_headers}
         
         try:
-            response = requests.request(method, url, timeout=10, proxies={'http': None, 'https': None}, **kwargs)
+            response = cls._timed_request(request, method, url, **kwargs)
             
             # Si el token expir?? o no es v??lido, intentar refrescarlo
             if response.status_code == 401 and request.session.get('refresh'):
@@ -103,19 +201,33 @@ class API:
                 if 'Token is expired' in response.text or 'token_not_valid' in response.text:
                     token_invalid = True
                 
-                if token_invalid and cls._refresh_token(request):
+                if token_invalid and cls._refresh_token(request, stale_token=used_token):
                     # Reintentar la petici??n con el nuevo token
-                    headers = cls._get_headers(request)
-                    final_headers = headers.copy()
-                    if 'headers' in kwargs and kwargs['headers']:
-                        final_headers.update(kwargs['headers'])
-                    kwargs['headers'] = final_headers
-                    response = requests.request(method, url, timeout=10, proxies={'http': None, 'https': None}, **kwargs)
+                    kwargs['headers'] = {**cls._get_headers(request), **extra_headers}
+                    response = cls._timed_request(request, method, url, **kwargs)
             
             return response
         except requests.exceptions.RequestException as e:
             raise e
 
+    @classmethod
+    def _timed_request(cls, request, method, url, **kwargs):
+        """
+        Envía la petición y, si la página se está midiendo, registra la duración
+        de la llamada, el `Server-Timing` de la API y el tiempo de decodificar el JSON.
+        """
+        timings = timings_for(request)
+        if timings is None:
+            return get_session().request(method, url, timeout=cls.TIMEOUT, **kwargs)
+
+        start = time.perf_counter()
+        response = get_session().request(method, url, timeout=cls.TIMEOUT, **kwargs)
+        timings.add_call(
+            method.upper(), url, response.status_code, time.perf_counter() - start,
+            response.headers.get('Server-Timing', '')
+        )
+        return timed_json(response, timings)
+
     @classmethod
     def _get_headers(cls, request):
         """Obtener headers con token de autenticación"""
@@ -143,7 +255,7 @@ class API:
         
         
         try:
-            response = requests.post(url, json=data, timeout=10)
+            response = get_session().post(url, json=data, timeout=cls.TIMEOUT)
             
             response.raise_for_status()
             
@@ -186,13 +298,9 @@ class API:
         try:
             response = cls._make_request(request, 'GET', url)
             response.raise_for_status()
-            data = response.json()
-
-            # Cachear en sesión para precargar formularios
-            request.session['profile_data'] = data
-            request.session.save()
-
-            return True, data
+            # Sin tocar la sesión: se puede llamar desde `gather()`. Quien quiera
+            # guardarlo como respaldo lo escribe en el hilo del request
+            return True, response.json()
         except requests.exceptions.HTTPError as e:
             resp = getattr(e, 'response', None)
             if resp is not None:
@@ -210,7 +318,7 @@ class API:
         url = f"{cls.BASE_URL}/auth/register/"
         
         try:
-            response = requests.post(url, json=user_data, timeout=10)
+            response = get_session().post(url, json=user_data, timeout=cls.TIMEOUT)
             response.raise_for_status()
             
             return True, response.json()
@@ -294,11 +402,19 @@ class API:
             return False, {'error': str(e)}
     
     @classmethod
-    def get_tasks(cls, request, project_id=None):
+    def get_tasks(cls, request, project_id=None, compact=False, with_count=False):
+        """
+        Listar tareas; `compact=True` pide la representación ligera de listado.
+        La API pagina por cursor y solo incluye `count` si se pide con `with_count=True`.
+        """
         url = f"{cls.BASE_URL}/tasks/"
         params = {}
         if project_id:
             params['project'] = project_id
+        if compact:
+            params['view'] = 'compact'
+        if with_count:
+            params['count'] = 'true'
 
         try:
             response = cls._make_request(request, 'GET', url, params=params)
@@ -315,6 +431,25 @@ class API:
         except requests.exceptions.RequestException as e:
             return False, {'error': str(e)}
 
+    @classmethod
+    def get_dashboard_summary(cls, request):
+        """Obtener conteos y elementos recientes del dashboard en una sola llamada."""
+        url = f"{cls.BASE_URL}/dashboard/summary/"
+        try:
+            response = cls._make_request(request, 'GET', url)
+            response.raise_for_status()
+            return True, response.json()
+        except requests.exceptions.HTTPError as e:
+            resp = getattr(e, 'response', None)
+            if resp is not None:
+                try:
+                    return False, resp.json()
+                except ValueError:
+                    return False, {'error': resp.text}
+            return False, {'error': str(e)}
+        except requests.exceptions.RequestException as e:
+            return False, {'error': str(e)}
+
     @classmethod
     def get_task(cls, request, task_id):
         """Obtener detalle de una tarea."""
@@ -544,12 +679,15 @@ class API:
             return False, {'error': f'Error obteniendo usuarios: {str(e)}'}
 
     @classmethod
-    def search_users(cls, request, query):
-        """Buscar usuarios por username o email."""
-        url = f"{cls.BASE_URL}/auth/users/search/?q={query}"
+    def search_users(cls, request, query, limit=10, cursor=None):
+        """Buscar usuarios por prefijo de username o email (paginado por cursor)."""
+        url = f"{cls.BASE_URL}/auth/users/search/"
+        params = {'q': query, 'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
         
         try:
-            response = cls._make_request(request, 'GET', url)
+            response = cls._make_request(request, 'GET', url, params=params)
             response.raise_for_status()
             return True, response.json()
         except requests.exceptions.HTTPError as e:
@@ -632,11 +770,14 @@ class API:
             return False, {'error': str(e)}
 
     @classmethod
-    def get_suggested_members(cls, request, project_id):
-        """Lista usuarios no miembros del proyecto."""
+    def get_suggested_members(cls, request, project_id, query='', cursor=None, limit=10):
+        """Lista usuarios no miembros del proyecto que empiezan por `query`."""
         url = f"{cls.BASE_URL}/projects/{project_id}/members/list/"
+        params = {'q': query, 'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
         try:
-            response = cls._make_request(request, 'GET', url)
+            response = cls._make_request(request, 'GET', url, params=params)
             response.raise_for_status()
             return True, response.json()
         except requests.exceptions.HTTPError as e:
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+__all__ = ['gather']
+
+# Compartido por todo el proceso: lo usan a la vez todas las páginas en curso
+_executor = ThreadPoolExecutor(
+    max_workers=settings.API_FANOUT_WORKERS,
+    thread_name_prefix='api-fanout',
+)
+
+
+def _run_in_worker(call):
+    try:
+        return call()
+    finally:
+        # Las conexiones de BD son por hilo: cerrar las que la llamada haya abierto
+        connections.close_all()
+
+
+def gather(*calls):
+    """
+    Ejecuta en paralelo llamadas independientes a la API y devuelve sus
+    resultados en el mismo orden.
+
+    Args:
+        *calls: Callables sin argumentos, normalmente `functools.partial`
+            sobre métodos de `API` que devuelven tuplas `(success, result)`.
+
+    Las llamadas no deben tener efectos sobre el request (p. ej. escribir en
+    `request.session`): corren en otros hilos a la vez. Se devuelven los datos
+    y quien llama los guarda después, desde el hilo del request. El refresco
+    del token ante un 401 se coordina en `API._make_request`, así que varias
+    llamadas que expiran a la vez solo refrescan una vez.
+
+    Como mucho `API_MAX_PARALLEL_CALLS` llamadas a la vez por request; una de
+    ellas corre en el propio hilo del request, que si no quedaría esperando.
+    La latencia total es la de la llamada más lenta, no la suma de todas.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+
+    window = max(settings.API_MAX_PARALLEL_CALLS, 1)
+    results = []
+    for start in range(0, len(calls), window):
+        first, *rest = calls[start:start + window]
+        futures = [_executor.submit(_run_in_worker, call) for call in rest]
+        results.append(first())
+        results.extend(future.result() for future in futures)
+    return results
@@ -0,0 +1,8 @@
+from django.conf import settings
+
+__all__ = ['page_timings']
+
+
+def page_timings(request):
+    """Indica a base.html si debe dejar el hueco del panel de tiempos."""
+    return {'page_timings_panel': settings.PAGE_TIMINGS_PANEL}
@@ -0,0 +1,159 @@
+import threading
+from collections import OrderedDict
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+__all__ = ['get_session', 'pool_stats', 'ConditionalResponseCache', 'response_cache']
+
+# Métodos que se pueden reintentar sin riesgo de duplicar efectos en la API
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_retry():
+    return Retry(
+        total=settings.API_HTTP_RETRIES,
+        backoff_factor=settings.API_HTTP_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+    )
+
+
+def _build_adapter(pool_maxsize):
+    return HTTPAdapter(
+        pool_connections=settings.API_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=_build_retry(),
+    )
+
+
+def _build_session():
+    session = requests.Session()
+    # La API es un servicio interno: no pasar por proxies del entorno
+    session.trust_env = False
+
+    default_adapter = _build_adapter(settings.API_HTTP_POOL_MAXSIZE)
+    session.mount('http://', default_adapter)
+    session.mount('https://', default_adapter)
+
+    # Pools dedicados por host (el prefijo más largo gana en requests)
+    for prefix, pool_maxsize in settings.API_HTTP_POOL_SIZES.items():
+        session.mount(prefix, _build_adapter(pool_maxsize))
+
+    return session
+
+
+def get_session():
+    """
+    Devuelve la sesión HTTP compartida por todo el proceso.
+
+    Mantiene conexiones keep-alive en un pool por host, de modo que las llamadas
+    a la API reutilizan la conexión TCP en lugar de abrir una nueva cada vez.
+    Los reintentos con backoff solo aplican a métodos idempotentes.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def pool_stats():
+    """
+    Métricas de reutilización de conexiones por host.
+
+    - requests: peticiones servidas por el pool.
+    - misses: conexiones nuevas que hubo que abrir.
+    - hits: peticiones que reutilizaron una conexión existente.
+    """
+    if _session is None:
+        return {}
+
+    stats = {}
+    adapters = {id(adapter): adapter for adapter in _session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {'requests': 0, 'hits': 0, 'misses': 0})
+            entry['requests'] += pool.num_requests
+            entry['misses'] += pool.num_connections
+            entry['hits'] += max(pool.num_requests - pool.num_connections, 0)
+    return stats
+
+
+class ConditionalResponseCache:
+    """
+    LRU acotado por usuario de respuestas GET que traen `ETag`.
+
+    Guarda el cuerpo tal como llegó para revalidarlo con `If-None-Match`: ante
+    un 304 la API no serializa nada y el cuerpo no viaja por la red. Se limita
+    tanto el número de usuarios como el de entradas por usuario.
+    """
+
+    def __init__(self, max_users, max_entries):
+        self.max_users = max_users
+        self.max_entries = max_entries
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_key, key):
+        with self._lock:
+            entries = self._users.get(user_key)
+            if entries is None or key not in entries:
+                return None
+            self._users.move_to_end(user_key)
+            entries.move_to_end(key)
+            return entries[key]
+
+    def set(self, user_key, key, response):
+        entry = {
+            'etag': response.headers['ETag'],
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'content': response.content,
+            'encoding': response.encoding,
+        }
+        with self._lock:
+            entries = self._users.get(user_key)
+            if entries is None:
+                entries = self._users[user_key] = OrderedDict()
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            self._users.move_to_end(user_key)
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+    @staticmethod
+    def build_response(entry, url):
+        """Reconstruye la respuesta guardada tras un 304."""
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['content']
+        response.encoding = entry['encoding']
+        response.url = url
+        return response
+
+
+response_cache = ConditionalResponseCache(
+    settings.API_RESPONSE_CACHE_USERS,
+    settings.API_RESPONSE_CACHE_ENTRIES,
+)
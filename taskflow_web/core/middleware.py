@@ -0,0 +1,64 @@
+import time
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from core.http import pool_stats
+from core.timing import PageTimings
+
+__all__ = ['PageTimingMiddleware', 'PANEL_PLACEHOLDER']
+
+# Marca que deja base.html cuando el panel está activo; se sustituye al final
+# del request, cuando ya se conocen el tiempo de render y el total
+PANEL_PLACEHOLDER = b'<!-- page-timings-panel -->'
+
+
+class PageTimingMiddleware:
+    """
+    Desglosa el tiempo de cada página: llamadas a la API (red y servidor), SQL
+    que reporta la API en su `Server-Timing`, decodificación JSON y render de
+    la plantilla.
+
+    El desglose se publica siempre en la cabecera `Server-Timing` de la web y,
+    con `PAGE_TIMINGS_PANEL`, como panel al pie de la página junto con la
+    reutilización de conexiones del pool HTTP (`core.http.pool_stats`). El
+    render se mide con un callback posterior al render de las `TemplateResponse`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = PageTimings()
+        request._page_timings = timings
+        start = time.perf_counter()
+        response = self.get_response(request)
+        timings.total_seconds = time.perf_counter() - start
+
+        response['Server-Timing'] = timings.header()
+        if settings.PAGE_TIMINGS_PANEL:
+            self._render_panel(response, timings)
+        return response
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, '_page_timings', None)
+        if timings is None:
+            return response
+        started = time.perf_counter()
+
+        def rendered(response):
+            timings.render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def _render_panel(self, response, timings):
+        if response.streaming or PANEL_PLACEHOLDER not in response.content:
+            return
+        panel = render_to_string('core/page_timings_panel.html', {
+            'timings': timings.summary(),
+            'pools': pool_stats(),
+        })
+        response.content = response.content.replace(PANEL_PLACEHOLDER, panel.encode(response.charset), 1)
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
@@ -0,0 +1,236 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core import http
+
+
+class HTTPSessionTests(SimpleTestCase):
+    def setUp(self):
+        http._session = None
+        self.addCleanup(setattr, http, '_session', None)
+
+    @override_settings(API_HTTP_POOL_MAXSIZE=10, API_HTTP_POOL_SIZES={'http://api.interna:8000': 25})
+    def test_adapters_per_host(self):
+        session = http.get_session()
+        self.assertIs(http.get_session(), session)
+        self.assertFalse(session.trust_env)
+
+        default = session.get_adapter('http://otra:8000/api/')
+        dedicated = session.get_adapter('http://api.interna:8000/api/tasks/')
+        self.assertIsNot(default, dedicated)
+        self.assertEqual(default._pool_maxsize, 10)
+        self.assertEqual(dedicated._pool_maxsize, 25)
+
+    @override_settings(API_HTTP_RETRIES=3)
+    def test_retries_only_idempotent_methods(self):
+        retry = http.get_session().get_adapter('http://127.0.0.1:8000/api/').max_retries
+        self.assertEqual(retry.total, 3)
+        self.assertEqual(retry.allowed_methods, http.IDEMPOTENT_METHODS)
+        self.assertIn('GET', retry.allowed_methods)
+        self.assertNotIn('POST', retry.allowed_methods)
+        self.assertNotIn('PATCH', retry.allowed_methods)
+        self.assertEqual(set(retry.status_forcelist), {502, 503, 504})
+
+    def test_pool_stats(self):
+        self.assertEqual(http.pool_stats(), {})
+        session = http.get_session()
+        pool = session.get_adapter('http://127.0.0.1:8000/').poolmanager.connection_from_url('http://127.0.0.1:8000/')
+        pool.num_requests, pool.num_connections = 5, 2
+        self.assertEqual(http.pool_stats()['http://127.0.0.1:8000'], {'requests': 5, 'hits': 3, 'misses': 2})
+
+    def test_panel_shows_pool_stats(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from core.middleware import PANEL_PLACEHOLDER, PageTimingMiddleware
+
+        middleware = PageTimingMiddleware(lambda request: HttpResponse(b'<body>' + PANEL_PLACEHOLDER + b'</body>'))
+        with override_settings(PAGE_TIMINGS_PANEL=True), \
+                mock.patch('core.middleware.pool_stats', return_value={'http://api:8000': {'requests': 7, 'hits': 6, 'misses': 1}}):
+            response = middleware(RequestFactory().get('/'))
+        self.assertIn(b'Pool HTTP', response.content)
+        self.assertIn(b'http://api:8000', response.content)
+
+
+class FakeSession(dict):
+    def save(self):
+        pass
+
+
+def _response(status_code, payload=None, headers=None):
+    import json
+    import requests
+
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload or {}).encode()
+    response.headers.update(headers or {})
+    response.url = 'http://api/'
+    return response
+
+
+class APIRequestCacheTests(SimpleTestCase):
+    def setUp(self):
+        from django.test import RequestFactory
+
+        self.request = RequestFactory().get('/')
+        self.request.session = FakeSession(access='token')
+        self.http = mock.MagicMock()
+        patcher = mock.patch('core.api.get_session', return_value=self.http)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, url='http://api/projects/', params=None):
+        from core.api import API
+
+        return API._make_request(self.request, 'GET', url, params=params)
+
+    def test_identical_gets_hit_the_cache(self):
+        self.http.request.return_value = _response(200, {'ok': True})
+        first = self._get(params={'page': 1})
+        self.assertIs(self._get(params={'page': 1}), first)
+        self.assertEqual(self.http.request.call_count, 1)
+
+        self._get(params={'page': 2})
+        self.assertEqual(self.http.request.call_count, 2)
+
+    def test_writes_clear_the_cache(self):
+        from core.api import API
+
+        self.http.request.return_value = _response(200)
+        self._get()
+        API._make_request(self.request, 'POST', 'http://api/tasks/', json={})
+        self._get()
+        self.assertEqual([call.args[0] for call in self.http.request.call_args_list], ['GET', 'POST', 'GET'])
+
+    def test_errors_are_not_cached(self):
+        self.http.request.return_value = _response(500)
+        self._get()
+        self._get()
+        self.assertEqual(self.http.request.call_count, 2)
+
+    def test_token_is_part_of_the_key(self):
+        self.http.request.return_value = _response(200)
+        self._get()
+        self.request.session['access'] = 'otro'
+        self._get()
+        self.assertEqual(self.http.request.call_count, 2)
+
+
+class ParallelRefreshTests(SimpleTestCase):
+    def test_parallel_401s_refresh_once(self):
+        import threading
+        from functools import partial
+        from django.test import RequestFactory
+        from core.api import API
+        from core.concurrency import gather
+
+        request = RequestFactory().get('/')
+        request.session = FakeSession(access='viejo', refresh='r')
+        # Las cuatro llamadas reciben el 401 antes de que ninguna refresque
+        expired = threading.Barrier(4, timeout=5)
+
+        def send(method, url, timeout=None, headers=None, **kwargs):
+            if headers['Authorization'] == 'Bearer viejo':
+                expired.wait()
+                return _response(401, {'code': 'token_not_valid'})
+            return _response(200, {'url': url})
+
+        http = mock.MagicMock()
+        http.request.side_effect = send
+        http.post.return_value = _response(200, {'access': 'nuevo'})
+        urls = [f'http://api/recurso/{i}/' for i in range(4)]
+        with override_settings(API_MAX_PARALLEL_CALLS=4), mock.patch('core.api.get_session', return_value=http):
+            responses = gather(*(partial(API._make_request, request, 'GET', url) for url in urls))
+
+        self.assertEqual(http.post.call_count, 1)
+        self.assertEqual([response.json()['url'] for response in responses], urls)
+        self.assertEqual(request.session['access'], 'nuevo')
+
+
+class GatherTests(SimpleTestCase):
+    @override_settings(API_MAX_PARALLEL_CALLS=2)
+    def test_limits_calls_per_request_and_keeps_order(self):
+        import threading
+        from functools import partial
+        from core.concurrency import gather
+
+        state = {'running': 0, 'peak': 0, 'threads': set()}
+        lock = threading.Lock()
+
+        def call(value):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+                state['threads'].add(threading.current_thread())
+            threading.Event().wait(0.01)
+            with lock:
+                state['running'] -= 1
+            return value
+
+        self.assertEqual(gather(*(partial(call, i) for i in range(5))), list(range(5)))
+        self.assertLessEqual(state['peak'], 2)
+        # Una llamada de cada tanda corre en el hilo del request
+        self.assertIn(threading.current_thread(), state['threads'])
+
+    def test_get_profile_leaves_session_alone(self):
+        from django.test import RequestFactory
+        from core.api import API
+
+        request = RequestFactory().get('/')
+        request.session = mock.MagicMock(wraps=FakeSession(access='token'))
+        http = mock.MagicMock()
+        http.request.return_value = _response(200, {'bio': 'Hola'})
+        with mock.patch('core.api.get_session', return_value=http):
+            self.assertEqual(API.get_profile(request), (True, {'bio': 'Hola'}))
+        request.session.__setitem__.assert_not_called()
+        request.session.save.assert_not_called()
+
+
+class SharedCacheTests(SimpleTestCase):
+    def test_default_cache_is_the_shared_tiered_cache(self):
+        from django.core.cache import caches
+        from django.core.cache.backends.locmem import LocMemCache
+        from shared.cache import TieredCache
+
+        cache = caches['default']
+        self.assertIsInstance(cache, TieredCache)
+        # El runner de tests pone el L2 en memoria local
+        self.assertIsInstance(cache.l2, LocMemCache)
+        cache.set('clave', 'valor')
+        cache.clear_local()
+        self.assertEqual(cache.get('clave'), 'valor')
+        self.assertEqual(cache.metrics.l2_hits, 1)
+        cache.clear()
+
+
+class ServerTimingTests(SimpleTestCase):
+    def test_parse_server_timing(self):
+        from core.timing import parse_server_timing
+
+        metrics = parse_server_timing('sql;dur=12.5;desc="queries=3 duplicates=1", total;dur=20, cache, bad;dur=x')
+        self.assertEqual(metrics['sql'], {'dur': 12.5, 'desc': 'queries=3 duplicates=1'})
+        self.assertEqual(metrics['total'], {'dur': 20.0, 'desc': ''})
+        self.assertEqual(metrics['cache'], {'dur': None, 'desc': ''})
+        self.assertIsNone(metrics['bad']['dur'])
+        self.assertEqual(parse_server_timing(None), {})
+
+    def test_middleware_publishes_breakdown(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from core.middleware import PageTimingMiddleware
+        from core.timing import parse_server_timing, timings_for
+
+        def view(request):
+            timings = timings_for(request)
+            timings.add_call('GET', 'http://api/tasks/', 200, 0.010, 'sql;dur=2;desc="queries=3", total;dur=6')
+            timings.add_call('GET', 'http://api/projects/', 200, 0.004, 'sql;dur=1;desc="queries=2", total;dur=3')
+            return HttpResponse('ok')
+
+        response = PageTimingMiddleware(view)(RequestFactory().get('/'))
+        metrics = parse_server_timing(response['Server-Timing'])
+        self.assertAlmostEqual(metrics['api']['dur'], 14.0, places=1)
+        self.assertEqual(metrics['api']['desc'], 'calls=2')
+        self.assertAlmostEqual(metrics['api-network']['dur'], 5.0, places=1)
+        self.assertEqual(metrics['api-sql']['desc'], 'queries=5')
+        self.assertIn('total', metrics)
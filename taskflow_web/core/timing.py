@@ -0,0 +1,128 @@
+import re
+import threading
+import time
+
+__all__ = ['PageTimings', 'parse_server_timing', 'timings_for', 'timed_json']
+
+_METRIC_RE = re.compile(r'\s*([\w-]+)((?:\s*;\s*[\w-]+\s*=\s*(?:"[^"]*"|[^;,]*))*)\s*(?:,|$)')
+_PARAM_RE = re.compile(r';\s*([\w-]+)\s*=\s*("[^"]*"|[^;,]*)')
+_UPSTREAM_QUERIES_RE = re.compile(r'queries=(\d+)')
+
+
+def parse_server_timing(header):
+    """
+    Convierte una cabecera `Server-Timing` en `{métrica: {'dur': ms, 'desc': texto}}`.
+
+    Las métricas o parámetros mal formados se ignoran.
+    """
+    metrics = {}
+    for match in _METRIC_RE.finditer(header or ''):
+        name, params = match.group(1), match.group(2)
+        if not name:
+            continue
+        metric = {'dur': None, 'desc': ''}
+        for key, value in _PARAM_RE.findall(params):
+            value = value.strip().strip('"')
+            if key == 'dur':
+                try:
+                    metric['dur'] = float(value)
+                except ValueError:
+                    pass
+            elif key == 'desc':
+                metric['desc'] = value
+        metrics[name] = metric
+    return metrics
+
+
+class PageTimings:
+    """
+    Tiempos de una página de la web, acumulados mientras se atiende el request.
+
+    Las llamadas a la API pueden ejecutarse en paralelo (`core.concurrency.gather`),
+    así que el registro es thread-safe y `api` es la suma de las duraciones de
+    las llamadas, no el tiempo de pared.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = []
+        self.json_seconds = 0.0
+        self.render_seconds = None
+        self.total_seconds = None
+
+    def add_call(self, method, url, status_code, seconds, server_timing):
+        upstream = parse_server_timing(server_timing)
+        sql = upstream.get('sql', {})
+        queries = _UPSTREAM_QUERIES_RE.search(sql.get('desc', ''))
+        call = {
+            'method': method,
+            'url': url,
+            'status': status_code,
+            'ms': seconds * 1000,
+            'upstream_ms': upstream.get('total', {}).get('dur'),
+            'sql_ms': sql.get('dur'),
+            'queries': int(queries.group(1)) if queries else None,
+        }
+        with self._lock:
+            self.calls.append(call)
+
+    def add_json(self, seconds):
+        with self._lock:
+            self.json_seconds += seconds
+
+    def summary(self):
+        """Desglose en milisegundos: API (red y servidor), SQL de la API, JSON y render."""
+        with self._lock:
+            calls = list(self.calls)
+            json_seconds = self.json_seconds
+
+        api_ms = sum(call['ms'] for call in calls)
+        upstream_ms = sum(call['upstream_ms'] or 0 for call in calls)
+        return {
+            'api_calls': len(calls),
+            'api_ms': api_ms,
+            'upstream_ms': upstream_ms,
+            # Lo que no pasó dentro de la API: red, colas y (de)serialización HTTP
+            'network_ms': max(api_ms - upstream_ms, 0.0),
+            'sql_ms': sum(call['sql_ms'] or 0 for call in calls),
+            'queries': sum(call['queries'] or 0 for call in calls),
+            'json_ms': json_seconds * 1000,
+            'render_ms': None if self.render_seconds is None else self.render_seconds * 1000,
+            'total_ms': None if self.total_seconds is None else self.total_seconds * 1000,
+            'calls': calls,
+        }
+
+    def header(self):
+        """Valor de `Server-Timing` de la página."""
+        summary = self.summary()
+        metrics = [
+            f'api;dur={summary["api_ms"]:.2f};desc="calls={summary["api_calls"]}"',
+            f'api-network;dur={summary["network_ms"]:.2f}',
+            f'api-sql;dur={summary["sql_ms"]:.2f};desc="queries={summary["queries"]}"',
+            f'json;dur={summary["json_ms"]:.2f}',
+        ]
+        if summary['render_ms'] is not None:
+            metrics.append(f'render;dur={summary["render_ms"]:.2f}')
+        if summary['total_ms'] is not None:
+            metrics.append(f'total;dur={summary["total_ms"]:.2f}')
+        return ', '.join(metrics)
+
+
+def timings_for(request):
+    """Tiempos de la página en curso, o None si el middleware no está activo."""
+    return getattr(request, '_page_timings', None)
+
+
+def timed_json(response, timings):
+    """Reemplaza `response.json` por una versión que suma el tiempo de decodificación."""
+    decode = response.json
+
+    def json(**kwargs):
+        start = time.perf_counter()
+        try:
+            return decode(**kwargs)
+        finally:
+            timings.add_json(time.perf_counter() - start)
+
+    response.json = json
+    return response
@@ -14,32 +14,23 @@ class HomeView(LoginRequiredMixin, TemplateView):
         # Obtener datos del usuario desde la sesion
         context['user'] = request.session.get('user_data', {})
 
-        # Obtener proyectos del usuario
-        success, projects_result = API.get_projects(request)
+        # Conteos y elementos recientes calculados por la API en una sola llamada
+        success, summary = API.get_dashboard_summary(request)
         if success:
-            context['projects'] = projects_result.get('results', [])
-            context['projects_count'] = projects_result.get('count', 0)
+            context['projects'] = summary.get('recent_projects', [])
+            context['projects_count'] = summary.get('projects_count', 0)
+            context['tasks'] = summary.get('recent_tasks', [])
+            context['tasks_count'] = summary.get('tasks_count', 0)
+            context['completed_tasks_count'] = summary.get('completed_count', 0)
         else:
-            redirect_response = handle_api_auth_error(request, projects_result)
+            redirect_response = handle_api_auth_error(request, summary)
             if redirect_response:
                 return redirect_response
             context['projects'] = []
             context['projects_count'] = 0
-            messages.error(request, 'Error al cargar los proyectos.')
-
-        # Obtener tareas del usuario
-        success, tasks_result = API.get_tasks(request)
-        if success:
-            tasks = tasks_result.get('results', [])
-            context['tasks'] = tasks
-            context['tasks_count'] = tasks_result.get('count', 0)
-            context['completed_tasks_count'] = sum(1 for t in tasks if t.get('status') == 'completado')
-        else:
-            redirect_response = handle_api_auth_error(request, tasks_result)
-            if redirect_response:
-                return redirect_response
             context['tasks'] = []
             context['tasks_count'] = 0
-            messages.error(request, 'Error al cargar las tareas.')
+            context['completed_tasks_count'] = 0
+            messages.error(request, 'Error al cargar el resumen del dashboard.')
 
         return self.render_to_response(context)
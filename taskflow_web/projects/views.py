@@ -210,10 +210,14 @@ class ProjectUpdateView(LoginRequiredMixin, FormView):
 
 class AddProjectMemberView(LoginRequiredMixin, TemplateView):
     def get(self, request, project_id):
-        """Devuelve la lista de usuarios disponibles para agregar al proyecto (solo owner)."""
-        success, result = API.get_suggested_members(request, project_id)
+        """Devuelve una página de usuarios disponibles para agregar al proyecto (solo owner)."""
+        success, result = API.get_suggested_members(
+            request, project_id,
+            query=request.GET.get('q', ''),
+            cursor=request.GET.get('cursor'),
+        )
         if success:
-            return JsonResponse({'success': True, 'users': result.get('users', [])})
+            return JsonResponse({'success': True, 'users': result.get('users', []), 'next': result.get('next')})
         else:
             return JsonResponse({'success': False, 'error': result.get('error', 'Error cargando usuarios')}, status=400)
     
@@ -55,18 +55,34 @@ function deleteProject(id) {
     }
 }
 
-// Cargar usuarios cuando se abre el modal
-async function loadUsers(projectId) {
+// Estado del autocompletado de usuarios (búsqueda por prefijo en la API)
+const userSearch = {
+    query: "",
+    next: null,
+    requestId: 0,
+    timer: null,
+};
+
+// Cargar una página de usuarios que empiezan por `query`.
+// Con `append` se agregan al final (botón "Cargar más") en lugar de reemplazar.
+async function loadUsers(projectId, query = "", append = false) {
     const userSelect = document.getElementById("userSelect");
     const addBtn = document.getElementById("addMemberBtn");
+    const loadMoreBtn = document.getElementById("loadMoreUsers");
     if (!userSelect) return;
 
-    userSelect.innerHTML = '<option value="">Cargando usuarios...</option>';
-    userSelect.disabled = true;
-    if (addBtn) addBtn.disabled = true;
+    const requestId = ++userSearch.requestId;
+    const params = new URLSearchParams({ q: query });
+    if (append && userSearch.next) params.set("cursor", userSearch.next);
+
+    if (!append) {
+        userSelect.innerHTML = '<option value="">Cargando usuarios...</option>';
+        userSelect.disabled = true;
+        if (addBtn) addBtn.disabled = true;
+    }
 
     try {
-        const response = await fetch(`/projects/${projectId}/members/`, {
+        const response = await fetch(`/projects/${projectId}/members/?${params}`, {
             method: "GET",
             headers: {
                 "Content-Type": "application/json",
@@ -75,6 +91,8 @@ async function loadUsers(projectId) {
         });
 
         const data = await parseJsonSafe(response);
+        // Ignorar respuestas de búsquedas que ya quedaron atrás
+        if (requestId !== userSearch.requestId) return;
         if (!response.ok || !data) {
             throw new Error(`HTTP error ${response.status}`);
         }
@@ -84,7 +102,13 @@ async function loadUsers(projectId) {
             return;
         }
 
-        userSelect.innerHTML = '<option value="">Selecciona un usuario...</option>';
+        userSearch.query = query;
+        userSearch.next = data.next || null;
+        if (loadMoreBtn) loadMoreBtn.classList.toggle("d-none", !userSearch.next);
+
+        if (!append) {
+            userSelect.innerHTML = '<option value="">Selecciona un usuario...</option>';
+        }
 
         if (Array.isArray(data.users) && data.users.length > 0) {
             data.users.forEach((user) => {
@@ -94,7 +118,7 @@ async function loadUsers(projectId) {
                 userSelect.appendChild(option);
             });
             userSelect.disabled = false;
-        } else {
+        } else if (!append) {
             userSelect.innerHTML = '<option value="">No hay usuarios disponibles</option>';
         }
 
@@ -108,20 +132,18 @@ async function loadUsers(projectId) {
     }
 }
 
-// Filtrar usuarios
-function filterUsers() {
+// Buscar usuarios en la API mientras se escribe (con espera para no lanzar una petición por tecla)
+function filterUsers(projectId) {
     const filterInput = document.getElementById("userFilter");
-    const userSelect = document.getElementById("userSelect");
-    if (!filterInput || !userSelect) return;
-
-    const filter = filterInput.value.toLowerCase();
-    const options = userSelect.getElementsByTagName("option");
+    if (!filterInput) return;
 
-    for (const option of options) {
-        const text = option.textContent.toLowerCase();
-        const value = option.value.toLowerCase();
-        option.style.display = text.includes(filter) || value.includes(filter) ? "" : "none";
-    }
+    clearTimeout(userSearch.timer);
+    userSearch.timer = setTimeout(() => {
+        const query = filterInput.value.trim();
+        if (query !== userSearch.query) {
+            loadUsers(projectId, query);
+        }
+    }, 250);
 }
 
 // Agregar miembro al proyecto
@@ -223,7 +245,8 @@ document.addEventListener("DOMContentLoaded", function () {
     const addMemberModal = document.getElementById("addMemberModal");
     if (addMemberModal) {
         addMemberModal.addEventListener("show.bs.modal", function () {
-            loadUsers(projectId);
+            const filterInput = document.getElementById("userFilter");
+            loadUsers(projectId, filterInput ? filterInput.value.trim() : "");
         });
     }
 
@@ -243,7 +266,17 @@ document.addEventListener("DOMContentLoaded", function () {
 
     const userFilter = document.getElementById("userFilter");
     if (userFilter) {
-        userFilter.addEventListener("input", filterUsers);
+        userFilter.addEventListener("input", function () {
+            filterUsers(projectId);
+        });
+    }
+
+    const loadMoreBtn = document.getElementById("loadMoreUsers");
+    if (loadMoreBtn) {
+        loadMoreBtn.addEventListener("click", function (event) {
+            event.preventDefault();
+            loadUsers(projectId, userSearch.query, true);
+        });
     }
 
     const removeMemberBtns = document.querySelectorAll(".js-remove-member");
@@ -6,8 +6,10 @@ from decouple import config
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Agregar el directorio shared al path
-sys.path.append(str(BASE_DIR / 'shared'))
+# Agregar la raíz del repositorio al path (paquete `shared`)
+sys.path.append(str(BASE_DIR.parent))
+
+from shared.db import sqlite_database  # noqa: E402
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY')
@@ -39,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PageTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +64,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.page_timings',
             ],
         },
     },
@@ -72,11 +76,19 @@ WSGI_APPLICATION = 'taskflow_web.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite con WAL, PRAGMAs y conexiones persistentes (ver shared/db.py)
+DATABASE_PRAGMAS = {
+    'synchronous': config('DB_SYNCHRONOUS', default='NORMAL'),
+    'busy_timeout': config('DB_BUSY_TIMEOUT', default=5000, cast=int),
+    'mmap_size': config('DB_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),
+    'cache_size': config('DB_CACHE_SIZE', default=-64000, cast=int),
+}
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(
+        BASE_DIR / 'db.sqlite3', pragmas=DATABASE_PRAGMAS,
+        conn_max_age=config('DB_CONN_MAX_AGE', default=60, cast=int),
+    ),
 }
 
 # Custom User Model
@@ -150,6 +162,67 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Configuración de la API
 API_BASE_URL = config('API_BASE_URL', default='http://127.0.0.1:8000/api')
 
+# Pool de conexiones HTTP hacia la API (sesión compartida, keep-alive)
+API_HTTP_TIMEOUT = config('API_HTTP_TIMEOUT', default=10, cast=float)
+API_HTTP_POOL_CONNECTIONS = config('API_HTTP_POOL_CONNECTIONS', default=4, cast=int)
+API_HTTP_POOL_MAXSIZE = config('API_HTTP_POOL_MAXSIZE', default=10, cast=int)
+# Tamaños por host: "http://api-a:8000=20,http://api-b:8000=5"
+API_HTTP_POOL_SIZES = {
+    prefix.strip(): int(size)
+    for prefix, size in (
+        item.rsplit('=', 1)
+        for item in config('API_HTTP_POOL_SIZES', default='').split(',')
+        if '=' in item
+    )
+}
+API_HTTP_RETRIES = config('API_HTTP_RETRIES', default=2, cast=int)
+API_HTTP_BACKOFF = config('API_HTTP_BACKOFF', default=0.2, cast=float)
+# Llamadas independientes a la API que una vista puede lanzar en paralelo
+API_MAX_PARALLEL_CALLS = config('API_MAX_PARALLEL_CALLS', default=4, cast=int)
+# Hilos del pool de gather(), compartido por todas las páginas del proceso:
+# dimensionar para páginas concurrentes (hilos del servidor WSGI) × llamadas
+# por página menos una (la primera corre en el hilo del request). Si se queda
+# corto, las páginas esperan unas a otras en la cola del pool
+API_FANOUT_WORKERS = config('API_FANOUT_WORKERS', default=8 * max(API_MAX_PARALLEL_CALLS - 1, 1), cast=int)
+# Respuestas GET con ETag guardadas para revalidar con If-None-Match (LRU por usuario)
+API_RESPONSE_CACHE_USERS = config('API_RESPONSE_CACHE_USERS', default=256, cast=int)
+API_RESPONSE_CACHE_ENTRIES = config('API_RESPONSE_CACHE_ENTRIES', default=32, cast=int)
+
+# Caché de dos niveles (shared/cache.py, compartida con la API): LRU en memoria
+# del proceso (L1) delante de una caché compartida entre procesos (L2). Por
+# defecto L2 es en archivos; para Redis:
+# CACHE_L2_BACKEND=django.core.cache.backends.redis.RedisCache y
+# CACHE_L2_LOCATION=redis://127.0.0.1:6379/2. Los tests usan memoria local
+# (TEST_RUNNER).
+CACHE_L2_BACKEND = config('CACHE_L2_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'shared.cache.TieredCache',
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {
+            'L2': 'shared',
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=5, cast=int),
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1024, cast=int),
+        },
+    },
+    'shared': {
+        'BACKEND': CACHE_L2_BACKEND,
+        'LOCATION': config('CACHE_L2_LOCATION', default=str(BASE_DIR / '.cache')),
+        'KEY_PREFIX': 'taskflow-web',
+        # MAX_ENTRIES solo lo entienden los backends de archivos y memoria
+        'OPTIONS': {} if 'redis' in CACHE_L2_BACKEND.lower() else {
+            'MAX_ENTRIES': config('CACHE_L2_MAX_ENTRIES', default=10000, cast=int),
+        },
+    },
+}
+
+TEST_RUNNER = 'shared.testing.LocalCacheTestRunner'
+
+# Panel con el desglose de tiempos (API, SQL de la API, JSON, render) al pie de
+# cada página; la cabecera Server-Timing se envía siempre
+PAGE_TIMINGS_PANEL = config('PAGE_TIMINGS_PANEL', default=False, cast=bool)
+
 # Configuración de CORS para permitir comunicación con el frontend
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8001",
@@ -80,6 +80,11 @@ class TaskForm(forms.Form):
         
         # Actualizar choices de usuarios
         user_choices = [('', 'Sin asignar')] + [(str(u['id']), u['username']) for u in users]
+        # Las opciones pueden haberse cargado en el navegador: aceptar el ID enviado
+        # y dejar que la API valide que pertenece al proyecto
+        submitted = self.data.get(self.add_prefix('assigned_to')) if self.is_bound else None
+        if submitted and submitted.isdigit() and submitted not in {value for value, _label in user_choices}:
+            user_choices.append((submitted, f'Usuario #{submitted}'))
         self.fields['assigned_to'].choices = user_choices
 
 
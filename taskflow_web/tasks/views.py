@@ -1,3 +1,4 @@
+from functools import partial
 from django.contrib import messages
 from django.http import HttpResponse
 from django.shortcuts import redirect
@@ -5,6 +6,7 @@ from django.views import View
 from django.views.generic import TemplateView, FormView
 from django.urls import reverse_lazy
 from core.api import API
+from core.concurrency import gather
 from .forms import TaskForm, TaskCommentForm
 from core.mixins import LoginRequiredMixin
 from core.utils import add_form_errors, handle_api_auth_error
@@ -42,19 +44,18 @@ class TaskListView(LoginRequiredMixin, TemplateView):
 
         # Obtener tareas (filtradas por proyecto si se especifica)
         project_id = request.GET.get('project')
-        success, tasks_result = API.get_tasks(request, project_id)
+        success, tasks_result = API.get_tasks(request, project_id, compact=True, with_count=True)
         if success:
             tasks_list = tasks_result.get('results', [])
             
             # Anotar permisos en cada tarea para el template
+            # (la vista compacta expone owner y creador como IDs)
             session_user_id = request.session.get('user_data', {}).get('id')
             for task in tasks_list:
-                owner = task.get('project_detail', {}).get('owner')
-                created_by = task.get('created_by')
                 assigned_to = task.get('assigned_to')
                 
-                is_project_owner = bool(owner and owner.get('id') == session_user_id)
-                is_task_creator = bool(created_by and created_by.get('id') == session_user_id)
+                is_project_owner = bool(session_user_id and task.get('project_owner_id') == session_user_id)
+                is_task_creator = bool(session_user_id and task.get('created_by') == session_user_id)
                 
                 task['is_owner'] = is_project_owner or is_task_creator
                 task['is_assigned'] = bool(assigned_to and assigned_to.get('id') == session_user_id)
@@ -112,14 +113,10 @@ class TaskCreateView(LoginRequiredMixin, FormView):
             kwargs['user_projects'] = []
 
         # Para crear, no sabemos el proyecto aún (si no viene preseleccionado).
-        # El formulario debe renderizar el select vacío o con una lista general.
-        # Como mínimo, cargamos todos los usuarios para que el usuario pueda seleccionar,
-        # y el backend validará pertenencia al proyecto.
-        success, users_result = API.get_users(self.request)
-        if success:
-            kwargs['users'] = users_result if isinstance(users_result, list) else users_result.get('results', [])
-        else:
-            kwargs['users'] = []
+        # El select de asignación se llena desde el navegador con los participantes
+        # del proyecto elegido (tasks:project-assignees); no se descarga la lista
+        # completa de usuarios. La API valida la pertenencia al proyecto.
+        kwargs['users'] = []
 
         return kwargs
     
@@ -199,7 +196,7 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
 
     def get(self, request, *args, **kwargs):
         task_id = kwargs.get('pk')
-        success, task = API.get_task(request, task_id)
+        (success, task), comments_response = self._fetch_task_and_comments(request, task_id)
         if not success:
             redirect_response = handle_api_auth_error(request, task)
             if redirect_response:
@@ -207,7 +204,7 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
             messages.error(request, 'Error al cargar la tarea.')
             return self.render_to_response({'task': None})
 
-        context = self._build_context(request, task_id, task)
+        context = self._build_context(request, task_id, task, comments_response=comments_response)
         if isinstance(context, HttpResponse):
             return context
         return self.render_to_response(context)
@@ -228,7 +225,7 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
         else:
             messages.error(request, 'Completa el comentario antes de enviarlo.')
 
-        success, task = API.get_task(request, task_id)
+        (success, task), comments_response = self._fetch_task_and_comments(request, task_id)
         if not success:
             redirect_response = handle_api_auth_error(request, task)
             if redirect_response:
@@ -236,12 +233,19 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
             messages.error(request, 'Error al recargar la tarea.')
             return redirect('tasks:list')
 
-        context = self._build_context(request, task_id, task, comment_form=form)
+        context = self._build_context(request, task_id, task, comment_form=form, comments_response=comments_response)
         if isinstance(context, HttpResponse):
             return context
         return self.render_to_response(context)
 
-    def _build_context(self, request, task_id, task, comment_form=None):
+    def _fetch_task_and_comments(self, request, task_id):
+        """La tarea y sus comentarios son independientes: se piden en paralelo."""
+        return gather(
+            partial(API.get_task, request, task_id),
+            partial(API.get_task_comments, request, task_id),
+        )
+
+    def _build_context(self, request, task_id, task, comment_form=None, comments_response=None):
         context = {'task': task}
 
         # Flags de rol para UI
@@ -262,15 +266,17 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
         comment_form = comment_form or self.comment_form_class()
         context['comment_form'] = comment_form
 
-        comments_context, redirect_response = self._load_comments_context(request, task_id)
+        comments_context, redirect_response = self._load_comments_context(request, task_id, comments_response)
         if redirect_response:
             return redirect_response
         context.update(comments_context)
 
         return context
 
-    def _load_comments_context(self, request, task_id):
-        success, comments_result = API.get_task_comments(request, task_id)
+    def _load_comments_context(self, request, task_id, comments_response=None):
+        if comments_response is None:
+            comments_response = API.get_task_comments(request, task_id)
+        success, comments_result = comments_response
         if not success:
             redirect_response = handle_api_auth_error(request, comments_result)
             if redirect_response:
@@ -301,7 +307,11 @@ class TaskUpdateView(LoginRequiredMixin, FormView):
 
     def dispatch(self, request, *args, **kwargs):
         task_id = kwargs.get('pk')
-        success, task = API.get_task(request, task_id)
+        # La tarea y los proyectos del usuario se piden en paralelo
+        (success, task), self.projects_response = gather(
+            partial(API.get_task, request, task_id),
+            partial(API.get_projects, request),
+        )
         if not success:
             redirect_response = handle_api_auth_error(request, task)
             if redirect_response:
@@ -315,35 +325,30 @@ class TaskUpdateView(LoginRequiredMixin, FormView):
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
 
-        success, projects_result = API.get_projects(self.request)
+        success, projects_result = self.projects_response
         if success:
             kwargs['user_projects'] = projects_result.get('results', [])
         else:
             kwargs['user_projects'] = []
 
-        # Mostrar solo asignables del proyecto (owner + members)
-        task = self.task
-
+        # Mostrar solo asignables del proyecto (owner + members).
+        # El detalle de la tarea ya trae el proyecto completo, no hace falta pedirlo de nuevo.
         users = []
-        project_detail = getattr(self, 'task', {}) or {}
-        project_detail = project_detail.get('project_detail') if isinstance(project_detail, dict) else None
-        project_id = project_detail.get('id') if isinstance(project_detail, dict) else None
-
-        if project_id:
-            success_p, project = API.get_project(self.request, project_id)
-            if success_p and isinstance(project, dict):
-                unique_users = {}
-                owner = project.get('owner')
-                members = project.get('members', [])
-                
-                if owner and isinstance(owner, dict) and 'id' in owner:
-                    unique_users[owner['id']] = owner
-                if isinstance(members, list):
-                    for m in members:
-                        if isinstance(m, dict) and 'id' in m:
-                            unique_users[m['id']] = m
-                            
-                users = list(unique_users.values())
+        project = self.task.get('project_detail') if isinstance(self.task, dict) else None
+
+        if isinstance(project, dict):
+            unique_users = {}
+            owner = project.get('owner')
+            members = project.get('members', [])
+            
+            if owner and isinstance(owner, dict) and 'id' in owner:
+                unique_users[owner['id']] = owner
+            if isinstance(members, list):
+                for m in members:
+                    if isinstance(m, dict) and 'id' in m:
+                        unique_users[m['id']] = m
+                        
+            users = list(unique_users.values())
 
         # fallback si no se pudo resolver: lista vacía (evita mostrar todos)
         kwargs['users'] = users